@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Localhost load test for the planning API.
+
+Starts ``python -m planner.server`` on a free port, opens ``--clients``
+keep-alive connections that each send ``--requests`` single-scenario POSTs
+back to back, and reports throughput, latency and how well concurrent
+requests were micro-batched:
+
+    python benchmarks/api_load.py [--clients 64] [--requests 50] [--window-ms 1] [--max-batch 1]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(port, n, latencies, failures, rng):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for _ in range(n):
+        scenario = {"area_km2": rng.uniform(0.5, 50), "traffic_per_user": rng.uniform(10, 5000),
+                    "bandwidth_mhz": rng.choice([20, 40, 60, 100])}
+        t = time.perf_counter()
+        status, _ = await _request(reader, writer, "POST", "/plan", scenario)
+        latencies.append(time.perf_counter() - t)
+        failures.append(status != 200)
+    writer.close()
+
+
+async def _wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await _request(reader, writer, "GET", "/health")
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run(port, clients, requests):
+    await _wait_ready(port)
+    latencies, failures = [], []
+    rng = random.Random(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(port, requests, latencies, failures, rng) for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    _, stats = await _request(reader, writer, "GET", "/stats")
+    writer.close()
+    return elapsed, sorted(latencies), sum(failures), stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=64, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=50, help="requests per connection")
+    parser.add_argument("--window-ms", type=float, default=1.0, help="server micro-batch window")
+    parser.add_argument("--max-batch", type=int, default=512,
+                        help="server batch cap; 1 disables micro-batching")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="server worker processes")
+    args = parser.parse_args(argv)
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "planner.server", "--port", str(port), "-j", str(args.jobs),
+         "--batch-window-ms", str(args.window_ms), "--max-batch", str(args.max_batch)],
+        cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        elapsed, latencies, failures, stats = asyncio.run(run(port, args.clients, args.requests))
+    finally:
+        server.terminate()
+        server.wait()
+
+    total = len(latencies)
+    print(f"requests       {total} ({failures} failed) in {elapsed:.2f} s")
+    print(f"throughput     {total / elapsed:,.0f} req/s")
+    print(f"latency p50    {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"latency p99    {latencies[int(0.99 * (total - 1))] * 1000:.1f} ms")
+    print(f"batches        {stats['batches']} (mean {stats['mean_batch_size']:.1f}, "
+          f"largest {stats['largest_batch']})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
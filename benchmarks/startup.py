@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Cold-start and warm-rerun budget for the Streamlit app.
+
+Each measurement runs in a fresh interpreter through Streamlit's headless
+AppTest harness, so it needs no browser or server:
+
+    python benchmarks/startup.py [--runs 5]
+
+Exits non-zero when a median exceeds its budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mainn.py")
+
+# Seconds, measured on a single 2 GHz core; the cold figure excludes the
+# interpreter and Streamlit's own import time
+COLD_START_BUDGET = 0.5
+WARM_RERUN_BUDGET = 0.1
+
+_PROBE = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=60)
+t = time.perf_counter()
+at.run()
+cold = time.perf_counter() - t
+heavy = sorted(m for m in ("planner.figures", "pandas") if m in sys.modules)
+warm = []
+for _ in range(5):
+    t = time.perf_counter()
+    at.run()
+    warm.append(time.perf_counter() - t)
+print(json.dumps({"cold": cold, "warm": sorted(warm)[2], "heavy": heavy,
+                  "error": bool(at.exception)}))
+"""
+
+
+def measure():
+    out = subprocess.run([sys.executable, "-c", _PROBE, APP], check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to sample")
+    args = parser.parse_args(argv)
+
+    samples = [measure() for _ in range(args.runs)]
+    if any(s["error"] for s in samples):
+        print("app raised an exception during the run", file=sys.stderr)
+        return 1
+    cold = statistics.median(s["cold"] for s in samples)
+    warm = statistics.median(s["warm"] for s in samples)
+    heavy = sorted({m for s in samples for m in s["heavy"]})
+
+    print(f"cold start   {cold * 1000:7.1f} ms   (budget {COLD_START_BUDGET * 1000:.0f} ms)")
+    print(f"warm rerun   {warm * 1000:7.1f} ms   (budget {WARM_RERUN_BUDGET * 1000:.0f} ms)")
+    print(f"heavy modules on the input page: {', '.join(heavy) or 'none'}")
+    return 0 if cold <= COLD_START_BUDGET and warm <= WARM_RERUN_BUDGET else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""Micro and end-to-end benchmarks with stored baselines.
+
+Times the path-loss models per sample (scalar calls and vectorized arrays),
+the coverage-radius solvers per call, full plans, the cost optimizer
+(checked against an exhaustive scan first), multi-area rollout forecasts
+(checked against plan_network first), the financial Monte Carlo per draw,
+and the app's rerun latency through Streamlit's headless AppTest harness:
+
+    python benchmarks/suite.py [-k radius] [--save]
+
+Each result is compared with benchmarks/baseline.json. The run exits
+non-zero when a benchmark is slower than its baseline by more than its
+tolerance. ``--save`` records the current timings as the new baseline.
+Baselines only mean something on the machine that wrote them, so a
+mismatched machine is reported before the comparison.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+APP = os.path.join(ROOT, "mainn.py")
+
+# Relative slowdown tolerated before a benchmark is flagged; app reruns go
+# through Streamlit's script runner and are noisier than the numeric kernels
+TOLERANCE = 0.25
+APP_TOLERANCE = 0.5
+
+BENCHMARKS = {}
+
+
+def benchmark(name, unit="call", tolerance=TOLERANCE):
+    """Register ``setup() -> (fn, items)``; ``fn()`` is timed and reported per item."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, unit, tolerance)
+        return setup
+    return register
+
+
+@benchmark("pl_umi.scalar")
+def _pl_umi_scalar():
+    from planner.propagation import pl_umi
+    return lambda: pl_umi(250.0, 3.5), 1
+
+
+@benchmark("pl_uma.scalar")
+def _pl_uma_scalar():
+    from planner.propagation import pl_uma
+    return lambda: pl_uma(250.0, 3.5), 1
+
+
+def _distances(n=100_000):
+    import numpy as np
+    return np.random.default_rng(0).uniform(10.0, 5000.0, n)
+
+
+@benchmark("pl_umi.array", unit="sample")
+def _pl_umi_array():
+    from planner.propagation import pl_umi_array
+    d_m = _distances()
+    return lambda: pl_umi_array(d_m, 3.5), len(d_m)
+
+
+@benchmark("pl_uma.array", unit="sample")
+def _pl_uma_array():
+    from planner.propagation import pl_uma_array
+    d_m = _distances()
+    return lambda: pl_uma_array(d_m, 3.5), len(d_m)
+
+
+@benchmark("find_coverage_radius")
+def _find_coverage_radius():
+    from planner.coverage import find_coverage_radius
+    return lambda: find_coverage_radius(130.0, 3.5), 1
+
+
+@benchmark("lookup_radius.array", unit="scenario")
+def _lookup_radius_array():
+    import numpy as np
+    from planner.solver import lookup_radius, radius_table
+    radius_table()
+    mapl = np.random.default_rng(0).uniform(90.0, 160.0, 10_000)
+    return lambda: lookup_radius(mapl, 3.5), len(mapl)
+
+
+@benchmark("plan_network")
+def _plan_network():
+    from planner.core import PlanParams, plan_network
+    from planner.solver import radius_table
+    radius_table()
+    params = PlanParams(area_km2=10.0, traffic_per_user=2000.0)
+    return lambda: plan_network(params), 1
+
+
+@benchmark("plan_many", unit="scenario")
+def _plan_many():
+    from planner.core import PlanParams, plan_many
+    from planner.solver import radius_table
+    radius_table()
+    batch = [PlanParams(area_km2=0.5 + i % 50, traffic_per_user=10.0 * (i % 500)) for i in range(1000)]
+    return lambda: plan_many(batch), len(batch)
+
+
+@benchmark("optimize")
+def _optimize():
+    import math
+    from planner.core import PlanParams
+    from planner.optimize import exhaustive_front, optimize
+    base = PlanParams(area_km2=20, traffic_per_user=50000.0)
+    # The pruned search must return exactly the front of a full plan_network scan
+    found = [(c.cost, c.headroom) for c in optimize(base).front]
+    expected = [(c.cost, c.headroom) for c in exhaustive_front(base)]
+    if len(found) != len(expected) or any(
+            a[0] != b[0] or not math.isclose(a[1], b[1], rel_tol=1e-9, abs_tol=1e-12)
+            for a, b in zip(found, expected)):
+        raise RuntimeError(f"optimize front differs from the exhaustive scan: {found} != {expected}")
+    return lambda: optimize(base), 1
+
+
+@benchmark("forecast_many", unit="scenario")
+def _forecast_many():
+    from dataclasses import replace
+    from planner.core import PlanParams, plan_network
+    from planner.forecast import forecast_many
+    # Many districts over a few radio configurations, e.g. 20 MHz/15 kHz and
+    # 40 MHz/30 kHz, which share a PRB count but not the site throughput
+    radios = [PlanParams(bandwidth_mhz=20, scs_khz=15), PlanParams(bandwidth_mhz=40, scs_khz=30),
+              PlanParams(freq_mhz=28000, bandwidth_mhz=100, scs_khz=120)]
+    scenarios = [replace(radio, area_km2=0.5 + i % 40, population=5_000 + 1_000 * i, traffic_per_user=50.0 * i)
+                 for i in range(100) for radio in radios]
+    # Shared stage results must give exactly what plan_network gives for every year
+    for result in forecast_many(scenarios, years=10):
+        for year in result.years:
+            if year.result != plan_network(year.params):
+                raise RuntimeError(f"forecast_many differs from plan_network in year {year.year} "
+                                   f"of {year.params}")
+    return lambda: forecast_many(scenarios, years=10), len(scenarios)
+
+
+@benchmark("finance.simulate", unit="draw")
+def _finance_simulate():
+    from planner.finance import simulate
+    return lambda: simulate(40, 120_000, 500_000, draws=20_000), 20_000
+
+
+def _app(results=False):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    if results:
+        at.button[0].click().run()
+    if at.exception:
+        raise RuntimeError(f"app raised: {at.exception[0].message}")
+    return at
+
+
+@benchmark("app.rerun.inputs", unit="rerun", tolerance=APP_TOLERANCE)
+def _app_rerun_inputs():
+    at = _app()
+    return at.run, 1
+
+
+@benchmark("app.rerun.results", unit="rerun", tolerance=APP_TOLERANCE)
+def _app_rerun_results():
+    # Rerunning with results on screen exercises the cached plan and figure paths
+    at = _app(results=True)
+    return at.run, 1
+
+
+def measure(fn, repeat=7, min_time=0.05):
+    """Median seconds per call over ``repeat`` rounds of at least ``min_time`` each."""
+    fn()  # warm caches and lazy imports
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(int(min_time / elapsed) + 1, 10))
+    rounds = [elapsed / loops]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        rounds.append((time.perf_counter() - started) / loops)
+    return statistics.median(rounds)
+
+
+def machine():
+    cpu = platform.processor() or platform.machine()
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as fh:
+            cpu = next(line.split(":", 1)[1].strip() for line in fh if line.startswith("model name"))
+    except (OSError, StopIteration):
+        pass
+    import numpy as np
+    return {"cpu": cpu, "cores": os.cpu_count(), "python": platform.python_version(),
+            "numpy": np.__version__}
+
+
+def _format(seconds):
+    for scale, suffix in ((1, "s"), (1e3, "ms"), (1e6, "µs")):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:8.2f} {suffix}"
+    return f"{seconds * 1e9:8.2f} ns"
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--select", action="append",
+                        help="only run benchmarks matching this glob (or substring); repeatable")
+    parser.add_argument("--repeat", type=int, default=7, help="timing rounds per benchmark")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file to compare with")
+    parser.add_argument("--save", action="store_true", help="store these timings as the baseline")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if not args.select or any(
+        fnmatch.fnmatch(name, pattern) or pattern in name for pattern in args.select)]
+    baseline = load_baseline(args.baseline)
+    here = machine()
+    if baseline and baseline.get("machine") != here:
+        print(f"note: baseline was recorded on {baseline.get('machine')}, this is {here}",
+              file=sys.stderr)
+    reference = (baseline or {}).get("results", {})
+
+    results = {}
+    regressions = []
+    for name in names:
+        setup, unit, tolerance = BENCHMARKS[name]
+        fn, items = setup()
+        seconds = measure(fn, args.repeat) / items
+        results[name] = seconds
+        line = f"{name:24s} {_format(seconds)}/{unit:8s}"
+        if name in reference:
+            ratio = seconds / reference[name]
+            flag = ""
+            if ratio > 1 + tolerance:
+                regressions.append(name)
+                flag = "  REGRESSION"
+            elif ratio < 1 / (1 + tolerance):
+                flag = "  faster"
+            line += f" {ratio:6.2f}x baseline{flag}"
+        print(line, flush=True)
+
+    if args.save:
+        stored = dict(reference) if baseline and baseline.get("machine") == here else {}
+        stored.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump({"machine": here, "results": stored}, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        print(f"baseline written to {os.path.relpath(args.baseline)}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
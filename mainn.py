@@ -1,13 +1,27 @@
 # -*- coding: utf-8 -*-
+import json
+import os
+
 import streamlit as st
-from PIL import Image
-import requests
-from io import BytesIO
-import math
-import random
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
+
+from planner.cache import cached_plan_network
+from planner.core import BANDS, SITE_COST, PlanParams, link_budget
+from planner.history import default_store
+from planner.locations import catalogue
+from planner.profiling import current_run, finish_run, stage, start_run
+from planner.traffic import evaluate_load, profile_from_mapping, register_profile
+from views.charts import cached_coverage_map, cached_figure
+from views.finance import format_years, plan_simulation
+from views.inputs import (
+    CUSTOM_MAPL_LINK_TERMS,
+    STANDARD_LINK_TERMS,
+    pick_match,
+    seed_inputs,
+    select_area,
+    select_city,
+)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Force light theme and centered layout without wide mode option
 st.set_page_config(
@@ -16,146 +30,37 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Every script run is timed stage by stage; see planner.profiling
+start_run()
+stage("page_setup")
+
+# Static assets are read once per process and shared by every session
+@st.cache_resource(show_spinner=False)
+def load_css():
+    with open(os.path.join(APP_DIR, "assets", "style.css"), encoding="utf-8") as fh:
+        return f"<style>\n{fh.read()}</style>"
+
+
+@st.cache_resource(show_spinner=False)
+def load_logo():
+    try:
+        with open(os.path.join(APP_DIR, "logo.png"), "rb") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
 # Custom CSS to enhance UI and hide settings menu
-st.markdown("""
-<style>
-    /* Hide settings menu */
-    #MainMenu {visibility: hidden;}
-    
-    /* Hide "Made with Streamlit" footer */
-    footer {visibility: hidden;}
-    
-    /* Hide header */
-    header {visibility: hidden;}
-    
-    /* Enhance main title styling */
-    .main-title {
-        font-size: 2.5rem;
-        color: #1f77b4;
-        text-align: center;
-        font-weight: bold;
-        margin-bottom: 1rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    /* University info styling */
-    .university-info {
-        background: linear-gradient(90deg, #f0f2f6 0%, #ffffff 50%, #f0f2f6 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 5px solid #1f77b4;
-        margin: 1rem 0;
-        text-align: center;
-    }
-    
-    /* Results section styling */
-    .results-container {
-        background: transparent;
-        padding: 1rem 0;
-        margin: 1rem 0;
-    }
-    
-    .metric-card {
-        background: rgba(255, 255, 255, 0.95);
-        padding: 1rem;
-        border-radius: 12px;
-        margin: 0.5rem 0;
-        border-left: 4px solid #1f77b4;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        backdrop-filter: blur(10px);
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(0,0,0,0.15);
-    }
-    
-    .metric-title {
-        font-weight: bold;
-        color: #1f77b4;
-        font-size: 1.1rem;
-    }
-    
-    .metric-value {
-        font-size: 1.3rem;
-        font-weight: bold;
-        color: #2c3e50;
-    }
-    
-    .final-recommendation {
-        background: linear-gradient(45deg, #1f77b4, #17a2b8);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        margin: 1rem 0;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    
-    /* Sidebar styling */
-    .sidebar .sidebar-content {
-        background: linear-gradient(180deg, #f8f9fa 0%, #ffffff 100%);
-    }
-    
-    /* Enhanced Button styling */
-    .stButton > button {
-        background: linear-gradient(135deg, #1f77b4 0%, #17a2b8 50%, #28a745 100%);
-        color: white;
-        border: none;
-        padding: 1rem 3rem;
-        border-radius: 30px;
-        font-weight: bold;
-        font-size: 1.2rem;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        transition: all 0.4s ease;
-        box-shadow: 0 8px 20px rgba(31, 119, 180, 0.3);
-        position: relative;
-        overflow: hidden;
-        width: 100%;
-        min-height: 60px;
-    }
-    
-    .stButton > button:before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.2), transparent);
-        transition: left 0.5s;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-3px) scale(1.02);
-        box-shadow: 0 12px 25px rgba(31, 119, 180, 0.4);
-        background: linear-gradient(135deg, #17a2b8 0%, #28a745 50%, #20c997 100%);
-        color: white !important;
-    }
-    
-    .stButton > button:hover:before {
-        left: 100%;
-    }
-    
-    .stButton > button:active {
-        transform: translateY(-1px) scale(1.01);
-        box-shadow: 0 6px 15px rgba(31, 119, 180, 0.3);
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # Logo and title
-logo_path = "logo.png"
-try:
-    logo = Image.open(logo_path)
-    
+logo = load_logo()
+if logo is not None:
     # Create columns for better logo placement
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         st.image(logo, caption="5G Site Estimator Logo", use_container_width=True)
-except:
+else:
     st.info("📡 5G Site Estimator Logo")
 
 # Main title with custom styling
@@ -177,201 +82,193 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# The other modes plan whole grids or horizons around the sidebar inputs instead of one scenario
+app_mode = st.radio("Mode", ["📋 Network Plan", "🧪 Parameter Sweep", "💰 Cost Optimizer", "📈 Rollout Forecast",
+                            "🎲 Financial Risk", "🗂️ Jobs", "🕘 History"],
+                    horizontal=True, label_visibility="collapsed", key="app_mode")
+
+stage("sidebar_inputs")
+
 # Sidebar with enhanced header
 st.sidebar.markdown("### 📥 Input Parameters")
 st.sidebar.markdown("---")
 
-# City and area selection
-city_areas = {
-    "Cairo": {"Nasr City": "Urban", "Heliopolis": "Urban", "Maadi": "Urban", "Zamalek": "Urban"},
-    "Giza": {"Dokki": "Urban", "Mohandessin": "Urban", "6th of October": "Urban", "Sheikh Zayed": "Urban"},
-    "Alexandria": {"Stanley": "Dense Urban", "Sidi Gaber": "Urban", "Smouha": "Urban"},
-}
+seed_inputs()
 
+# City and area selection
 st.sidebar.markdown("**🏙️ Location Settings**")
-city = st.sidebar.selectbox("Select City", list(city_areas.keys()))
-area = st.sidebar.selectbox("Select Area", list(city_areas[city].keys()))
-urban_type = city_areas[city][area]
-
-st.sidebar.markdown("---")
-st.sidebar.markdown("**📏 Area & Population**")
-area_km2 = st.sidebar.number_input("Area Size (km²)", min_value=0.1, value=0.5, step=0.1)
-population = st.sidebar.number_input("Population", min_value=0, value=10000, step=1000)
-penetration_rate = st.sidebar.slider("5G Penetration Rate (%)", 0, 100, 30)
-traffic_per_user = st.sidebar.number_input("Total Traffic(Mbps)", min_value=0.0, value=5.0, step=0.1)
-downlink_ratio = st.sidebar.slider("Downlink Traffic Ratio (%)", 10, 100, 75) / 100.0
-q = st.sidebar.slider("Quality Factor (q)", 0.1, 1.0, 0.8, step=0.01)
-
-st.sidebar.markdown("---")
-st.sidebar.markdown("**📡 Antenna Configuration**")
-antenna_type = st.sidebar.selectbox("Antenna Type", ["Directive", "Omni"])
+locations = catalogue()
+search = st.sidebar.text_input("🔎 Find District", key="location_search", placeholder="Type a district or city",
+                               help=f"Searches all {len(locations):,} districts (catalogue {locations.version})")
+if search.strip():
+    matches = locations.search(search)
+    if matches:
+        st.sidebar.selectbox(
+            "Matching Districts", matches, index=None, key="location_match", on_change=pick_match,
+            placeholder=f"{len(matches)} matches, most populous first",
+            format_func=lambda loc: f"{loc.area}, {loc.city} · {loc.population:,} people")
+    else:
+        st.sidebar.caption("No district matches.")
+city = st.sidebar.selectbox("Select City", locations.cities, key="city", on_change=select_city)
+area = st.sidebar.selectbox("Select Area", locations.areas(city), key="area", on_change=select_area)
+location = locations.get(city, area)
+urban_type = location.area_type
+st.sidebar.caption(f"{location.area_type} · {location.clutter.replace('_', ' ')} clutter · "
+                   f"{location.area_km2:g} km² · {location.population:,} people")
+profile_file = st.sidebar.file_uploader(
+    "Traffic Profile (JSON, optional)", type=["json"], key="traffic_profile",
+    help="Replaces the area type's hourly traffic profile: an object with 24 'hourly' values and "
+         "optional 'weekly' (7) and 'monthly' (12) values, plus a 'name'")
+if profile_file is not None:
+    try:
+        profile = profile_from_mapping(json.loads(profile_file.getvalue()),
+                                       os.path.splitext(profile_file.name)[0])
+        urban_type = register_profile(profile).name
+        st.sidebar.caption(f"Traffic follows the uploaded {urban_type!r} profile.")
+    except ValueError as exc:
+        st.sidebar.error(f"Could not use {profile_file.name}: {exc}")
+
+@st.fragment
+def channel_and_link_budget():
+    # Reruns on its own when these inputs change, so the Calculated Parameters
+    # panel stays live without replaying the whole app
+    st.markdown("**📶 Channel Configuration**")
+    bandwidth_mhz = int(st.selectbox("Bandwidth (MHz)", options=[10, 20, 40, 60, 80, 100], key="bandwidth_mhz"))
+    scs_khz = st.selectbox("Sub-Carrier Spacing (kHz)", options=[15, 30, 60, 120, 240], key="scs_khz")
+
+    st.markdown("---")
+    st.markdown("**📡 Link Budget Parameters**")
+    use_custom_mapl = st.checkbox("Use Custom MAPL", key="use_custom_mapl")
+    use_custom_link_budget = st.checkbox("Customize Link Budget Parameters", key="use_custom_link_budget")
+
+    custom_mapl = None
+    if use_custom_mapl:
+        custom_mapl = st.number_input("Custom MAPL (dB)", min_value=80.0, max_value=180.0, step=0.1, key="custom_mapl")
+        # Set default values for other parameters when using custom MAPL
+        link_terms = dict(CUSTOM_MAPL_LINK_TERMS)
+    elif use_custom_link_budget:
+        link_terms = dict(
+            tx_power=st.number_input("Tx Power (dBm)", key="lb_tx_power"),
+            tx_gain=st.number_input("Tx Antenna Gain (dBi)", key="lb_tx_gain"),
+            cable_loss=st.number_input("Cable Loss (dB)", key="lb_cable_loss"),
+            penetration_loss=st.number_input("Penetration Loss (dB)", key="lb_penetration_loss"),
+            foliage_loss=st.number_input("Foliage Loss (dB)", key="lb_foliage_loss"),
+            body_loss=st.number_input("Body Loss (dB)", key="lb_body_loss"),
+            interference_margin=st.number_input("Interference Margin (dB)", key="lb_interference_margin"),
+            rain_margin=st.number_input("Rain Margin (dB)", key="lb_rain_margin"),
+            shadow_margin=st.number_input("Shadow Margin (dB)", key="lb_shadow_margin"),
+            rx_gain=st.number_input("Rx Antenna Gain (dBi)", key="lb_rx_gain"),
+            noise_figure=st.number_input("Receiver Noise Figure (dB)", key="lb_noise_figure"),
+            required_sinr=st.number_input("Required SINR (dB)", key="lb_required_sinr"),
+        )
+    else:
+        link_terms = dict(STANDARD_LINK_TERMS)
 
-st.sidebar.markdown("---")
-st.sidebar.markdown("**📶 Frequency Band**")
-band_option = st.sidebar.selectbox("Select 5G Frequency Band", [
-    "Low-Band (e.g. 700 MHz)",
-    "Mid-Band (e.g. 3.5 GHz)",
-    "mmWave (e.g. 28 GHz)"
-])
-
-if band_option == "Low-Band (e.g. 700 MHz)":
-    freq_mhz = 700
-elif band_option == "Mid-Band (e.g. 3.5 GHz)":
-    freq_mhz = 3500
-else:
-    freq_mhz = 28000
+    channel = dict(bandwidth_mhz=bandwidth_mhz, scs_khz=scs_khz, custom_mapl=custom_mapl, **link_terms)
+    st.session_state["channel_inputs"] = channel
 
-freq_ghz = freq_mhz / 1000
+    # Display calculated RB information
+    budget = link_budget(PlanParams(**channel))
+    n_rb = budget.n_rb
+    st.markdown("---")
+    st.markdown("**📊 Calculated Parameters**")
+    st.info(f"**Resource Blocks:** {n_rb}")
+    st.info(f"**Total Subcarriers:** {n_rb * 12:,}")
+    st.info(f"**Effective Bandwidth:** {(n_rb * 12 * scs_khz / 1000):.2f} MHz")
+    st.info(f"**MAPL:** {budget.mapl:.1f} dB ({'Custom' if use_custom_mapl else 'Calculated'})")
 
-st.sidebar.markdown("---")
-st.sidebar.markdown("**📡 Link Budget Parameters**")
-use_custom_mapl = st.sidebar.checkbox("Use Custom MAPL", value=False)
-use_custom_link_budget = st.sidebar.checkbox("Customize Link Budget Parameters", value=False)
-
-if use_custom_mapl:
-    custom_mapl = st.sidebar.number_input("Custom MAPL (dB)", value=130.0, min_value=80.0, max_value=180.0, step=0.1)
-    # Set default values for other parameters when using custom MAPL
-    tx_power = 49
-    tx_gain = 24
-    cable_loss = 0
-    penetration_loss = 24
-    foliage_loss = 11
-    body_loss = 3
-    interference_margin = 6
-    rain_margin = 0
-    shadow_margin = 7
-    rx_gain = 24
-    noise_figure = 9
-    required_sinr = 14
-elif use_custom_link_budget:
-    tx_power = st.sidebar.number_input("Tx Power (dBm)", value=49)
-    tx_gain = st.sidebar.number_input("Tx Antenna Gain (dBi)", value=24)
-    cable_loss = st.sidebar.number_input("Cable Loss (dB)", value=0)
-    penetration_loss = st.sidebar.number_input("Penetration Loss (dB)", value=24)
-    foliage_loss = st.sidebar.number_input("Foliage Loss (dB)", value=11)
-    body_loss = st.sidebar.number_input("Body Loss (dB)", value=3)
-    interference_margin = st.sidebar.number_input("Interference Margin (dB)", value=6)
-    rain_margin = st.sidebar.number_input("Rain Margin (dB)", value=0)
-    shadow_margin = st.sidebar.number_input("Shadow Margin (dB)", value=7)
-    rx_gain = st.sidebar.number_input("Rx Antenna Gain (dBi)", value=24)
-    noise_figure = st.sidebar.number_input("Receiver Noise Figure (dB)", value=9)
-    required_sinr = st.sidebar.number_input("Required SINR (dB)", value=14)
-else:
-    tx_power = 49
-    tx_gain = 24
-    cable_loss = 0
-    penetration_loss = 22
-    foliage_loss = 7.5
-    body_loss = 3
-    interference_margin = 6
-    rain_margin = 0
-    shadow_margin = 6
-    rx_gain = 0
-    noise_figure = 9
-    required_sinr = 14
 
 st.sidebar.markdown("---")
-st.sidebar.markdown("**⚙️ Capacity Parameters**")
-bandwidth_mhz = int(st.sidebar.selectbox("Bandwidth (MHz)", options=[10, 20, 40, 60, 80, 100], index=3))
-mod_order = st.sidebar.selectbox("Modulation Order (bits per symbol)", options=[2, 4, 6, 8, 10], index=3)
-mimo_layers = st.sidebar.slider("Number of MIMO Layers", min_value=1, max_value=32, value=4)
-utilization = st.sidebar.slider("Resource Utilization (%)", min_value=0, max_value=100, value=70) / 100.0
-overhead = st.sidebar.slider("Overhead (%)", min_value=0, max_value=100, value=25) / 100.0
-sectors_per_site = st.sidebar.selectbox("Sectors per Site", options=[1, 3], index=1)
-
-st.sidebar.markdown("---")
-st.sidebar.markdown("**📶 Sub-Carrier Spacing**")
-scs_khz = st.sidebar.selectbox("Sub-Carrier Spacing (kHz)", options=[15, 30, 60, 120, 240], index=1)
-scs_hz = scs_khz * 1000  # Convert to Hz
-
-duplex_mode = st.sidebar.selectbox("Duplex Mode", ["TDD", "FDD"], index=0)
-if duplex_mode == "FDD":
-    overhead = min(overhead, 0.12)
-
-propagation_model = st.sidebar.selectbox("Select Propagation Model", ["UMi-Street Canyon", "UMa"])
-
-# Calculate number of Resource Blocks dynamically based on bandwidth and SCS
-bandwidth_hz = bandwidth_mhz * 1e6
-n_rb = int(bandwidth_hz / (12 * scs_hz))
-
-# Calculate MAPL (Maximum Allowable Path Loss)
-thermal_noise = -174 + 10 * math.log10(bandwidth_hz)
-receiver_sensitivity = thermal_noise + noise_figure + required_sinr
-
-if use_custom_mapl:
-    mapl = custom_mapl
-else:
-    mapl = (tx_power + tx_gain + rx_gain - cable_loss - penetration_loss - foliage_loss - body_loss
-            - interference_margin - rain_margin - shadow_margin - receiver_sensitivity)
+with st.sidebar:
+    channel_and_link_budget()
+channel = st.session_state["channel_inputs"]
+
+# Everything else is batched: nothing reruns until the form is submitted
+with st.sidebar.form("plan_inputs", border=False):
+    st.markdown("---")
+    st.markdown("**📏 Area & Population**")
+    area_km2 = st.number_input("Area Size (km²)", min_value=0.1, step=0.1, key="area_km2")
+    population = st.number_input("Population", min_value=0, step=1000, key="population")
+    penetration_rate = st.slider("5G Penetration Rate (%)", 0, 100, key="penetration_rate")
+    traffic_per_user = st.number_input("Total Traffic(Mbps)", min_value=0.0, step=0.1, key="traffic_per_user")
+    downlink_ratio = st.slider("Downlink Traffic Ratio (%)", 10, 100, key="downlink_pct") / 100.0
+    # The interference view can overwrite q through session state as well
+    q = st.slider("Quality Factor (q)", 0.1, 1.0, step=0.01, key="q")
+
+    st.markdown("---")
+    st.markdown("**📡 Antenna Configuration**")
+    antenna_type = st.selectbox("Antenna Type", ["Directive", "Omni"], key="antenna_type")
+
+    st.markdown("---")
+    st.markdown("**📶 Frequency Band**")
+    band_option = st.selectbox("Select 5G Frequency Band", list(BANDS), key="band")
+    freq_mhz = BANDS[band_option]
+    freq_ghz = freq_mhz / 1000
+
+    st.markdown("---")
+    st.markdown("**⚙️ Capacity Parameters**")
+    mod_order = st.selectbox("Modulation Order (bits per symbol)", options=[2, 4, 6, 8, 10], key="mod_order")
+    mimo_layers = st.slider("Number of MIMO Layers", min_value=1, max_value=32, key="mimo_layers")
+    utilization = st.slider("Resource Utilization (%)", min_value=0, max_value=100, key="utilization_pct") / 100.0
+    overhead = st.slider("Overhead (%)", min_value=0, max_value=100, key="overhead_pct") / 100.0
+    sectors_per_site = st.selectbox("Sectors per Site", options=[1, 3], key="sectors_per_site")
+    sizing_percentile = st.slider(
+        "Capacity Sizing Percentile (%)", min_value=50, max_value=100, key="sizing_percentile",
+        help="Share of the year's hours (under the area's hourly traffic profile) the network "
+             "must carry; 100 sizes on the busy hour")
+    duplex_mode = st.selectbox("Duplex Mode", ["TDD", "FDD"], key="duplex_mode")
+
+    st.markdown("---")
+    st.markdown("**🗺️ Propagation**")
+    propagation_model = st.selectbox("Select Propagation Model", ["UMi-Street Canyon", "UMa"], key="propagation_model")
+    cell_edge_reliability = st.slider("Cell-Edge Reliability (%)", min_value=50, max_value=99,
+                                      key="reliability_pct") / 100.0
+    max_radius_km = st.number_input("Maximum Cell Radius (km)", min_value=0.05, step=0.05, key="max_radius_km")
+
+    calculate = st.form_submit_button("🚀 Calculate 5G Network Requirements", use_container_width=True)
+
+params = PlanParams(
+    area_km2=area_km2, population=population, penetration_rate=penetration_rate,
+    traffic_per_user=traffic_per_user, downlink_ratio=downlink_ratio, q=q,
+    area_type=urban_type, sizing_percentile=sizing_percentile,
+    antenna_type=antenna_type, freq_mhz=freq_mhz, propagation_model=propagation_model,
+    cell_edge_reliability=cell_edge_reliability, max_radius_km=max_radius_km,
+    mod_order=mod_order, mimo_layers=mimo_layers, utilization=utilization, overhead=overhead,
+    sectors_per_site=sectors_per_site, duplex_mode=duplex_mode, **channel,
+)
+bandwidth_mhz = params.bandwidth_mhz
 
-# Display calculated RB information
-st.sidebar.markdown("---")
-st.sidebar.markdown("**📊 Calculated Parameters**")
-st.sidebar.info(f"**Resource Blocks:** {n_rb - math.floor(n_rb*0.05)}")
-st.sidebar.info(f"**Total Subcarriers:** {n_rb * 12:,}")
-st.sidebar.info(f"**Effective Bandwidth:** {(n_rb * 12 * scs_khz / 1000):.2f} MHz")
-if use_custom_mapl:
-    st.sidebar.info(f"**MAPL:** {mapl:.1f} dB (Custom)")
-else:
-    st.sidebar.info(f"**MAPL:** {mapl:.1f} dB (Calculated)")
-
-def pl_umi(d_m, f_ghz, h_ue=1.5):
-    d_km = d_m / 1000.0
-    p_los = min(18/d_km, 1) * (1 - math.exp(-d_km/36)) + math.exp(-d_km/36)
-    is_los = random.random() < p_los
-    if is_los:
-        pl = 32.4 + 21 * math.log10(d_m) + 20 * math.log10(f_ghz)
-    else:
-        pl_los = 32.4 + 21 * math.log10(d_m) + 20 * math.log10(f_ghz)
-        pl_nlos = 22.4 + 35.3 * math.log10(d_m) + 21.3 * math.log10(f_ghz) - 0.3 * (h_ue - 1.5)
-        pl = max(pl_los, pl_nlos)
-    return pl
-
-def pl_uma(d_m, f_ghz, h_ue=1.5):
-    d_km = d_m / 1000.0
-    p_los = min(18/d_km, 1) * (1 - math.exp(-d_km/63)) + math.exp(-d_km/63)
-    is_los = random.random() < p_los
-    if is_los:
-        pl = 28 + 22 * math.log10(d_m) + 20 * math.log10(f_ghz)
-    else:
-        pl_los = 28 + 22 * math.log10(d_m) + 20 * math.log10(f_ghz)
-        pl_nlos = 13.54 + 39.08 * math.log10(d_m) + 20 * math.log10(f_ghz) - 0.6 * (h_ue - 1.5)
-        pl = max(pl_los, pl_nlos)
-    return pl
-
-def find_coverage_radius(link_budget_margin, f_ghz, model_func, max_radius_km=0.7, h_ue=1.5):
-    low = 1.0
-    high = max_radius_km * 1000
-    for _ in range(30):
-        mid = (low + high) / 2
-        pl = model_func(mid, f_ghz, h_ue)
-        if pl > link_budget_margin:
-            high = mid
-        else:
-            low = mid
-    return low / 1000.0
+# Resource blocks and MAPL (Maximum Allowable Path Loss)
+stage("link_budget")
+budget = link_budget(params)
+n_rb = budget.n_rb
+thermal_noise = budget.thermal_noise
+receiver_sensitivity = budget.receiver_sensitivity
+mapl = budget.mapl
 
 # Enhanced results section
-if st.button("🚀 Calculate 5G Network Requirements", use_container_width=True):
-    # Use already calculated values
-
-    model_func = pl_umi if propagation_model == "UMi-Street Canyon" else pl_uma
-    coverage_radius_km = find_coverage_radius(mapl, freq_ghz, model_func)
-    coverage_radius_km *= 1.0 if antenna_type == "Directive" else 1.2
-    a_site = (1.94 if antenna_type == "Directive" else 2.5) * coverage_radius_km ** 2
-    num_sites_coverage = math.ceil(area_km2 / a_site)
-
-    active_users = population * (penetration_rate / 100)
-    total_traffic_mbps = traffic_per_user
+calculated = calculate or st.session_state.pop("replan", False)
+if calculated:
+    current_run().label = "calculate"
+    st.session_state["planned_params"] = params
+
+# Results stay on screen across reruns (e.g. switching analysis views) until an input changes
+if app_mode == "📋 Network Plan" and st.session_state.get("planned_params") == params:
+    stage("plan")
+    result = cached_plan_network(params)
+    if calculated:
+        default_store().save(params, result, city=city, area=area)
+    coverage_radius_km = result.coverage_radius_km
+    a_site = result.a_site
+    num_sites_coverage = result.num_sites_coverage
+    active_users = result.active_users
+    total_traffic_mbps = result.total_traffic_mbps
+    site_throughput_mbps = result.site_throughput_mbps
+    num_sites_capacity = result.num_sites_capacity
+    total_sites_required = result.total_sites_required
 
-    bps_per_sector = (
-        n_rb * 14 * 4000 * mod_order * 0.93 * mimo_layers * utilization * (1 - overhead)
-    )
-    site_throughput_mbps = (bps_per_sector * sectors_per_site * downlink_ratio * q) / 1e6
-    num_sites_capacity = math.ceil(total_traffic_mbps / site_throughput_mbps) if site_throughput_mbps > 0 else 0
-    total_sites_required = max(num_sites_coverage, num_sites_capacity) 
-    
     # Enhanced Results Display
+    stage("results_summary")
     st.markdown('<div class="results-container">', unsafe_allow_html=True)
     st.markdown("## 📊 Comprehensive Network Planning Results")
     
@@ -387,11 +284,15 @@ if st.button("🚀 Calculate 5G Network Requirements", use_container_width=True)
         )
     
     with col2:
-        cost_estimate = total_sites_required * 250000  # $250k per site estimate
+        cost_estimate = result.cost_estimate
+        # Spread of simulated CAPEX around the planned unit costs (Monte Carlo, see 🎲 Financial Risk)
+        simulation = plan_simulation(params, result)
+        capex_low, capex_high = simulation.percentiles(simulation.capex, (10, 90)) / max(result.total_capex, 1)
         st.metric(
             label="💰 Estimated Cost",
             value=f"${cost_estimate:,.0f}",
-            delta="±15% typical range"
+            delta=f"{capex_low - 1:+.0%} to {capex_high - 1:+.0%} (P10–P90)",
+            delta_color="off"
         )
     
     with col3:
@@ -460,7 +361,7 @@ if st.button("🚀 Calculate 5G Network Requirements", use_container_width=True)
         <div class="metric-card">
             <div class="metric-title">Coverage Radius</div>
             <div class="metric-value">{coverage_radius_km:.3f} km</div>
-            <small>Per site coverage radius</small>
+            <small>At {cell_edge_reliability:.0%} cell-edge reliability</small>
         </div>
         """, unsafe_allow_html=True)
         
@@ -560,137 +461,55 @@ if st.button("🚀 Calculate 5G Network Requirements", use_container_width=True)
     """, unsafe_allow_html=True)
     
     # Advanced Visualizations
+    stage("analysis_view")
     st.markdown("### 📈 Advanced Network Analysis")
     
-    # Create tabs for different analyses
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Site Requirements", "💰 Cost Analysis", "📡 Performance Metrics", "🔧 Technical Details"])
-    
-    with tab1:
+    # Only the selected view is built; switching views reruns against the cached plan
+    analysis_view = st.radio(
+        "Analysis view",
+        ["📊 Site Requirements", "💰 Cost Analysis", "📡 Performance Metrics", "🗺️ Coverage Map",
+         "📶 Interference", "🔧 Technical Details"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="analysis_view",
+    )
+
+    # Derived metrics shared by several views and the benchmark chart
+    spectral_efficiency = (site_throughput_mbps / bandwidth_mhz) / sectors_per_site
+    user_experience = min(site_throughput_mbps / (active_users / total_sites_required), 10)
+
+    if analysis_view == "📊 Site Requirements":
         col1, col2 = st.columns(2)
         
         with col1:
             # Sites comparison
-            comparison_data = pd.DataFrame({
-                'Requirement Type': ['Coverage', 'Capacity', 'Final Total'],
-                'Number of Sites': [num_sites_coverage, num_sites_capacity, total_sites_required],
-                'Color': ['#1f77b4', '#ff7f0e', '#28a745']
-            })
-            
-            fig1 = px.bar(comparison_data, x='Requirement Type', y='Number of Sites', 
-                         color='Requirement Type',
-                         title='Site Requirements Breakdown',
-                         color_discrete_map={'Coverage': '#1f77b4', 'Capacity': '#ff7f0e', 'Final Total': '#28a745'})
-            
-            fig1.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=11),
-                title_font_size=14,
-                showlegend=False,
-                height=400
+            st.plotly_chart(
+                cached_figure("site_requirements_figure", num_sites_coverage, num_sites_capacity, total_sites_required),
+                use_container_width=True
             )
-            
-            st.plotly_chart(fig1, use_container_width=True)
         
         with col2:
             # Coverage vs Capacity gauge
             coverage_ratio = num_sites_coverage / total_sites_required * 100
             capacity_ratio = num_sites_capacity / total_sites_required * 100
-            
-            fig2 = go.Figure()
-            
-            fig2.add_trace(go.Indicator(
-                mode = "gauge+number+delta",
-                value = coverage_ratio,
-                domain = {'x': [0, 0.48], 'y': [0.5, 1]},
-                title = {'text': "Coverage Drive (%)"},
-                delta = {'reference': 50},
-                gauge = {
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "#1f77b4"},
-                    'steps': [
-                        {'range': [0, 50], 'color': "lightgray"},
-                        {'range': [50, 80], 'color': "gray"}],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 90}}))
-            
-            fig2.add_trace(go.Indicator(
-                mode = "gauge+number+delta",
-                value = capacity_ratio,
-                domain = {'x': [0.52, 1], 'y': [0.5, 1]},
-                title = {'text': "Capacity Drive (%)"},
-                delta = {'reference': 50},
-                gauge = {
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "#ff7f0e"},
-                    'steps': [
-                        {'range': [0, 50], 'color': "lightgray"},
-                        {'range': [50, 80], 'color': "gray"}],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 90}}))
-            
-            # Network efficiency gauge
             efficiency = min((area_km2 / a_site) / total_sites_required * 100, 100)
-            fig2.add_trace(go.Indicator(
-                mode = "gauge+number",
-                value = efficiency,
-                domain = {'x': [0.25, 0.75], 'y': [0, 0.45]},
-                title = {'text': "Network Efficiency (%)"},
-                gauge = {
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "#28a745"},
-                    'steps': [
-                        {'range': [0, 60], 'color': "#ffcccc"},
-                        {'range': [60, 80], 'color': "#ffffcc"},
-                        {'range': [80, 100], 'color': "#ccffcc"}]}))
-            
-            fig2.update_layout(
-                height=400,
-                title="Network Planning Efficiency Metrics",
-                font=dict(size=10),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
+            st.plotly_chart(
+                cached_figure("efficiency_gauges_figure", coverage_ratio, capacity_ratio, efficiency),
+                use_container_width=True
             )
-            
-            st.plotly_chart(fig2, use_container_width=True)
     
-    with tab2:
+    elif analysis_view == "💰 Cost Analysis":
         col1, col2 = st.columns(2)
         
         with col1:
             # Cost breakdown
-            site_cost = 250000
-            equipment_cost = total_sites_required * 150000
-            installation_cost = total_sites_required * 50000
-            maintenance_cost = total_sites_required * 25000
-            total_capex = equipment_cost + installation_cost
-            annual_opex = maintenance_cost
-            
-            cost_data = pd.DataFrame({
-                'Cost Category': ['Equipment', 'Installation', 'Annual Maintenance'],
-                'Amount': [equipment_cost, installation_cost, annual_opex],
-                'Type': ['CAPEX', 'CAPEX', 'OPEX']
-            })
-            
-            fig3 = px.pie(cost_data, values='Amount', names='Cost Category', 
-                         title='Cost Breakdown (5-Year Projection)',
-                         color_discrete_map={
-                             'Equipment': '#1f77b4',
-                             'Installation': '#ff7f0e', 
-                             'Annual Maintenance': '#2ca02c'
-                         })
-            
-            fig3.update_layout(
-                height=400,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
+            site_cost = SITE_COST
+            total_capex = result.total_capex
+            annual_opex = result.annual_opex
+            st.plotly_chart(
+                cached_figure("cost_breakdown_figure", result.equipment_cost, result.installation_cost, annual_opex),
+                use_container_width=True
             )
-            
-            st.plotly_chart(fig3, use_container_width=True)
         
         with col2:
             st.markdown("#### 💰 Financial Summary")
@@ -718,72 +537,37 @@ if st.button("🚀 Calculate 5G Network Requirements", use_container_width=True)
             </div>
             """, unsafe_allow_html=True)
             
-            roi_years = total_capex / (annual_opex * 0.3)  # Assuming 30% of opex as profit
+            payback = simulation.percentiles(simulation.payback_years)
+            horizon = len(simulation.years) - 1
             st.markdown(f"""
             <div class="metric-card">
                 <div class="metric-title">Payback Period</div>
-                <div class="metric-value">{roi_years:.1f} years</div>
-                <small>Estimated ROI timeline</small>
+                <div class="metric-value">{format_years(payback[1], horizon)}</div>
+                <small>Median of {simulation.draws:,} draws; P10 {format_years(payback[0], horizon)},
+                P90 {format_years(payback[2], horizon)}</small>
             </div>
             """, unsafe_allow_html=True)
     
-    with tab3:
+    elif analysis_view == "📡 Performance Metrics":
         col1, col2 = st.columns(2)
         
         with col1:
             # Performance metrics
-            spectral_efficiency = (site_throughput_mbps / bandwidth_mhz) / sectors_per_site
-            user_experience = min(site_throughput_mbps / (active_users / total_sites_required), 10)
-            
-            performance_data = pd.DataFrame({
-                'Metric': ['Spectral Efficiency', 'User Experience', 'Network Load', 'Coverage Quality'],
-                'Value': [spectral_efficiency, user_experience, network_load, coverage_efficiency],
-                'Target': [4.0, 5.0, 70.0, 85.0],
-                'Unit': ['bps/Hz/sector', 'Mbps/user', '%', '%']
-            })
-            
-            fig4 = go.Figure()
-            
-            fig4.add_trace(go.Scatter(
-                x=performance_data['Metric'],
-                y=performance_data['Value'],
-                mode='markers+lines',
-                name='Actual',
-                marker=dict(size=12, color='#1f77b4'),
-                line=dict(width=3, color='#1f77b4')
-            ))
-            
-            fig4.add_trace(go.Scatter(
-                x=performance_data['Metric'],
-                y=performance_data['Target'],
-                mode='markers+lines',
-                name='Target',
-                marker=dict(size=10, color='#ff7f0e', symbol='diamond'),
-                line=dict(width=2, color='#ff7f0e', dash='dash')
-            ))
-            
-            fig4.update_layout(
-                title='Network Performance vs Targets',
-                xaxis_title='Performance Metrics',
-                yaxis_title='Value',
-                height=400,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
+            st.plotly_chart(
+                cached_figure("performance_figure", spectral_efficiency, user_experience, network_load, coverage_efficiency),
+                use_container_width=True
             )
-            
-            st.plotly_chart(fig4, use_container_width=True)
         
         with col2:
             st.markdown("#### 📊 Quality Indicators")
             
-            # Traffic distribution
-            peak_to_avg_ratio = 3.2
-            avg_traffic = total_traffic_mbps / peak_to_avg_ratio
+            # Traffic distribution over the area's hourly profile
+            load_report = evaluate_load(params, result)
             
             st.markdown(f"""
             <div class="metric-card">
                 <div class="metric-title">Peak Traffic</div>
-                <div class="metric-value">{total_traffic_mbps:.0f} Mbps</div>
+                <div class="metric-value">{params.traffic_per_user:.0f} Mbps</div>
                 <small>Busy hour demand</small>
             </div>
             """, unsafe_allow_html=True)
@@ -791,8 +575,8 @@ if st.button("🚀 Calculate 5G Network Requirements", use_container_width=True)
             st.markdown(f"""
             <div class="metric-card">
                 <div class="metric-title">Average Traffic</div>
-                <div class="metric-value">{avg_traffic:.0f} Mbps</div>
-                <small>Daily average</small>
+                <div class="metric-value">{load_report.mean_demand_mbps:.0f} Mbps</div>
+                <small>Yearly average ({urban_type} profile)</small>
             </div>
             """, unsafe_allow_html=True)
             
@@ -811,18 +595,52 @@ if st.button("🚀 Calculate 5G Network Requirements", use_container_width=True)
                 <small>Average per user</small>
             </div>
             """, unsafe_allow_html=True)
+        
+        st.markdown("#### ⏱️ Hourly Load Over the Year")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Busy Hour", load_report.busy_hour.item().strftime("%a %d %b, %H:00"))
+        col2.metric("Busy-Hour Load", f"{load_report.busy_hour_load * 100:.0f}%")
+        col3.metric(f"Hours Above {load_report.threshold:.0%}", f"{load_report.hours_over:,}")
+        col4.metric("95th Percentile Load", f"{load_report.percentile(95) * 100:.0f}%")
+        st.plotly_chart(
+            cached_figure("load_heatmap_figure", load_report.by_day() * 100),
+            use_container_width=True
+        )
     
-    with tab4:
+    elif analysis_view == "🗺️ Coverage Map":
+        layouts = {"Hexagonal grid": "hex", "Greedy set cover": "greedy", "K-means on demand": "kmeans"}
+        layout = st.selectbox("Site placement", list(layouts), key="site_layout",
+                              help="Hexagonal grid at the planned density, fewest sites covering 99% "
+                                   "of the area, or the planned site count spread over the demand")
+        use_terrain = False
+        if os.environ.get("PLANNER_TERRAIN"):
+            use_terrain = st.checkbox("Apply terrain and clutter", value=True, key="use_terrain",
+                                      help=f"Clutter loss and terrain diffraction from {os.environ['PLANNER_TERRAIN']}")
+        coverage, coverage_fig = cached_coverage_map(params, layouts[layout], use_terrain=use_terrain)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Area Covered", f"{coverage.covered_fraction * 100:.1f}%")
+        col2.metric("Sites on Map", f"{len(coverage.sites_m)}")
+        col3.metric("Map Resolution", f"{coverage.resolution_m:.0f} m")
+        st.plotly_chart(coverage_fig, use_container_width=True)
+        st.caption("Each pixel shows the margin against MAPL of its best server at the "
+                   "cell-edge reliability" + (", after clutter loss and terrain diffraction." if use_terrain
+                                              else "."))
+    
+    elif analysis_view == "📶 Interference":
+        from views import interference as interference_view
+        interference_view.render(params)
+    
+    else:
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("#### 📡 RF Performance")
             st.write(f"**Link Budget Analysis:**")
             st.write(f"- Maximum Allowable Path Loss: {mapl:.1f} dB")
-            st.write(f"- Transmit Power: {tx_power} dBm")
-            st.write(f"- Antenna Gains: {tx_gain + rx_gain} dB total")
-            st.write(f"- System Losses: {cable_loss + penetration_loss + foliage_loss + body_loss:.1f} dB")
-            st.write(f"- Margins: {interference_margin + shadow_margin + rain_margin} dB total")
+            st.write(f"- Transmit Power: {params.tx_power} dBm")
+            st.write(f"- Antenna Gains: {params.tx_gain + params.rx_gain} dB total")
+            st.write(f"- System Losses: {params.cable_loss + params.penetration_loss + params.foliage_loss + params.body_loss:.1f} dB")
+            st.write(f"- Margins: {params.interference_margin + params.shadow_margin + params.rain_margin} dB total")
             st.write(f"- Receiver Sensitivity: {receiver_sensitivity:.1f} dBm")
             st.write(f"- Thermal Noise: {thermal_noise:.1f} dBm")
             
@@ -838,8 +656,12 @@ if st.button("🚀 Calculate 5G Network Requirements", use_container_width=True)
             st.write(f"- Sectors per Site: {sectors_per_site}")
             st.write(f"- Antenna Type: {antenna_type}")
             st.write(f"- Propagation Model: {propagation_model}")
+
+        from views import radius as radius_view
+        radius_view.render(params, mapl)
     
     # AI-Powered Recommendations
+    stage("recommendations")
     st.markdown("### 🤖 Intelligent Network Recommendations")
     
     recommendations = []
@@ -865,7 +687,8 @@ if st.button("🚀 Calculate 5G Network Requirements", use_container_width=True)
         recommendations.append("🏗️ High site density required. Consider indoor solutions or DAS systems")
     
     if penetration_rate < 20:
-        recommendations.append("📈 Low 5G penetration rate. Plan for future growth and capacity expansion")
+        recommendations.append("📈 Low 5G penetration rate. Plan for future growth and capacity expansion "
+                               "(see the Rollout Forecast mode)")
     
     # Display recommendations
     if recommendations:
@@ -880,69 +703,53 @@ if st.button("🚀 Calculate 5G Network Requirements", use_container_width=True)
     
 
     # Quick comparison with industry benchmarks
+    stage("benchmark_chart")
     st.markdown("### 📏 Industry Benchmarks Comparison")
     
-    benchmarks_data = pd.DataFrame({
-        'Metric': ['Sites per km²', 'Cost per Site ($K)', 'Spectral Efficiency', 'User Experience'],
-        'Your Network': [total_sites_required/area_km2, 250, spectral_efficiency, user_experience],
-        'Industry Average': [8.5, 275, 3.2, 4.5],
-        'Best Practice': [12.0, 200, 4.5, 6.0]
-    })
-    
-    fig_benchmark = go.Figure()
-    
-    fig_benchmark.add_trace(go.Scatter(
-        x=benchmarks_data['Metric'],
-        y=benchmarks_data['Your Network'],
-        mode='markers+lines',
-        name='Your Network',
-        marker=dict(size=12, color='#1f77b4'),
-        line=dict(width=3, color='#1f77b4')
-    ))
-    
-    fig_benchmark.add_trace(go.Scatter(
-        x=benchmarks_data['Metric'],
-        y=benchmarks_data['Industry Average'],
-        mode='markers+lines',
-        name='Industry Average',
-        marker=dict(size=10, color='#ff7f0e'),
-        line=dict(width=2, color='#ff7f0e', dash='dash')
-    ))
-    
-    fig_benchmark.add_trace(go.Scatter(
-        x=benchmarks_data['Metric'],
-        y=benchmarks_data['Best Practice'],
-        mode='markers+lines',
-        name='Best Practice',
-        marker=dict(size=10, color='#28a745'),
-        line=dict(width=2, color='#28a745', dash='dot')
-    ))
-    
-    fig_benchmark.update_layout(
-        title='Network Performance vs Industry Benchmarks',
-        xaxis_title='Performance Metrics',
-        yaxis_title='Normalized Values',
-        height=400,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
+    st.plotly_chart(
+        cached_figure("benchmark_figure", total_sites_required / area_km2, SITE_COST / 1000,
+                      spectral_efficiency, user_experience),
+        use_container_width=True
     )
     
-    st.plotly_chart(fig_benchmark, use_container_width=True)
-    
     st.markdown('</div>', unsafe_allow_html=True)
+elif app_mode == "🧪 Parameter Sweep":
+    stage("sweep_view")
+    from views import sweep as sweep_view
+    sweep_view.render(params)
+elif app_mode == "💰 Cost Optimizer":
+    stage("optimizer_view")
+    from views import optimizer as optimizer_view
+    optimizer_view.render(params)
+elif app_mode == "📈 Rollout Forecast":
+    stage("forecast_view")
+    from views import forecast as forecast_view
+    forecast_view.render(params)
+elif app_mode == "🎲 Financial Risk":
+    stage("finance_view")
+    from views import finance as finance_view
+    finance_view.render(params)
+elif app_mode == "🗂️ Jobs":
+    stage("jobs_view")
+    from views import jobs as jobs_view
+    jobs_view.render(params)
+elif app_mode == "🕘 History":
+    stage("history_view")
+    from views import history as history_view
+    history_view.render(params)
 
 # Footer
+stage("footer")
 st.markdown("---")
 st.markdown("""
 <div style="text-align: center; color: #6c757d; padding: 1rem;">
     <p>🎓 <strong>Faculty of Electronic Engineering - Menofia University</strong></p>
     <p>Department of Telecommunication Engineering | 5G Network Planning Tool</p>
 </div>
-""", unsafe_allow_html=True) 
\ No newline at end of file
+""", unsafe_allow_html=True) 
+
+trace = finish_run()
+# Stage timings for this run and the process, behind ?debug=1 or PLANNER_DEBUG=1
+if st.query_params.get("debug") == "1" or os.environ.get("PLANNER_DEBUG") == "1":
+    from views import profiling as profiling_view
+    profiling_view.render(trace)
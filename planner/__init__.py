@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+from planner.core import PlanParams, PlanResult, link_budget, plan_network
+from planner.propagation import (
+    UMA,
+    UMI,
+    los_probability,
+    path_loss,
+    pl_uma,
+    pl_uma_array,
+    pl_umi,
+    pl_umi_array,
+)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import fields
+
+from planner.core import PlanParams, PlanResult, plan_network
+from planner.paths import cache_path
+from planner.solver import TABLE_VERSION
+
+CACHE_VERSION = 2
+
+# Link budget terms that stop mattering once a custom MAPL is given
+_MAPL_TERMS = (
+    "tx_power", "tx_gain", "rx_gain", "cable_loss", "penetration_loss", "foliage_loss",
+    "body_loss", "interference_margin", "rain_margin", "shadow_margin",
+)
+
+
+def normalize_params(params):
+    # Equivalent inputs (3500 vs 3500.0, FDD overhead above the cap, unused
+    # link budget terms) map to the same record
+    record = {}
+    for f in fields(PlanParams):
+        value = getattr(params, f.name)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = round(float(value), 9)
+        record[f.name] = value
+    record["overhead"] = round(float(params.effective_overhead), 9)
+    if params.custom_mapl is not None:
+        for name in _MAPL_TERMS:
+            record[name] = None
+    if params.sizing_percentile >= 100:
+        # Busy-hour sizing does not depend on the shape of the traffic profile
+        record["area_type"] = None
+        record["sizing_percentile"] = 100.0
+    return record
+
+
+def params_key(params):
+    payload = json.dumps([CACHE_VERSION, TABLE_VERSION, normalize_params(params)], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class PlanCache:
+    """Two-tier LRU cache of PlanResults keyed by params_key().
+
+    The memory tier is shared by every caller in the process; the SQLite tier
+    survives restarts and is trimmed to ``max_entries`` and ``max_bytes`` by
+    last access. If the database cannot be opened the cache is memory-only.
+    """
+
+    def __init__(self, path=None, max_entries=50000, max_bytes=64 * 1024 * 1024,
+                 memory_entries=1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not False:
+            self._open(path or cache_path("plans.sqlite"))
+
+    def _open(self, path):
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS plans ("
+                       "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                       "size INTEGER NOT NULL, accessed REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS plans_accessed ON plans (accessed)")
+            db.commit()
+            self._db = db
+        except (OSError, sqlite3.Error):
+            self._db = None
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute("SELECT value FROM plans WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._db.execute("UPDATE plans SET accessed = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+            except sqlite3.Error:
+                return None
+            result = PlanResult(**json.loads(row[0]))
+            self._remember(key, result)
+            return result
+
+    def put(self, key, result):
+        with self._lock:
+            self._remember(key, result)
+            if self._db is None:
+                return
+            value = json.dumps(result.as_dict())
+            try:
+                self._db.execute("INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?)",
+                                 (key, value, len(value), time.time()))
+                self._evict()
+                self._db.commit()
+            except sqlite3.Error:
+                pass
+
+    def _evict(self):
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM plans").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Drop the least recently used rows until both limits hold again
+        dropped = 0
+        freed = 0
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM plans ORDER BY accessed"):
+            if count - dropped <= self.max_entries and total - freed <= self.max_bytes:
+                break
+            victims.append((key,))
+            dropped += 1
+            freed += size
+        self._db.executemany("DELETE FROM plans WHERE key = ?", victims)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM plans")
+                self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            if self._db is None:
+                return len(self._memory)
+            return self._db.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = PlanCache()
+    return _default_cache
+
+
+def cached_plan_network(params, cache=None):
+    """plan_network, served from the cache when the same inputs were planned before."""
+    if cache is None:
+        cache = default_cache()
+    key = params_key(params)
+    result = cache.get(key)
+    if result is None:
+        result = plan_network(params)
+        cache.put(key, result)
+    return result
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import argparse
+import csv
+import json
+import os
+import sys
+
+from planner.parallel import chunked, plan_records_parallel, plan_rows
+from planner.traffic import load_profile, register_profile
+
+
+def _detect_format(path, explicit):
+    if explicit:
+        return explicit
+    ext = os.path.splitext(path)[1].lower()
+    return "jsonl" if ext in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+def read_scenarios(fh, fmt):
+    # Yields one record at a time so arbitrarily large inputs stream through.
+    # JSONL lines are yielded undecoded; plan_rows parses them, so a malformed
+    # line is reported as that scenario's error instead of ending the run.
+    if fmt == "csv":
+        yield from csv.DictReader(fh)
+    else:
+        for line in fh:
+            line = line.strip()
+            if line:
+                yield line
+
+
+class ResultWriter:
+    def __init__(self, fh, fmt):
+        self.fh = fh
+        self.fmt = fmt
+        self._csv = None
+
+    def write(self, record):
+        if self.fmt == "jsonl":
+            self.fh.write(json.dumps(record) + "\n")
+            return
+        if self._csv is None:
+            self._csv = csv.DictWriter(self.fh, fieldnames=list(record), extrasaction="ignore")
+            self._csv.writeheader()
+        self._csv.writerow(record)
+
+
+def plan_records(records, chunk_size=256):
+    # (line number, output record or None, error or None) per input record
+    for lineno, rows in chunked(records, chunk_size):
+        yield from plan_rows(rows, lineno)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m planner",
+        description="Plan 5G site requirements for every scenario in a CSV or JSONL file.",
+    )
+    parser.add_argument("input", help="scenario file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="result file (default: stdout)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--output-format", choices=["csv", "jsonl"])
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="worker processes; 0 uses every core (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=256,
+                        help="scenarios per worker task (default: 256)")
+    parser.add_argument("--profile", action="append", default=[], metavar="JSON",
+                        help="traffic profile file; scenarios select it by its name as area_type "
+                             "(repeatable)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    for path in args.profile:
+        try:
+            register_profile(load_profile(path))
+        except (OSError, ValueError) as exc:
+            parser.error(f"--profile {path}: {exc}")
+    in_fmt = _detect_format(args.input, args.input_format)
+    out_fmt = _detect_format(args.output, args.output_format) if args.output != "-" \
+        else (args.output_format or in_fmt)
+
+    fin = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    fout = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    failures = 0
+    try:
+        writer = ResultWriter(fout, out_fmt)
+        records = read_scenarios(fin, in_fmt)
+        if args.jobs == 1:
+            results = plan_records(records, args.chunk_size)
+        else:
+            results = plan_records_parallel(records, workers=args.jobs or None,
+                                            chunk_size=args.chunk_size)
+        for lineno, record, error in results:
+            if error is not None:
+                failures += 1
+                print(f"scenario {lineno}: {error}", file=sys.stderr)
+                continue
+            writer.write(record)
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout:
+            fout.close()
+    return 1 if failures else 0
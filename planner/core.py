@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass, fields, replace
+from typing import Optional
+
+import numpy as np
+
+from planner.profiling import span
+from planner.propagation import MODELS, UMI
+from planner.solver import lookup_radius
+from planner.throughput import scenario_bps, scenario_resource_blocks
+from planner.traffic import PROFILES, demand_factor
+
+BANDS = {
+    "Low-Band (e.g. 700 MHz)": 700,
+    "Mid-Band (e.g. 3.5 GHz)": 3500,
+    "mmWave (e.g. 28 GHz)": 28000,
+}
+
+# Per-site unit costs in USD
+SITE_COST = 250000
+EQUIPMENT_COST = 150000
+INSTALLATION_COST = 50000
+MAINTENANCE_COST = 25000
+
+
+@dataclass(frozen=True)
+class PlanParams:
+    # Area & population
+    area_km2: float = 0.5
+    population: int = 10000
+    penetration_rate: float = 30  # %
+    traffic_per_user: float = 5.0  # Mbps
+    downlink_ratio: float = 0.75
+    q: float = 0.8
+    area_type: str = "Urban"  # selects the hourly traffic profile
+    sizing_percentile: float = 100  # % of the year's hours capacity must carry
+    # RF
+    antenna_type: str = "Directive"
+    freq_mhz: float = 3500
+    propagation_model: str = UMI
+    h_ue: float = 1.5
+    cell_edge_reliability: float = 0.95
+    max_radius_km: float = 0.7
+    # Link budget
+    custom_mapl: Optional[float] = None
+    tx_power: float = 49
+    tx_gain: float = 24
+    cable_loss: float = 0
+    penetration_loss: float = 22
+    foliage_loss: float = 7.5
+    body_loss: float = 3
+    interference_margin: float = 6
+    rain_margin: float = 0
+    shadow_margin: float = 6
+    rx_gain: float = 0
+    noise_figure: float = 9
+    required_sinr: float = 14
+    # Capacity
+    bandwidth_mhz: int = 60
+    mod_order: int = 8
+    mimo_layers: int = 4
+    utilization: float = 0.7
+    overhead: float = 0.25
+    sectors_per_site: int = 3
+    scs_khz: int = 30
+    duplex_mode: str = "TDD"
+
+    @property
+    def freq_ghz(self):
+        return self.freq_mhz / 1000
+
+    @property
+    def effective_overhead(self):
+        return min(self.overhead, 0.12) if self.duplex_mode == "FDD" else self.overhead
+
+
+@dataclass(frozen=True)
+class LinkBudget:
+    n_rb: int
+    thermal_noise: float
+    receiver_sensitivity: float
+    mapl: float
+
+
+@dataclass(frozen=True)
+class PlanResult:
+    n_rb: int
+    thermal_noise: float
+    receiver_sensitivity: float
+    mapl: float
+    coverage_radius_km: float
+    a_site: float
+    num_sites_coverage: int
+    active_users: float
+    total_traffic_mbps: float
+    bps_per_sector: float
+    site_throughput_mbps: float
+    num_sites_capacity: int
+    total_sites_required: int
+    cost_estimate: float
+    equipment_cost: float
+    installation_cost: float
+    maintenance_cost: float
+    total_capex: float
+    annual_opex: float
+
+    def as_dict(self):
+        # Flat fields only, so a shallow copy is enough (and much cheaper than asdict)
+        return dict(self.__dict__)
+
+
+def link_budget(params):
+    bandwidth_hz = params.bandwidth_mhz * 1e6
+    n_rb = scenario_resource_blocks(params)
+    thermal_noise = -174 + 10 * math.log10(bandwidth_hz)
+    receiver_sensitivity = thermal_noise + params.noise_figure + params.required_sinr
+
+    if params.custom_mapl is not None:
+        mapl = params.custom_mapl
+    else:
+        mapl = (params.tx_power + params.tx_gain + params.rx_gain - params.cable_loss
+                - params.penetration_loss - params.foliage_loss - params.body_loss
+                - params.interference_margin - params.rain_margin - params.shadow_margin
+                - receiver_sensitivity)
+    return LinkBudget(n_rb, thermal_noise, receiver_sensitivity, mapl)
+
+
+def coverage_radius(params, mapl):
+    radius_km = min(float(lookup_radius(mapl, params.freq_ghz, params.propagation_model,
+                                        params.h_ue, params.cell_edge_reliability)),
+                    params.max_radius_km)
+    return radius_km * (1.0 if params.antenna_type == "Directive" else 1.2)
+
+
+def site_area(params, coverage_radius_km):
+    return (1.94 if params.antenna_type == "Directive" else 2.5) * coverage_radius_km ** 2
+
+
+def bps_per_sector(params, n_rb):
+    # TS 38.214 transport blocks per slot at the peak MCS (planner.throughput)
+    return scenario_bps(params, n_rb)
+
+
+def site_throughput(params, bps):
+    return (bps * params.sectors_per_site * params.downlink_ratio * params.q) / 1e6
+
+
+def coverage_sites(params, coverage_radius_km):
+    a_site = site_area(params, coverage_radius_km)
+    return a_site, math.ceil(params.area_km2 / a_site)
+
+
+def capacity_per_site(params, n_rb):
+    bps = bps_per_sector(params, n_rb)
+    return bps, site_throughput(params, bps)
+
+
+def assemble_plan(params, budget, coverage_radius_km, coverage, capacity):
+    """PlanResult from the coverage and capacity stages plus the demand in ``params``."""
+    a_site, num_sites_coverage = coverage
+    bps, site_throughput_mbps = capacity
+
+    active_users = params.population * (params.penetration_rate / 100)
+    total_traffic_mbps = params.traffic_per_user * demand_factor(params.area_type,
+                                                                 params.sizing_percentile)
+
+    num_sites_capacity = (math.ceil(total_traffic_mbps / site_throughput_mbps)
+                          if site_throughput_mbps > 0 else 0)
+    total_sites_required = max(num_sites_coverage, num_sites_capacity)
+
+    equipment_cost = total_sites_required * EQUIPMENT_COST
+    installation_cost = total_sites_required * INSTALLATION_COST
+    maintenance_cost = total_sites_required * MAINTENANCE_COST
+
+    return PlanResult(
+        n_rb=budget.n_rb,
+        thermal_noise=budget.thermal_noise,
+        receiver_sensitivity=budget.receiver_sensitivity,
+        mapl=budget.mapl,
+        coverage_radius_km=coverage_radius_km,
+        a_site=a_site,
+        num_sites_coverage=num_sites_coverage,
+        active_users=active_users,
+        total_traffic_mbps=total_traffic_mbps,
+        bps_per_sector=bps,
+        site_throughput_mbps=site_throughput_mbps,
+        num_sites_capacity=num_sites_capacity,
+        total_sites_required=total_sites_required,
+        cost_estimate=total_sites_required * SITE_COST,
+        equipment_cost=equipment_cost,
+        installation_cost=installation_cost,
+        maintenance_cost=maintenance_cost,
+        total_capex=equipment_cost + installation_cost,
+        annual_opex=maintenance_cost,
+    )
+
+
+def _finish_plan(params, budget, coverage_radius_km):
+    return assemble_plan(params, budget, coverage_radius_km,
+                         coverage_sites(params, coverage_radius_km),
+                         capacity_per_site(params, budget.n_rb))
+
+
+def plan_network(params):
+    """Coverage and capacity dimensioning for one scenario."""
+    with span("link_budget"):
+        budget = link_budget(params)
+    with span("coverage_radius"):
+        radius_km = coverage_radius(params, budget.mapl)
+    with span("dimensioning"):
+        return _finish_plan(params, budget, radius_km)
+
+
+def plan_many(params_list):
+    """plan_network over a batch, with one vectorized radius lookup per model."""
+    params_list = list(params_list)
+    budgets = [link_budget(p) for p in params_list]
+    radius_km = np.empty(len(params_list))
+    for model in {p.propagation_model for p in params_list}:
+        idx = [i for i, p in enumerate(params_list) if p.propagation_model == model]
+        radius_km[idx] = lookup_radius(
+            [budgets[i].mapl for i in idx], [params_list[i].freq_ghz for i in idx], model,
+            [params_list[i].h_ue for i in idx],
+            [params_list[i].cell_edge_reliability for i in idx])
+    results = []
+    for p, budget, r in zip(params_list, budgets, radius_km):
+        r = min(float(r), p.max_radius_km) * (1.0 if p.antenna_type == "Directive" else 1.2)
+        results.append(_finish_plan(p, budget, r))
+    return results
+
+
+PARAM_FIELDS = {f.name: f for f in fields(PlanParams)}
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, str) and value.strip() == "")
+
+
+def coerce_param(name, value):
+    field = PARAM_FIELDS[name]
+    if _is_blank(value):
+        return field.default
+    if field.type is str:
+        return str(value)
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be a finite number, got {value!r}")
+    return int(number) if field.type is int else number
+
+
+# Bounds of the numeric inputs, checked on records from outside the app (batch
+# files, the API): (lowest, highest or None, whether lowest itself is allowed)
+PARAM_RANGES = {
+    "area_km2": (0.0, None, False),
+    "population": (0, None, True),
+    "penetration_rate": (0.0, 100.0, True),
+    "traffic_per_user": (0.0, None, True),
+    "downlink_ratio": (0.0, 1.0, True),
+    "sizing_percentile": (0.0, 100.0, False),
+    "freq_mhz": (0.0, None, False),
+    "h_ue": (0.0, None, False),
+    "cell_edge_reliability": (0.0, 1.0, False),
+    "max_radius_km": (0.0, None, False),
+    "bandwidth_mhz": (0, None, False),
+    "mod_order": (0, None, False),
+    "mimo_layers": (0, None, False),
+    "utilization": (0.0, 1.0, True),
+    "overhead": (0.0, 1.0, True),
+    "sectors_per_site": (0, None, False),
+    "scs_khz": (0, None, False),
+}
+
+
+# Options of the categorical inputs; area types are looked up live, so
+# registered traffic profiles count
+PARAM_CHOICES = {
+    "antenna_type": ("Directive", "Omni"),
+    "propagation_model": tuple(MODELS),
+    "duplex_mode": ("TDD", "FDD"),
+    "area_type": PROFILES,
+}
+
+
+def check_value(name, value):
+    """Raise ValueError if ``value`` is outside PARAM_RANGES or PARAM_CHOICES for ``name``."""
+    if name in PARAM_CHOICES:
+        if value not in PARAM_CHOICES[name]:
+            raise ValueError(f"{name} must be one of {', '.join(PARAM_CHOICES[name])}, got {value!r}")
+        return
+    if name not in PARAM_RANGES:
+        return
+    low, high, closed = PARAM_RANGES[name]
+    if value < low or (value == low and not closed) or (high is not None and value > high):
+        bound = f"{'>=' if closed else '>'} {low:g}"
+        if high is not None:
+            bound += f" and <= {high:g}"
+        raise ValueError(f"{name} must be {bound}, got {value:g}")
+
+
+def check_params(params):
+    """Raise ValueError for the first input outside PARAM_RANGES or PARAM_CHOICES."""
+    for name in (*PARAM_RANGES, *PARAM_CHOICES):
+        check_value(name, getattr(params, name))
+
+
+def params_from_mapping(row, base=None):
+    """Split a flat record into PlanParams and the unrecognised pass-through columns.
+
+    Values may be strings (CSV) or native types (JSON); missing or empty ones
+    keep the defaults of ``base``.
+    """
+    if not isinstance(row, Mapping):
+        raise TypeError(f"expected an object of named inputs, got {type(row).__name__}")
+    values = {}
+    extras = {}
+    for key, value in row.items():
+        if key in PARAM_FIELDS:
+            # Leaving blanks out lets replace() keep base's value, not the field default
+            if not _is_blank(value):
+                values[key] = coerce_param(key, value)
+        else:
+            extras[key] = value
+    params = PlanParams(**values) if base is None else replace(base, **values)
+    check_params(params)
+    return params, extras
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+from planner.propagation import UMI, los_probability, pl_los, pl_nlos
+from planner.solver import solve_radius
+
+
+class RadiusEstimate(NamedTuple):
+    radius_km: float
+    lower_km: float
+    upper_km: float
+    reliability: float
+    distances_m: np.ndarray
+    coverage_probability: np.ndarray
+
+
+def find_coverage_radius(link_budget_margin, f_ghz, model=UMI, max_radius_km=None, h_ue=1.5,
+                         reliability=0.95):
+    # Exact radius from the closed-form solver, optionally capped
+    radius_km = float(solve_radius(link_budget_margin, f_ghz, model, h_ue, reliability))
+    if max_radius_km is not None:
+        radius_km = min(radius_km, max_radius_km)
+    return radius_km
+
+
+def _edge_distance(d_m, prob, target):
+    # Last distance whose coverage probability still meets the target,
+    # linearly interpolated towards the first distance that misses it
+    below = np.flatnonzero(prob < target)
+    if below.size == 0:
+        return float(d_m[-1])
+    i = below[0]
+    if i == 0:
+        return float(d_m[0])
+    p0, p1 = prob[i - 1], prob[i]
+    t = (p0 - target) / (p0 - p1) if p0 != p1 else 0.0
+    return float(d_m[i - 1] + t * (d_m[i] - d_m[i - 1]))
+
+
+def monte_carlo_radius(mapl, f_ghz, model=UMI, h_ue=1.5, reliability=0.95,
+                       n_draws=4000, n_distances=256, max_radius_km=0.7,
+                       confidence=0.95, rng=None, seed=None, batch_draws=None, progress=None):
+    """Cell-edge radius at which ``reliability`` of LOS realisations stay within MAPL.
+
+    All ``n_draws`` x ``n_distances`` LOS states are drawn and evaluated in one
+    pass; the bounds come from the binomial confidence interval of the
+    per-distance coverage probability. With ``batch_draws`` the draws are
+    made that many rows at a time (the random stream, and so the estimate,
+    is unchanged) and ``progress(done, n_draws)`` is called after each batch.
+    """
+    rng = np.random.default_rng(seed) if rng is None else rng
+    d_m = np.linspace(1.0, max_radius_km * 1000, n_distances)
+
+    # Both branches are deterministic per distance, only the LOS state is random
+    loss_los = pl_los(d_m, f_ghz, h_ue, model)
+    loss_nlos = pl_nlos(d_m, f_ghz, h_ue, model)
+    p_los = los_probability(d_m, model)
+    batch_draws = batch_draws or n_draws
+    hits = np.zeros(n_distances, dtype=np.int64)
+    for start in range(0, n_draws, batch_draws):
+        los = rng.random((min(batch_draws, n_draws - start), n_distances)) < p_los
+        hits += np.where(los, loss_los <= mapl, loss_nlos <= mapl).sum(axis=0)
+        if progress is not None:
+            progress(min(start + batch_draws, n_draws), n_draws)
+    prob = hits / n_draws
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * np.sqrt(prob * (1 - prob) / n_draws)
+
+    return RadiusEstimate(
+        radius_km=_edge_distance(d_m, prob, reliability) / 1000.0,
+        lower_km=_edge_distance(d_m, prob - half_width, reliability) / 1000.0,
+        upper_km=_edge_distance(d_m, prob + half_width, reliability) / 1000.0,
+        reliability=reliability,
+        distances_m=d_m,
+        coverage_probability=prob,
+    )
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+import plotly.graph_objects as go
+
+TRANSPARENT = 'rgba(0,0,0,0)'
+
+BENCHMARK_METRICS = ['Sites per km²', 'Cost per Site ($K)', 'Spectral Efficiency', 'User Experience']
+INDUSTRY_AVERAGE = [8.5, 275, 3.2, 4.5]
+BEST_PRACTICE = [12.0, 200, 4.5, 6.0]
+
+
+def site_requirements_figure(num_sites_coverage, num_sites_capacity, total_sites_required):
+    fig = go.Figure(go.Bar(
+        x=['Coverage', 'Capacity', 'Final Total'],
+        y=[num_sites_coverage, num_sites_capacity, total_sites_required],
+        marker_color=['#1f77b4', '#ff7f0e', '#28a745'],
+    ))
+    fig.update_layout(
+        title='Site Requirements Breakdown',
+        xaxis_title='Requirement Type',
+        yaxis_title='Number of Sites',
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT,
+        font=dict(size=11),
+        title_font_size=14,
+        showlegend=False,
+        height=400
+    )
+    return fig
+
+
+def _drive_gauge(value, x_domain, title, color):
+    return go.Indicator(
+        mode="gauge+number+delta",
+        value=value,
+        domain={'x': x_domain, 'y': [0.5, 1]},
+        title={'text': title},
+        delta={'reference': 50},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': color},
+            'steps': [
+                {'range': [0, 50], 'color': "lightgray"},
+                {'range': [50, 80], 'color': "gray"}],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90}})
+
+
+def efficiency_gauges_figure(coverage_ratio, capacity_ratio, efficiency):
+    fig = go.Figure()
+    fig.add_trace(_drive_gauge(coverage_ratio, [0, 0.48], "Coverage Drive (%)", "#1f77b4"))
+    fig.add_trace(_drive_gauge(capacity_ratio, [0.52, 1], "Capacity Drive (%)", "#ff7f0e"))
+
+    # Network efficiency gauge
+    fig.add_trace(go.Indicator(
+        mode="gauge+number",
+        value=efficiency,
+        domain={'x': [0.25, 0.75], 'y': [0, 0.45]},
+        title={'text': "Network Efficiency (%)"},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "#28a745"},
+            'steps': [
+                {'range': [0, 60], 'color': "#ffcccc"},
+                {'range': [60, 80], 'color': "#ffffcc"},
+                {'range': [80, 100], 'color': "#ccffcc"}]}))
+
+    fig.update_layout(
+        height=400,
+        title="Network Planning Efficiency Metrics",
+        font=dict(size=10),
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT
+    )
+    return fig
+
+
+def cost_breakdown_figure(equipment_cost, installation_cost, annual_opex):
+    fig = go.Figure(go.Pie(
+        labels=['Equipment', 'Installation', 'Annual Maintenance'],
+        values=[equipment_cost, installation_cost, annual_opex],
+        marker=dict(colors=['#1f77b4', '#ff7f0e', '#2ca02c']),
+    ))
+    fig.update_layout(
+        title='Cost Breakdown (5-Year Projection)',
+        height=400,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT
+    )
+    return fig
+
+
+def performance_figure(spectral_efficiency, user_experience, network_load, coverage_efficiency):
+    metrics = ['Spectral Efficiency', 'User Experience', 'Network Load', 'Coverage Quality']
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=metrics,
+        y=[spectral_efficiency, user_experience, network_load, coverage_efficiency],
+        mode='markers+lines',
+        name='Actual',
+        marker=dict(size=12, color='#1f77b4'),
+        line=dict(width=3, color='#1f77b4')
+    ))
+    fig.add_trace(go.Scatter(
+        x=metrics,
+        y=[4.0, 5.0, 70.0, 85.0],
+        mode='markers+lines',
+        name='Target',
+        marker=dict(size=10, color='#ff7f0e', symbol='diamond'),
+        line=dict(width=2, color='#ff7f0e', dash='dash')
+    ))
+    fig.update_layout(
+        title='Network Performance vs Targets',
+        xaxis_title='Performance Metrics',
+        yaxis_title='Value',
+        height=400,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT
+    )
+    return fig
+
+
+def benchmark_figure(site_density, cost_per_site_k, spectral_efficiency, user_experience):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=BENCHMARK_METRICS,
+        y=[site_density, cost_per_site_k, spectral_efficiency, user_experience],
+        mode='markers+lines',
+        name='Your Network',
+        marker=dict(size=12, color='#1f77b4'),
+        line=dict(width=3, color='#1f77b4')
+    ))
+    fig.add_trace(go.Scatter(
+        x=BENCHMARK_METRICS,
+        y=INDUSTRY_AVERAGE,
+        mode='markers+lines',
+        name='Industry Average',
+        marker=dict(size=10, color='#ff7f0e'),
+        line=dict(width=2, color='#ff7f0e', dash='dash')
+    ))
+    fig.add_trace(go.Scatter(
+        x=BENCHMARK_METRICS,
+        y=BEST_PRACTICE,
+        mode='markers+lines',
+        name='Best Practice',
+        marker=dict(size=10, color='#28a745'),
+        line=dict(width=2, color='#28a745', dash='dot')
+    ))
+    fig.update_layout(
+        title='Network Performance vs Industry Benchmarks',
+        xaxis_title='Performance Metrics',
+        yaxis_title='Normalized Values',
+        height=400,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig
+
+
+def sweep_figure(x_values, y_values, z, x_label, y_label, metric_label, contour=False):
+    trace = go.Contour if contour else go.Heatmap
+    fig = go.Figure(trace(
+        x=list(x_values),
+        y=list(y_values),
+        z=z,
+        colorscale='Viridis',
+        colorbar=dict(title=metric_label),
+        hovertemplate=f'{x_label}: %{{x}}<br>{y_label}: %{{y}}<br>{metric_label}: %{{z:,.0f}}<extra></extra>',
+    ))
+    fig.update_layout(
+        title=f'{metric_label} across the sweep',
+        xaxis_title=x_label,
+        yaxis_title=y_label,
+        height=450,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT
+    )
+    if not contour:
+        # Categorical and unevenly spaced axes read better as evenly spaced cells
+        fig.update_xaxes(type='category')
+        fig.update_yaxes(type='category')
+    return fig
+
+
+def pareto_figure(costs, headrooms, labels):
+    fig = go.Figure(go.Scatter(
+        x=list(costs),
+        y=list(headrooms),
+        text=list(labels),
+        mode='markers+lines',
+        line=dict(width=2, color='#1f77b4', shape='hv'),
+        marker=dict(size=10, color='#28a745'),
+        hovertemplate='%{text}<br>Cost: $%{x:,.0f}<br>Headroom: %{y:.0f}%<extra></extra>',
+    ))
+    fig.update_layout(
+        title='Cost vs Capacity Headroom (Pareto Front)',
+        xaxis_title='Lifetime Cost ($)',
+        yaxis_title='Capacity Headroom (%)',
+        height=450,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT,
+        showlegend=False
+    )
+    return fig
+
+
+def coverage_map_figure(x_km, y_km, margin_db, sites_x_km, sites_y_km):
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=x_km,
+        y=y_km,
+        z=margin_db,
+        colorscale='RdYlGn',
+        zmid=0,
+        colorbar=dict(title='Margin (dB)'),
+        hovertemplate='x: %{x:.2f} km<br>y: %{y:.2f} km<br>Margin: %{z:.1f} dB<extra></extra>',
+    ))
+    fig.add_trace(go.Scatter(
+        x=sites_x_km,
+        y=sites_y_km,
+        mode='markers',
+        name='Sites',
+        marker=dict(size=7, color='#1f77b4', symbol='triangle-up', line=dict(width=1, color='white')),
+    ))
+    fig.update_layout(
+        title='Best-Server Coverage Margin',
+        xaxis_title='x (km)',
+        yaxis_title='y (km)',
+        height=550,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT,
+        showlegend=False
+    )
+    fig.update_yaxes(scaleanchor='x', scaleratio=1)
+    return fig
+
+
+def sinr_cdf_figure(sinr_db, cdf, edge_sinr_db):
+    fig = go.Figure(go.Scatter(
+        x=list(sinr_db),
+        y=list(cdf),
+        mode='lines',
+        line=dict(width=3, color='#1f77b4'),
+        hovertemplate='SINR: %{x:.1f} dB<br>CDF: %{y:.2f}<extra></extra>',
+    ))
+    fig.add_vline(x=edge_sinr_db, line=dict(color='#dc3545', dash='dash'),
+                  annotation_text='Cell edge (5%)', annotation_position='top left')
+    fig.update_layout(
+        title='Downlink SINR Distribution',
+        xaxis_title='SINR (dB)',
+        yaxis_title='CDF',
+        height=400,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT,
+        showlegend=False
+    )
+    return fig
+
+
+def coverage_probability_figure(distance_km, probability, reliability, radius_km, lower_km, upper_km):
+    fig = go.Figure(go.Scatter(
+        x=list(distance_km),
+        y=list(probability),
+        mode='lines',
+        line=dict(width=3, color='#1f77b4'),
+        hovertemplate='Distance: %{x:.3f} km<br>Coverage probability: %{y:.3f}<extra></extra>',
+    ))
+    fig.add_vrect(x0=lower_km, x1=upper_km, fillcolor='#17a2b8', opacity=0.2, line_width=0)
+    fig.add_vline(x=radius_km, line=dict(color='#dc3545', dash='dash'),
+                  annotation_text=f'Radius ({reliability:.0%})', annotation_position='top right')
+    fig.add_hline(y=reliability, line=dict(color='#6c757d', dash='dot'))
+    fig.update_layout(
+        title='Simulated Coverage Probability vs Distance',
+        xaxis_title='Distance (km)',
+        yaxis_title='Coverage Probability',
+        height=400,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT,
+        showlegend=False
+    )
+    return fig
+
+
+def load_heatmap_figure(load_pct_by_day):
+    fig = go.Figure(go.Heatmap(
+        z=load_pct_by_day.T,
+        x=list(range(1, load_pct_by_day.shape[0] + 1)),
+        y=list(range(24)),
+        colorscale='RdYlGn_r',
+        zmin=0,
+        zmax=max(100.0, float(load_pct_by_day.max())),
+        colorbar=dict(title='Load (%)'),
+        hovertemplate='Day %{x}, %{y}:00<br>Load: %{z:.0f}%<extra></extra>',
+    ))
+    fig.update_layout(
+        title='Network Load by Hour of Day Across the Year',
+        xaxis_title='Day of Year',
+        yaxis_title='Hour of Day',
+        height=400,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT
+    )
+    return fig
+
+
+def forecast_figure(years, existing_sites, added_sites, cumulative_cost):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=list(years), y=list(existing_sites), name='Installed', marker_color='#1f77b4'))
+    fig.add_trace(go.Bar(x=list(years), y=list(added_sites), name='Added', marker_color='#ff7f0e'))
+    fig.add_trace(go.Scatter(
+        x=list(years),
+        y=list(cumulative_cost),
+        name='Cumulative Cost',
+        mode='lines+markers',
+        yaxis='y2',
+        line=dict(width=3, color='#28a745'),
+    ))
+    fig.update_layout(
+        title='Site Rollout and Cumulative Cost',
+        barmode='stack',
+        xaxis_title='Year',
+        yaxis=dict(title='Sites'),
+        yaxis2=dict(title='Cumulative Cost ($)', overlaying='y', side='right', showgrid=False),
+        height=450,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+
+def cash_flow_fan_figure(years, p5, p25, p50, p75, p95):
+    years = list(years)
+    fig = go.Figure()
+    for low, high, name, color in ((p5, p95, 'P5–P95', 'rgba(31,119,180,0.15)'),
+                                   (p25, p75, 'P25–P75', 'rgba(31,119,180,0.35)')):
+        fig.add_trace(go.Scatter(x=years, y=list(high), mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=years, y=list(low), mode='lines', line=dict(width=0), fill='tonexty',
+                                 fillcolor=color, name=name, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=years, y=list(p50), mode='lines+markers', name='Median',
+                             line=dict(width=3, color='#1f77b4')))
+    fig.add_hline(y=0, line=dict(color='#6c757d', dash='dash'))
+    fig.update_layout(
+        title='Cumulative Discounted Cash Flow',
+        xaxis_title='Year',
+        yaxis_title='Cash Flow ($)',
+        height=450,
+        plot_bgcolor=TRANSPARENT,
+        paper_bgcolor=TRANSPARENT,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
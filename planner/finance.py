@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Monte Carlo cost and return analysis for a network plan.
+
+Unit costs, revenue per user, churn and subscriber growth are each drawn from
+a triangular (low, most likely, high) distribution. The network is built in
+year 0 and earns from year 1 on. Every draw's subscriber base, cash flows,
+NPV, IRR and payback are computed together as (draws, years) arrays, so tens
+of thousands of draws take milliseconds and can be rerun interactively.
+"""
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from planner.core import EQUIPMENT_COST, INSTALLATION_COST, MAINTENANCE_COST
+
+DEFAULT_DRAWS = 20000
+DEFAULT_SEED = 2024
+PERCENTILES = (10, 50, 90)
+FAN_PERCENTILES = (5, 25, 50, 75, 95)
+IRR_BOUNDS = (-0.99, 10.0)  # IRRs outside -99% ... +1000% are reported at the bound
+IRR_ITERATIONS = 32  # bisection steps; resolves the rate to ~3e-9
+
+
+@dataclass(frozen=True)
+class Range:
+    """Triangular distribution; equal bounds give a fixed value."""
+    low: float
+    mode: float
+    high: float
+
+    def __post_init__(self):
+        if not self.low <= self.mode <= self.high:
+            raise ValueError(f"expected low <= most likely <= high, got {self.low}, {self.mode}, {self.high}")
+
+    def sample(self, rng, n):
+        if self.low == self.high:
+            return np.full(n, float(self.mode))
+        return rng.triangular(self.low, self.mode, self.high, n)
+
+
+@dataclass(frozen=True)
+class Assumptions:
+    equipment_cost: Range = Range(0.85 * EQUIPMENT_COST, EQUIPMENT_COST, 1.3 * EQUIPMENT_COST)  # $ per site
+    installation_cost: Range = Range(0.8 * INSTALLATION_COST, INSTALLATION_COST, 1.6 * INSTALLATION_COST)
+    maintenance_cost: Range = Range(0.9 * MAINTENANCE_COST, MAINTENANCE_COST, 1.25 * MAINTENANCE_COST)  # $/site/year
+    arpu: Range = Range(2.0, 4.0, 7.0)  # $ per active user per month
+    churn: Range = Range(0.10, 0.18, 0.30)  # share of subscribers lost per year
+    growth: Range = Range(0.10, 0.25, 0.45)  # new subscribers per year, as a share of the base
+    discount_rate: float = 0.08
+    years: int = 10
+
+
+@dataclass
+class Simulation:
+    cash_flow: np.ndarray  # (draws, years + 1), year 0 is the build
+    capex: np.ndarray
+    npv: np.ndarray
+    irr: np.ndarray
+    payback_years: np.ndarray  # inf where the draw does not pay back within the horizon
+    discount_rate: float
+    elapsed_s: float = 0.0
+    _fan: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def draws(self):
+        return self.cash_flow.shape[0]
+
+    @property
+    def years(self):
+        return np.arange(self.cash_flow.shape[1])
+
+    @property
+    def probability_positive_npv(self):
+        return float(np.mean(self.npv > 0))
+
+    @property
+    def payback_share(self):
+        """Share of draws that recover their investment within the horizon."""
+        return float(np.mean(np.isfinite(self.payback_years)))
+
+    def percentiles(self, values, q=PERCENTILES):
+        # Order statistics, so payback percentiles beyond the horizon stay inf instead of NaN
+        return np.percentile(values, q, method="inverted_cdf")
+
+    def fan(self, q=FAN_PERCENTILES):
+        """Percentiles of cumulative discounted cash flow per year, shape (len(q), years + 1)."""
+        if q not in self._fan:
+            discounted = self.cash_flow / (1 + self.discount_rate) ** self.years
+            self._fan[q] = np.percentile(np.cumsum(discounted, axis=1), q, axis=0)
+        return self._fan[q]
+
+
+def npv(cash_flow, rate):
+    """Net present value per row of ``cash_flow`` (year 0 first), by Horner's rule."""
+    by_year = np.ascontiguousarray(np.atleast_2d(cash_flow).T)
+    return _npv_by_year(by_year, rate)
+
+
+def _npv_by_year(by_year, rate):
+    factor = 1 / (1 + np.asarray(rate, dtype=float))
+    total = np.zeros(by_year.shape[1])
+    for flows in by_year[::-1]:
+        total *= factor
+        total += flows
+    return total
+
+
+def irr(cash_flow, bounds=IRR_BOUNDS, iterations=IRR_ITERATIONS):
+    """Internal rate of return per row, by bisection over all rows at once.
+
+    For a conventional cash flow (the year-0 build, then no negative years)
+    NPV falls with the rate and the root is unique. A row whose later years
+    turn negative, e.g. maintenance above revenue once subscribers churn
+    away, may have several roots; bisection then returns one of them. Rows
+    whose NPV keeps one sign over ``bounds`` get the bound it points to.
+    """
+    by_year = np.ascontiguousarray(np.atleast_2d(cash_flow).T)
+    lo = np.full(by_year.shape[1], float(bounds[0]))
+    hi = np.full(by_year.shape[1], float(bounds[1]))
+    f_lo = _npv_by_year(by_year, lo)
+    f_hi = _npv_by_year(by_year, hi)
+    bracketed = np.sign(f_lo) != np.sign(f_hi)
+    sign_lo = np.sign(f_lo)
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        below = np.sign(_npv_by_year(by_year, mid)) == sign_lo
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return np.where(bracketed, (lo + hi) / 2, np.where(f_hi > 0, bounds[1], bounds[0]))
+
+
+def payback_years(cash_flow):
+    """Years until cumulative cash flow turns non-negative for good, interpolated within the year.
+
+    A row whose cumulative cash dips below zero again later pays back at its
+    last crossing; one that ends the horizon below zero never pays back.
+    """
+    cash_flow = np.atleast_2d(cash_flow)
+    cumulative = np.cumsum(cash_flow, axis=1)
+    # paid[:, k]: cumulative cash stays non-negative from year k to the horizon
+    paid = np.logical_and.accumulate((cumulative >= 0)[:, ::-1], axis=1)[:, ::-1]
+    first = paid.argmax(axis=1)
+    rows = np.arange(cash_flow.shape[0])
+    before = cumulative[rows, np.maximum(first - 1, 0)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        partial = first - 1 - before / cash_flow[rows, first]
+    out = np.where(first == 0, 0.0, partial)
+    return np.where(paid.any(axis=1), out, np.inf)
+
+
+def simulate(sites, active_users, population, assumptions=None, draws=DEFAULT_DRAWS, seed=DEFAULT_SEED):
+    """Monte Carlo cash flows, NPV, IRR and payback for ``sites`` serving ``active_users``.
+
+    The subscriber base starts at ``active_users``, grows and churns by each
+    draw's rates and never exceeds ``population``.
+    """
+    a = assumptions or Assumptions()
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    equipment = a.equipment_cost.sample(rng, draws)
+    installation = a.installation_cost.sample(rng, draws)
+    maintenance = a.maintenance_cost.sample(rng, draws)
+    arpu = a.arpu.sample(rng, draws)
+    churn = a.churn.sample(rng, draws)
+    growth = a.growth.sample(rng, draws)
+
+    years = np.arange(1, a.years + 1)
+    net = (1 + growth) * (1 - churn)
+    subscribers = np.minimum(active_users * net[:, None] ** years, population)
+    cash_flow = np.empty((draws, a.years + 1))
+    capex = sites * (equipment + installation)
+    cash_flow[:, 0] = -capex
+    cash_flow[:, 1:] = subscribers * (12 * arpu)[:, None] - (sites * maintenance)[:, None]
+
+    return Simulation(
+        cash_flow=cash_flow,
+        capex=capex,
+        npv=npv(cash_flow, a.discount_rate),
+        irr=irr(cash_flow),
+        payback_years=payback_years(cash_flow),
+        discount_rate=a.discount_rate,
+        elapsed_s=time.perf_counter() - start,
+    )
+
+
+def simulate_plan(params, result, assumptions=None, draws=DEFAULT_DRAWS, seed=DEFAULT_SEED):
+    """simulate() for a PlanParams and its PlanResult."""
+    return simulate(result.total_sites_required, result.active_users, params.population,
+                    assumptions, draws, seed)
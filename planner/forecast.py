@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import math
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+
+from planner.core import (
+    EQUIPMENT_COST, INSTALLATION_COST, MAINTENANCE_COST, PlanParams, assemble_plan,
+    capacity_per_site, coverage_radius, coverage_sites, link_budget,
+)
+
+def _key(params, names):
+    return tuple(getattr(params, name) for name in names)
+
+
+class _FieldRecorder:
+    """Stands in for PlanParams and records the fields read through it."""
+
+    def __init__(self, params):
+        self._params = params
+        self.read = set()
+
+    def __getattr__(self, name):
+        attr = getattr(type(self._params), name, None)
+        if isinstance(attr, property):
+            # Derived values (freq_ghz, effective_overhead) record the fields they use
+            return attr.fget(self)
+        self.read.add(name)
+        return getattr(self._params, name)
+
+
+@lru_cache(maxsize=1)
+def stage_fields():
+    """PlanParams fields each stage reads, found by running the stages on a recorder.
+
+    A stage is recomputed only when one of its fields changes, so the keys
+    follow the stage code instead of a hand-kept list. Both link-budget
+    branches (computed and custom MAPL) and both duplex modes are traced.
+    """
+    read = {name: set() for name in ("link_budget", "coverage_radius", "coverage_sites", "capacity")}
+    for params in (PlanParams(), PlanParams(custom_mapl=120.0, duplex_mode="FDD")):
+        recorders = {name: _FieldRecorder(params) for name in read}
+        budget = link_budget(recorders["link_budget"])
+        radius = coverage_radius(recorders["coverage_radius"], budget.mapl)
+        coverage_sites(recorders["coverage_sites"], radius)
+        capacity_per_site(recorders["capacity"], budget.n_rb)
+        for name, recorder in recorders.items():
+            read[name] |= recorder.read
+    return {name: tuple(sorted(names)) for name, names in read.items()}
+
+
+class StagedPlanner:
+    """plan_network with the link budget, radius, coverage and capacity stages memoized.
+
+    Each stage is keyed on its own inputs, so replanning a scenario where
+    only demand moved (the usual case from one forecast year to the next)
+    reuses everything but the final demand/cost step. ``computed`` counts
+    how often each stage actually ran.
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self.computed = Counter()
+
+    def _stage(self, name, key, compute):
+        try:
+            return self._cache[name, key]
+        except KeyError:
+            value = self._cache[name, key] = compute()
+            self.computed[name] += 1
+            return value
+
+    def plan(self, params):
+        keys = stage_fields()
+        budget = self._stage("link_budget", _key(params, keys["link_budget"]),
+                             lambda: link_budget(params))
+        radius = self._stage("coverage_radius", (budget.mapl,) + _key(params, keys["coverage_radius"]),
+                             lambda: coverage_radius(params, budget.mapl))
+        coverage = self._stage("coverage_sites", (radius,) + _key(params, keys["coverage_sites"]),
+                               lambda: coverage_sites(params, radius))
+        capacity = self._stage("capacity", (budget.n_rb,) + _key(params, keys["capacity"]),
+                               lambda: capacity_per_site(params, budget.n_rb))
+        return assemble_plan(params, budget, radius, coverage, capacity)
+
+
+@dataclass(frozen=True)
+class Growth:
+    population_rate: float = 0.02  # per year, compound
+    penetration_ceiling: float = 80.0  # % the adoption S-curve saturates at
+    adoption_rate: float = 0.5  # logistic steepness per year
+    traffic_rate: float = 0.25  # per-user traffic, per year, compound
+
+
+def penetration_curve(start, ceiling, rate, year):
+    """Logistic adoption from ``start`` % towards ``ceiling`` %, ``year`` years on."""
+    if start <= 0 or start >= ceiling:
+        return float(start)
+    return ceiling / (1 + (ceiling / start - 1) * math.exp(-rate * year))
+
+
+def yearly_params(params, growth, years, upgrades=None):
+    """PlanParams for year 0 (``params`` itself) through ``years``.
+
+    The entered traffic is today's total demand; it scales with the number
+    of active users and with per-user traffic growth. ``upgrades`` maps a
+    year to PlanParams overrides that apply from that year on.
+    """
+    upgrades = upgrades or {}
+    active_0 = params.population * params.penetration_rate / 100
+    overrides = {}
+    out = []
+    for year in range(years + 1):
+        overrides.update(upgrades.get(year, {}))
+        population = round(params.population * (1 + growth.population_rate) ** year)
+        penetration = penetration_curve(params.penetration_rate, growth.penetration_ceiling,
+                                        growth.adoption_rate, year)
+        users_ratio = population * penetration / 100 / active_0 if active_0 > 0 else 1.0
+        traffic = params.traffic_per_user * users_ratio * (1 + growth.traffic_rate) ** year
+        out.append(replace(params, population=population, penetration_rate=penetration,
+                           traffic_per_user=traffic, **overrides))
+    return out
+
+
+@dataclass
+class YearPlan:
+    year: int
+    params: object
+    result: object
+    installed_sites: int  # sites are never decommissioned
+    sites_added: int
+    capex: float
+    opex: float
+    cumulative_cost: float
+
+
+@dataclass
+class Forecast:
+    years: list
+    recomputed: dict = field(default_factory=dict)
+
+    @property
+    def total_cost(self):
+        return self.years[-1].cumulative_cost if self.years else 0.0
+
+    def as_rows(self):
+        return [{
+            "year": y.year,
+            "population": y.params.population,
+            "penetration_rate": y.params.penetration_rate,
+            "total_traffic_mbps": y.result.total_traffic_mbps,
+            "num_sites_coverage": y.result.num_sites_coverage,
+            "num_sites_capacity": y.result.num_sites_capacity,
+            "total_sites_required": y.result.total_sites_required,
+            "installed_sites": y.installed_sites,
+            "sites_added": y.sites_added,
+            "capex": y.capex,
+            "opex": y.opex,
+            "cumulative_cost": y.cumulative_cost,
+        } for y in self.years]
+
+
+def forecast(params, growth=None, years=10, upgrades=None, planner=None):
+    """Year-by-year rollout: required and installed sites, additions and cost."""
+    growth = growth or Growth()
+    planner = planner or StagedPlanner()
+    before = Counter(planner.computed)
+    installed = 0
+    cumulative = 0.0
+    out = []
+    for year, year_params in enumerate(yearly_params(params, growth, years, upgrades)):
+        result = planner.plan(year_params)
+        added = max(result.total_sites_required - installed, 0)
+        installed += added
+        capex = added * (EQUIPMENT_COST + INSTALLATION_COST)
+        opex = installed * MAINTENANCE_COST
+        cumulative += capex + opex
+        out.append(YearPlan(year, year_params, result, installed, added, capex, opex, cumulative))
+    return Forecast(out, dict(planner.computed - before))
+
+
+def forecast_many(params_list, growth=None, years=10, upgrades=None):
+    """forecast() per scenario, sharing stage results between scenarios with equal inputs."""
+    planner = StagedPlanner()
+    return [forecast(params, growth, years, upgrades, planner) for params in params_list]
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""Saved plans: every calculated scenario with its inputs and outputs.
+
+    python -m planner.history export history.parquet [--city Cairo] [--model UMa]
+
+One row per distinct (inputs, city, area); recalculating a saved scenario
+bumps its ``last_run`` and ``run_count`` instead of adding a row. Every
+PlanParams and PlanResult field is a column, so filters run in SQLite on
+indexed columns and exports stream out column by column.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+import typing
+from dataclasses import fields
+
+from planner.cache import params_key
+from planner.core import PlanParams, PlanResult
+from planner.paths import cache_path
+
+PARAM_COLUMNS = tuple(f.name for f in fields(PlanParams))
+RESULT_COLUMNS = tuple(f.name for f in fields(PlanResult))
+META_COLUMNS = ("id", "created", "last_run", "run_count", "key", "city", "area")
+COLUMNS = META_COLUMNS + PARAM_COLUMNS + RESULT_COLUMNS
+
+# Filterable columns and the indexes behind them; each ends in last_run so the
+# newest matches come straight off the index
+FILTERS = ("city", "area", "freq_mhz", "propagation_model")
+_INDEXES = {
+    "runs_city": ("city", "last_run"),
+    "runs_city_area": ("city", "area", "last_run"),
+    "runs_band": ("freq_mhz", "last_run"),
+    "runs_model": ("propagation_model", "last_run"),
+    "runs_last_run": ("last_run",),
+}
+
+EXPORT_BATCH_ROWS = 65536
+
+
+def _sql_type(annotation):
+    for base in typing.get_args(annotation) or (annotation,):
+        if base is str:
+            return "TEXT"
+        if base is int:
+            return "INTEGER"
+        if base is float:
+            return "REAL"
+    return "TEXT"
+
+
+def _column_types():
+    types = {"id": "INTEGER PRIMARY KEY", "created": "REAL NOT NULL", "last_run": "REAL NOT NULL",
+             "run_count": "INTEGER NOT NULL", "key": "TEXT NOT NULL", "city": "TEXT", "area": "TEXT"}
+    hints = {**typing.get_type_hints(PlanParams), **typing.get_type_hints(PlanResult)}
+    for name in PARAM_COLUMNS + RESULT_COLUMNS:
+        types[name] = _sql_type(hints[name])
+    return types
+
+
+class ScenarioStore:
+    """SQLite history of calculated plans, safe to share between sessions.
+
+    If the database cannot be opened the store is disabled: saves are
+    dropped and queries come back empty.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or cache_path("history.sqlite")
+        self._lock = threading.Lock()
+        self._db = None
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._migrate(db)
+            self._db = db
+        except (OSError, sqlite3.Error):
+            self._db = None
+
+    @staticmethod
+    def _migrate(db):
+        types = _column_types()
+        db.execute("CREATE TABLE IF NOT EXISTS runs ("
+                   + ", ".join(f"{name} {types[name]}" for name in COLUMNS)
+                   + ", UNIQUE (key, city, area))")
+        # Fields added to PlanParams/PlanResult later become new, NULL-filled columns
+        existing = {row[1] for row in db.execute("PRAGMA table_info(runs)")}
+        for name in COLUMNS:
+            if name not in existing:
+                db.execute(f"ALTER TABLE runs ADD COLUMN {name} {types[name]}")
+        for index, columns in _INDEXES.items():
+            db.execute(f"CREATE INDEX IF NOT EXISTS {index} ON runs ({', '.join(columns)})")
+        db.commit()
+
+    @property
+    def available(self):
+        return self._db is not None
+
+    def save(self, params, result, city=None, area=None):
+        """Record a calculated plan; returns its row id (None when the store is disabled)."""
+        if self._db is None:
+            return None
+        now = time.time()
+        values = [getattr(params, name) for name in PARAM_COLUMNS] \
+            + [getattr(result, name) for name in RESULT_COLUMNS]
+        names = ("created", "last_run", "run_count", "key", "city", "area") + PARAM_COLUMNS + RESULT_COLUMNS
+        with self._lock:
+            try:
+                cursor = self._db.execute(
+                    f"INSERT INTO runs ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+                    "ON CONFLICT (key, city, area) DO UPDATE SET "
+                    "last_run = excluded.last_run, run_count = run_count + 1 RETURNING id",
+                    [now, now, 1, params_key(params), city or "", area or ""] + values)
+                row_id = cursor.fetchone()[0]
+                self._db.commit()
+                return row_id
+            except sqlite3.Error:
+                return None
+
+    def _where(self, filters):
+        clauses = []
+        args = []
+        for name, value in filters.items():
+            if name not in FILTERS and name != "since":
+                raise ValueError(f"Cannot filter saved plans by {name}")
+            if value is None:
+                continue
+            if name == "since":
+                clauses.append("last_run >= ?")
+            else:
+                clauses.append(f"{name} = ?")
+            args.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+    def _select(self, columns, filters, limit=None, offset=0):
+        where, args = self._where(filters)
+        sql = f"SELECT {', '.join(columns)} FROM runs{where} ORDER BY last_run DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            args += [limit, offset]
+        return sql, args
+
+    def query(self, columns=COLUMNS, limit=100, offset=0, **filters):
+        """Most recent saved plans matching ``filters`` (city, area, freq_mhz,
+        propagation_model, since), as dicts."""
+        if self._db is None:
+            return []
+        sql, args = self._select(columns, filters, limit, offset)
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def count(self, **filters):
+        if self._db is None:
+            return 0
+        where, args = self._where(filters)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM runs{where}", args).fetchone()[0]
+
+    def distinct(self, column, **filters):
+        """Values of a filter column present in the history, for filter pickers."""
+        if column not in FILTERS:
+            raise ValueError(f"Cannot list values of {column}")
+        if self._db is None:
+            return []
+        where, args = self._where(filters)
+        with self._lock:
+            rows = self._db.execute(f"SELECT DISTINCT {column} FROM runs{where} ORDER BY {column}",
+                                    args).fetchall()
+        return [row[0] for row in rows]
+
+    def get(self, row_id):
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute(f"SELECT {', '.join(COLUMNS)} FROM runs WHERE id = ?",
+                                   (row_id,)).fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+    def params(self, row_id):
+        """The PlanParams a saved plan was calculated with."""
+        row = self.get(row_id)
+        if row is None:
+            raise KeyError(row_id)
+        return PlanParams(**{name: row[name] for name in PARAM_COLUMNS})
+
+    def iter_batches(self, columns=COLUMNS, batch_rows=EXPORT_BATCH_ROWS, **filters):
+        """Matching rows as pyarrow RecordBatches of up to ``batch_rows`` rows."""
+        pa = _pyarrow()
+        if self._db is None:
+            return
+        schema = arrow_schema(columns)
+        sql, args = self._select(columns, filters)
+        # A dedicated connection, so saves from other sessions are not blocked for the whole export
+        cursor = sqlite3.connect(self.path, timeout=5).execute(sql, args)
+        while True:
+            rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                break
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+                schema=schema)
+        cursor.connection.close()
+
+    def to_arrow(self, columns=COLUMNS, **filters):
+        pa = _pyarrow()
+        return pa.Table.from_batches(list(self.iter_batches(columns, **filters)),
+                                     schema=arrow_schema(columns))
+
+    def export(self, destination, fmt=None, columns=COLUMNS, **filters):
+        """Write matching plans to a Parquet or Arrow IPC file (path or binary file object).
+
+        Rows stream through in batches, so the full history is never held in memory.
+        Returns the number of rows written.
+        """
+        pa = _pyarrow()
+        fmt = fmt or ("arrow" if str(destination).endswith((".arrow", ".feather", ".ipc")) else "parquet")
+        schema = arrow_schema(columns)
+        written = 0
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            writer = pq.ParquetWriter(destination, schema, compression="zstd")
+        elif fmt == "arrow":
+            writer = pa.ipc.new_file(destination, schema)
+        else:
+            raise ValueError(f"Unknown export format {fmt!r}; use 'parquet' or 'arrow'")
+        with writer:
+            for batch in self.iter_batches(columns, **filters):
+                writer.write_batch(batch)
+                written += batch.num_rows
+        return written
+
+    def __len__(self):
+        return self.count()
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401 - used as pa.ipc
+    except ImportError as exc:
+        raise ImportError("Exporting saved plans needs pyarrow (pip install pyarrow)") from exc
+    return pyarrow
+
+
+def arrow_schema(columns=COLUMNS):
+    pa = _pyarrow()
+    kinds = {"TEXT": pa.string(), "INTEGER": pa.int64(), "REAL": pa.float64()}
+    types = _column_types()
+    return pa.schema([(name, kinds[types[name].split()[0]]) for name in columns])
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = ScenarioStore()
+    return _default_store
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m planner.history",
+                                     description="Export saved plans as a columnar file.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="write saved plans to Parquet or Arrow")
+    export.add_argument("output", help="file to write; .arrow/.feather/.ipc selects Arrow IPC")
+    export.add_argument("--format", choices=["parquet", "arrow"])
+    export.add_argument("--db", help="history database (default: the app's)")
+    export.add_argument("--city")
+    export.add_argument("--area")
+    export.add_argument("--freq-mhz", type=float)
+    export.add_argument("--model", dest="propagation_model")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    store = ScenarioStore(args.db)
+    if not store.available:
+        print(f"cannot open {store.path}", file=sys.stderr)
+        return 1
+    written = store.export(args.output, args.format, city=args.city, area=args.area,
+                           freq_mhz=args.freq_mhz, propagation_model=args.propagation_model)
+    print(f"{written} saved plans written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+import itertools
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Heavy analyses allowed to run at once per process; the rest wait in the queue
+MAX_CONCURRENT_JOBS = int(os.environ.get("PLANNER_MAX_JOBS", "2"))
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's progress callback once cancellation was requested."""
+
+
+class Job:
+    """State of one submitted analysis, readable from any thread.
+
+    The job function reports through ``report(done, total, partial)``; the
+    latest partial result is kept so a page can draw it while the job runs.
+    """
+
+    def __init__(self, kind, label, tag=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.label = label
+        self.tag = tag  # whatever the submitting view needs to recognise its job
+        self.status = QUEUED
+        self.done = 0
+        self.total = None
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def fraction(self):
+        if self.status == DONE:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(self.done / self.total, 1.0)
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started
+
+    def report(self, done, total=None, partial=None):
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+        self.done = done
+        if total is not None:
+            self.total = total
+        if partial is not None:
+            self.partial = partial
+
+    def wait(self, timeout=None):
+        """Block until the job finishes or ``timeout`` seconds pass; True if it finished."""
+        return self._finished.wait(timeout)
+
+    def cancel(self):
+        # Queued jobs never start; running ones stop at their next progress report
+        self._cancel.set()
+
+    def _run(self, fn, args, kwargs):
+        if self._cancel.is_set():
+            self.status, self.finished_at = CANCELLED, time.time()
+            self._finished.set()
+            return
+        self.status, self.started = RUNNING, time.time()
+        try:
+            self.result = fn(*args, progress=self.report, **kwargs)
+            self.status = DONE
+        except JobCancelled:
+            self.status = CANCELLED
+        except Exception as exc:  # surfaced to the page instead of killing the worker
+            self.error = f"{type(exc).__name__}: {exc}"
+            self.status = FAILED
+        finally:
+            self.partial = None
+            self.finished_at = time.time()
+            self._finished.set()
+
+
+class JobQueue:
+    """Runs long analyses on a bounded pool of worker threads.
+
+    Jobs outlive the page that submitted them and are looked up by id, so a
+    reconnecting session gets its result back. The heavy lifting is NumPy,
+    which releases the GIL, and threads let partial results be read without
+    copying them between processes. Only the ``keep`` most recent finished
+    jobs are retained.
+    """
+
+    def __init__(self, max_workers=MAX_CONCURRENT_JOBS, keep=200):
+        self.max_workers = max_workers
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="planner-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, *args, label=None, tag=None, **kwargs):
+        """Queue ``fn(*args, progress=job.report, **kwargs)`` and return its Job."""
+        job = Job(kind, label or kind, tag)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        self._pool.submit(job._run, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, kind=None):
+        # Newest first
+        with self._lock:
+            jobs = list(reversed(self._jobs.values()))
+        return [job for job in jobs if kind is None or job.kind == kind]
+
+    @property
+    def active(self):
+        return sum(not job.finished for job in self.jobs())
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in itertools.islice(finished, max(len(finished) - self.keep, 0)):
+            del self._jobs[job_id]
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            for job in self.jobs():
+                job.cancel()
+        self._pool.shutdown(wait=True)
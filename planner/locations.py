@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""District catalogue behind the city/area pickers.
+
+The catalogue is a CSV file (``planner/data/locations.csv``, or the file
+named by PLANNER_LOCATIONS) with a ``# version:`` comment line and the
+columns city, area, area_type, clutter, area_km2, population. On first use it
+is parsed once and turned into an index: rows grouped by city (in file
+order), the row range of every city, and a sorted table of name-word prefixes for
+type-ahead search. The index is cached as an .npz keyed by the file's
+content hash, so later processes load it without re-parsing the CSV.
+"""
+import csv
+import hashlib
+import io
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+
+from planner.paths import cache_path
+from planner.traffic import PROFILES
+
+INDEX_VERSION = 1
+DEFAULT_CATALOGUE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "locations.csv")
+CATALOGUE_PATH = os.environ.get("PLANNER_LOCATIONS") or DEFAULT_CATALOGUE
+COLUMNS = ("city", "area", "area_type", "clutter", "area_km2", "population")
+SEARCH_LIMIT = 20
+
+_WORD = re.compile(r"[^\w]+")
+
+
+@dataclass(frozen=True)
+class Location:
+    city: str
+    area: str
+    area_type: str
+    clutter: str
+    area_km2: float
+    population: int
+
+
+def normalize(text):
+    """Case- and accent-folded words, for matching typed text against names."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(_WORD.sub(" ", text.casefold()).split())
+
+
+def read_catalogue(path):
+    """(version, rows, content digest) from a catalogue CSV; rows are tuples in COLUMNS order."""
+    with open(path, "rb") as fh:
+        raw = fh.read()
+    version = None
+    lines = []
+    line_nos = []  # file line number of each entry in lines, for error messages
+    for file_line_no, line in enumerate(io.StringIO(raw.decode("utf-8-sig")), start=1):
+        if line.startswith("#"):
+            key, _, value = line[1:].partition(":")
+            if key.strip() == "version":
+                version = value.strip()
+        elif line.strip():
+            lines.append(line)
+            line_nos.append(file_line_no)
+    reader = csv.DictReader(lines)
+    missing = set(COLUMNS) - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f"{path}: missing columns {', '.join(sorted(missing))}")
+    rows = []
+    seen = set()
+    for record in reader:
+        line_no = line_nos[reader.line_num - 1]
+        try:
+            row = (record["city"].strip(), record["area"].strip(), record["area_type"].strip(),
+                   record["clutter"].strip(), float(record["area_km2"]), int(float(record["population"])))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"{path}, line {line_no}: {exc}") from None
+        if row[2] not in PROFILES:
+            raise ValueError(f"{path}, line {line_no}: unknown area_type {row[2]!r}; "
+                             f"expected one of {', '.join(PROFILES)}")
+        if row[4] <= 0 or row[5] < 0:
+            raise ValueError(f"{path}, line {line_no}: area_km2 must be positive and population non-negative")
+        if (row[0], row[1]) in seen:
+            raise ValueError(f"{path}, line {line_no}: duplicate district {row[1]!r} in {row[0]!r}")
+        seen.add((row[0], row[1]))
+        rows.append(row)
+    return version or "unversioned", rows, hashlib.sha256(raw).hexdigest()[:16]
+
+
+class Catalogue:
+    """Districts grouped by city, with per-city row ranges and a word-prefix search index."""
+
+    def __init__(self, arrays, version):
+        self.version = version
+        self._city = arrays["city"]
+        self._area = arrays["area"]
+        self._area_type = arrays["area_type"]
+        self._clutter = arrays["clutter"]
+        self._area_km2 = arrays["area_km2"]
+        self._population = arrays["population"]
+        self._words = arrays["words"]
+        self._word_rows = arrays["word_rows"]
+        self.cities = self._city[arrays["city_starts"]].tolist()
+        bounds = np.append(arrays["city_starts"], len(self._city))
+        self._ranges = {city: (int(bounds[i]), int(bounds[i + 1])) for i, city in enumerate(self.cities)}
+        self._areas = {}
+
+    @classmethod
+    def build(cls, rows, version):
+        first_seen = {}
+        for row in rows:
+            first_seen.setdefault(row[0], len(first_seen))
+        rows = sorted(rows, key=lambda row: first_seen[row[0]])
+        columns = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+        arrays = {name: np.array(values, dtype=str) for name, values in zip(COLUMNS[:4], columns[:4])}
+        arrays["area_km2"] = np.array(columns[4], dtype=float)
+        arrays["population"] = np.array(columns[5], dtype=np.int64)
+        city = arrays["city"]
+        arrays["city_starts"] = np.flatnonzero(np.r_[True, city[1:] != city[:-1]]) if len(city) else \
+            np.zeros(0, dtype=np.int64)
+
+        # Every word of "area city" points back at its row; search matches typed
+        # words as prefixes of these with two binary searches per word
+        words, word_rows = [], []
+        for i, row in enumerate(rows):
+            for word in set(normalize(f"{row[1]} {row[0]}").split()):
+                words.append(word)
+                word_rows.append(i)
+        order = np.argsort(np.array(words, dtype=str), kind="stable")
+        arrays["words"] = np.array(words, dtype=str)[order] if words else np.array([], dtype=str)
+        arrays["word_rows"] = np.array(word_rows, dtype=np.int64)[order]
+        return cls(arrays, version)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, version=np.array(self.version), city=self._city, area=self._area,
+                 area_type=self._area_type, clutter=self._clutter, area_km2=self._area_km2,
+                 population=self._population, words=self._words, word_rows=self._word_rows,
+                 city_starts=np.array([self._ranges[city][0] for city in self.cities], dtype=np.int64))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        return cls(arrays, str(arrays.pop("version")))
+
+    def __len__(self):
+        return len(self._city)
+
+    def _location(self, i):
+        return Location(str(self._city[i]), str(self._area[i]), str(self._area_type[i]),
+                        str(self._clutter[i]), float(self._area_km2[i]), int(self._population[i]))
+
+    def areas(self, city):
+        """Area names of ``city`` in catalogue order (empty for an unknown city)."""
+        if city not in self._areas:
+            start, stop = self._ranges.get(city, (0, 0))
+            self._areas[city] = self._area[start:stop].tolist()
+        return self._areas[city]
+
+    def get(self, city, area):
+        start, stop = self._ranges.get(city, (0, 0))
+        names = self._area[start:stop]
+        hits = np.flatnonzero(names == area)
+        return self._location(start + int(hits[0])) if len(hits) else None
+
+    def search(self, text, limit=SEARCH_LIMIT):
+        """Districts whose area or city names start with every typed word, most populous first."""
+        rows = None
+        for word in normalize(text).split():
+            lo = np.searchsorted(self._words, word, side="left")
+            hi = np.searchsorted(self._words, word + "\U0010ffff", side="left")
+            matched = np.unique(self._word_rows[lo:hi])
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+            if not len(rows):
+                return []
+        if rows is None:
+            return []
+        top = rows[np.argsort(-self._population[rows], kind="stable")[:limit]]
+        return [self._location(i) for i in top]
+
+
+_catalogue = None
+_catalogue_lock = threading.Lock()
+
+
+def _index_path(digest):
+    return cache_path("locations", f"index-v{INDEX_VERSION}-{digest}.npz")
+
+
+def _load_or_build(path):
+    with open(path, "rb") as fh:
+        digest = hashlib.sha256(fh.read()).hexdigest()[:16]
+    try:
+        return Catalogue.load(_index_path(digest))
+    except (OSError, ValueError, KeyError):
+        pass
+    version, rows, digest = read_catalogue(path)
+    catalogue = Catalogue.build(rows, version)
+    try:
+        catalogue.save(_index_path(digest))
+    except OSError:
+        pass
+    return catalogue
+
+
+def catalogue(path=None):
+    # Process-wide catalogue, indexed on first use and shared by every session
+    global _catalogue
+    if path is not None:
+        return _load_or_build(path)
+    if _catalogue is None:
+        with _catalogue_lock:
+            if _catalogue is None:
+                _catalogue = _load_or_build(CATALOGUE_PATH)
+    return _catalogue
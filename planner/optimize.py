@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+from dataclasses import dataclass, field, replace
+from itertools import product
+
+import numpy as np
+
+from planner.core import BANDS, EQUIPMENT_COST, INSTALLATION_COST, MAINTENANCE_COST, PlanParams, plan_many
+from planner.sweep import SWEEPABLE, evaluate_grid
+from planner.traffic import demand_factor
+
+# Discrete configuration space searched by default
+SEARCH_SPACE = {
+    "freq_mhz": tuple(BANDS.values()),
+    "bandwidth_mhz": (10, 20, 40, 60, 80, 100),
+    "mimo_layers": (1, 2, 4, 8, 16),
+    "sectors_per_site": (1, 3),
+    "antenna_type": ("Directive", "Omni"),
+}
+
+# Inputs that move num_sites_coverage; everything else only moves capacity.
+# bandwidth_mhz and freq_mhz sit on both sides: thermal noise and the radius
+# versus resource blocks, whose table depends on the band (FR1/FR2).
+COVERAGE_FIELDS = frozenset((
+    "antenna_type", "freq_mhz", "propagation_model", "h_ue", "cell_edge_reliability",
+    "max_radius_km", "custom_mapl", "tx_power", "tx_gain", "cable_loss", "penetration_loss",
+    "foliage_loss", "body_loss", "interference_margin", "rain_margin", "shadow_margin",
+    "rx_gain", "noise_figure", "required_sinr", "bandwidth_mhz",
+))
+SHARED_FIELDS = frozenset(("bandwidth_mhz", "freq_mhz"))
+
+# Demand is given, not designed
+DEMAND_FIELDS = frozenset(("area_km2", "population", "penetration_rate", "traffic_per_user",
+                           "area_type", "sizing_percentile"))
+
+
+def lifetime_cost_per_site(years=5):
+    return EQUIPMENT_COST + INSTALLATION_COST + years * MAINTENANCE_COST
+
+
+@dataclass(frozen=True)
+class Candidate:
+    config: dict
+    total_sites_required: int
+    num_sites_coverage: int
+    num_sites_capacity: int
+    site_throughput_mbps: float
+    cost: float
+    headroom: float  # installed capacity over demand, minus one
+
+    def params(self, base):
+        return replace(base, **self.config)
+
+
+@dataclass
+class SearchResult:
+    front: list
+    evaluated: int
+    pruned: int
+    space_size: int
+    years: int = 5
+    axes: dict = field(default_factory=dict)
+
+    @property
+    def cheapest(self):
+        return self.front[0] if self.front else None
+
+
+def _headroom(sites, throughput, traffic):
+    # Installed capacity over demand, minus one. Without demand capacity is
+    # unconstrained, so every configuration has unbounded headroom.
+    if traffic <= 0:
+        return np.full(np.shape(sites), np.inf)
+    return sites * throughput / traffic - 1
+
+
+def _pareto(points):
+    # Non-dominated set for (minimize cost, maximize headroom), sorted by cost
+    points = sorted(points, key=lambda c: (c.cost, -c.headroom))
+    front = []
+    for point in points:
+        if not front or point.headroom > front[-1].headroom:
+            front.append(point)
+    return front
+
+
+def _dominated(front, cost, headroom):
+    return any(p.cost <= cost and p.headroom >= headroom for p in front)
+
+
+def optimize(base=None, space=None, years=5, min_headroom=0.0, max_cost=None):
+    """Pareto front of lifetime cost against capacity headroom over a discrete space.
+
+    ``space`` maps PlanParams fields to candidate values (default
+    SEARCH_SPACE); fields not listed keep their value from ``base``. Cost is
+    CAPEX plus ``years`` of OPEX; headroom is installed capacity over demand
+    minus one, and infinite when the demand is zero. Only configurations
+    with at least ``min_headroom`` and, if given, at most ``max_cost`` are
+    kept.
+
+    Coverage and capacity are evaluated on their own sub-grids. Since
+    total sites are max(coverage, capacity), the coverage sites of a branch
+    bound its cost from below and the best site throughput under it bounds
+    its headroom from above, so branches that cannot reach the front or the
+    constraints are never combined with the capacity choices.
+    """
+    base = base or PlanParams()
+    space = {name: list(values) for name, values in (space or SEARCH_SPACE).items()}
+    for name, values in space.items():
+        if name not in SWEEPABLE:
+            raise ValueError(f"Cannot search unknown parameter: {name}")
+        if name in DEMAND_FIELDS:
+            raise ValueError(f"{name} is part of the demand, not a design choice")
+        if not values:
+            raise ValueError(f"No candidate values given for {name}")
+
+    outer = {n: v for n, v in space.items() if n in COVERAGE_FIELDS}
+    shared = [n for n in outer if n in SHARED_FIELDS]
+    inner = {n: v for n, v in space.items() if n not in COVERAGE_FIELDS}
+    unit_cost = lifetime_cost_per_site(years)
+    traffic = np.float64(base.traffic_per_user * demand_factor(base.area_type, base.sizing_percentile))
+
+    # Coverage sites per outer branch and site throughput per capacity choice
+    coverage = evaluate_grid(base, outer).metrics["num_sites_coverage"]
+    capacity_axes = {**{n: outer[n] for n in shared}, **inner}
+    throughput = evaluate_grid(base, capacity_axes).metrics["site_throughput_mbps"]
+    inner_shape = tuple(len(v) for v in inner.values())
+    inner_size = int(np.prod(inner_shape))
+    throughput = throughput.reshape(throughput.shape[:len(shared)] + (inner_size,))
+
+    outer_names = list(outer)
+    shared_pos = [outer_names.index(n) for n in shared]
+    # Cheapest branches first, so the front fills early and prunes the rest
+    branches = sorted(np.ndindex(coverage.shape), key=lambda idx: coverage[idx])
+
+    inner_configs = [dict(zip(inner, combo)) for combo in
+                     (tuple(v[i] for v, i in zip(inner.values(), idx))
+                      for idx in np.ndindex(inner_shape))]
+
+    front = []
+    evaluated = pruned = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for idx in branches:
+            c_sites = float(coverage[idx])
+            t = throughput[tuple(idx[p] for p in shared_pos)]
+            lower_cost = c_sites * unit_cost
+            # ceil(traffic / T) * T < traffic + T, so headroom is capped by the best T
+            t_max = float(np.max(t))
+            upper_headroom = float(_headroom(max(c_sites * t_max, traffic + t_max), 1.0, traffic))
+            if (upper_headroom < min_headroom or (max_cost is not None and lower_cost > max_cost)
+                    or _dominated(front, lower_cost, upper_headroom)):
+                pruned += inner_size
+                continue
+
+            evaluated += inner_size
+            k_sites = np.where(t > 0, np.ceil(traffic / t), 0)
+            sites = np.maximum(c_sites, k_sites)
+            cost = sites * unit_cost
+            headroom = _headroom(sites, t, traffic)
+            keep = headroom >= min_headroom
+            if max_cost is not None:
+                keep &= cost <= max_cost
+            outer_config = {n: outer[n][i] for n, i in zip(outer_names, idx)}
+            points = [Candidate(
+                config={**outer_config, **inner_configs[j]},
+                total_sites_required=int(sites[j]),
+                num_sites_coverage=int(c_sites),
+                num_sites_capacity=int(k_sites[j]),
+                site_throughput_mbps=float(t[j]),
+                cost=float(cost[j]),
+                headroom=float(headroom[j]),
+            ) for j in np.flatnonzero(keep)]
+            if points:
+                front = _pareto(front + points)
+
+    return SearchResult(front, evaluated, pruned, evaluated + pruned, years, space)
+
+
+def exhaustive_front(base=None, space=None, years=5, min_headroom=0.0, max_cost=None):
+    """The front optimize() should return, from plan_network on every configuration.
+
+    Slow (one full plan per configuration); a reference for checking the
+    pruned search.
+    """
+    base = base or PlanParams()
+    space = space or SEARCH_SPACE
+    configs = [dict(zip(space, combo)) for combo in product(*space.values())]
+    unit_cost = lifetime_cost_per_site(years)
+    points = []
+    for config, result in zip(configs, plan_many(replace(base, **config) for config in configs)):
+        cost = result.total_sites_required * unit_cost
+        headroom = float(_headroom(result.total_sites_required, result.site_throughput_mbps,
+                                   result.total_traffic_mbps))
+        if headroom >= min_headroom and (max_cost is None or cost <= max_cost):
+            points.append(Candidate(config, result.total_sites_required, result.num_sites_coverage,
+                                    result.num_sites_capacity, result.site_throughput_mbps, cost, headroom))
+    return _pareto(points)
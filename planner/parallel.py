@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from planner.core import params_from_mapping, plan_many, plan_network
+from planner.solver import radius_table
+from planner.traffic import custom_profiles, register_profile
+
+
+def _init_worker(profiles=()):
+    # Map the radius table once per worker; the pages are shared between processes.
+    # Traffic profiles registered in the parent are registered again, as workers
+    # do not necessarily start as a copy of it.
+    radius_table()
+    for profile in profiles:
+        register_profile(profile)
+
+
+def parse_json_row(line):
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"invalid JSON: {exc}") from None
+
+
+def plan_rows(rows, first_lineno=1):
+    """Plan a list of raw records (mappings, or JSON text) as one batch.
+
+    Returns (line number, output record or None, error message or None) per
+    row; rows that fail to parse or that the planner rejects (including
+    arithmetic overflow on extreme inputs) are reported without sinking the
+    batch.
+    """
+    parsed = []
+    out = []
+    for lineno, row in enumerate(rows, first_lineno):
+        try:
+            if isinstance(row, str):
+                row = parse_json_row(row)
+            parsed.append((lineno,) + params_from_mapping(row))
+        except (ValueError, TypeError, ArithmeticError) as exc:
+            out.append((lineno, None, str(exc)))
+    try:
+        results = plan_many(params for _, params, _ in parsed)
+    except (ValueError, ArithmeticError):
+        # Fall back to one scenario at a time to isolate the bad rows
+        results = []
+        for lineno, params, _ in parsed:
+            try:
+                results.append(plan_network(params))
+            except (ValueError, ArithmeticError) as exc:
+                results.append(exc)
+    for (lineno, _, extras), result in zip(parsed, results):
+        if isinstance(result, Exception):
+            out.append((lineno, None, str(result)))
+        else:
+            out.append((lineno, {**extras, **result.as_dict()}, None))
+    out.sort(key=lambda item: item[0])
+    return out
+
+
+def plan_batch(records, chunk_size=256, progress=None):
+    """plan_rows over a list of records, one chunk at a time.
+
+    ``progress(done, total, partial)`` is called after each chunk; partial is
+    the growing output list, in the (line number, record, error) form, whose
+    first ``done`` entries are final.
+    """
+    records = list(records)
+    out = []
+    for lineno, rows in chunked(records, chunk_size):
+        out.extend(plan_rows(rows, lineno))
+        if progress is not None:
+            progress(len(out), len(records), out)
+    return out
+
+
+def chunked(records, chunk_size):
+    records = iter(records)
+    lineno = 1
+    while True:
+        rows = list(islice(records, chunk_size))
+        if not rows:
+            return
+        yield lineno, rows
+        lineno += len(rows)
+
+
+def plan_records_parallel(records, workers=None, chunk_size=256):
+    """Parallel counterpart of planner.cli.plan_records.
+
+    Records are planned in chunks on a process pool and yielded in input
+    order as (line number, output record or None, error message or None).
+    At most ``2 * workers`` chunks are in flight, so memory stays bounded
+    however long the input is.
+    """
+    workers = workers or os.cpu_count() or 1
+    # Build the table here on a cold cache, so the workers only ever load a finished one
+    radius_table()
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(custom_profiles(),)) as pool:
+        for lineno, rows in chunked(records, chunk_size):
+            pending.append(pool.submit(plan_rows, rows, lineno))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
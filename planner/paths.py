@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+import os
+
+# Generated artefacts (lookup tables, caches) live outside the source tree
+# when PLANNER_CACHE_DIR is set, e.g. on read-only container images.
+CACHE_DIR = os.environ.get(
+    "PLANNER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+
+
+def cache_path(*parts):
+    return os.path.join(CACHE_DIR, *parts)
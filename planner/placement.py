@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+import heapq
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from planner.core import plan_network
+
+_KEY_STRIDE = np.int64(1) << 32
+
+
+def hex_lattice(half_m, spacing_m):
+    """Hexagonal grid of points inside the square [-half_m, half_m]²."""
+    row_step = spacing_m * math.sqrt(3) / 2
+    rows = []
+    for row, y in enumerate(np.arange(-half_m + row_step / 2, half_m, row_step)):
+        offset = spacing_m / 2 if row % 2 else 0.0
+        x = np.arange(-half_m + spacing_m / 2 + offset, half_m, spacing_m)
+        rows.append(np.column_stack([x, np.full(len(x), y)]))
+    points = np.concatenate(rows) if rows else np.empty((0, 2))
+    return points if len(points) else np.zeros((1, 2))
+
+
+class GridIndex:
+    """Uniform-grid spatial index over 2-D points.
+
+    Points are bucketed into square cells of ``cell_m``; radius and nearest
+    queries only visit the cells around each query, so with roughly uniform
+    points both cost O(1) per query instead of O(n).
+    """
+
+    def __init__(self, points, cell_m):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.cell_m = float(cell_m)
+        keys = self._keys(self._cells(self.points))
+        self.order = np.argsort(keys, kind="stable")
+        self.cell_keys, self.starts, counts = np.unique(keys[self.order], return_index=True,
+                                                        return_counts=True)
+        self.ends = self.starts + counts
+
+    def _cells(self, points):
+        return np.floor(points / self.cell_m).astype(np.int64)
+
+    @staticmethod
+    def _keys(cells):
+        return cells[:, 0] * _KEY_STRIDE + cells[:, 1]
+
+    def _bucket(self, cells):
+        # (start, end) into self.order for each cell; empty range if the cell has no points
+        keys = self._keys(cells)
+        if not len(self.cell_keys):
+            empty = np.zeros(len(keys), dtype=np.int64)
+            return empty, empty
+        pos = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+        hit = self.cell_keys[pos] == keys
+        return np.where(hit, self.starts[pos], 0), np.where(hit, self.ends[pos], 0)
+
+    def _ring_pairs(self, query_cells, query_ids, rings):
+        # All (query, point) pairs whose cells are within Chebyshev distance ``rings``
+        q_parts, p_parts = [], []
+        for dx in range(-rings, rings + 1):
+            for dy in range(-rings, rings + 1):
+                start, end = self._bucket(query_cells + (dx, dy))
+                counts = end - start
+                if not counts.any():
+                    continue
+                q = np.repeat(query_ids, counts)
+                offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                q_parts.append(q)
+                p_parts.append(self.order[np.repeat(start, counts) + offsets])
+        if not q_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(q_parts), np.concatenate(p_parts)
+
+    def query_radius(self, queries, radius_m):
+        """(query index, point index) pairs no further apart than ``radius_m``."""
+        queries = np.asarray(queries, dtype=float).reshape(-1, 2)
+        rings = int(math.ceil(radius_m / self.cell_m))
+        q, p = self._ring_pairs(self._cells(queries), np.arange(len(queries)), rings)
+        d2 = ((queries[q] - self.points[p]) ** 2).sum(axis=1)
+        keep = d2 <= radius_m * radius_m
+        return q[keep], p[keep]
+
+    def nearest(self, queries):
+        """Index of and distance to the nearest point for every query."""
+        queries = np.asarray(queries, dtype=float).reshape(-1, 2)
+        cells = self._cells(queries)
+        index = np.full(len(queries), -1, dtype=np.int64)
+        dist = np.full(len(queries), np.inf)
+        pending = np.arange(len(queries))
+        rings = 1
+        while len(pending):
+            q, p = self._ring_pairs(cells[pending], pending, rings)
+            if len(q):
+                d = np.hypot(*(queries[q] - self.points[p]).T)
+                order = np.lexsort((d, q))
+                first = np.r_[True, q[order][1:] != q[order][:-1]]
+                best_q, best_p, best_d = q[order][first], p[order][first], d[order][first]
+                index[best_q], dist[best_q] = best_p, best_d
+            # Points beyond the searched rings are at least rings * cell_m away
+            pending = pending[~(dist[pending] <= rings * self.cell_m)]
+            rings *= 2
+            if rings * self.cell_m > 1e9:
+                break
+        return index, dist
+
+
+def site_spacing_m(params, result=None):
+    """Inter-site distance of a hexagonal grid at the planned density.
+
+    Each site serves the area the planner assigns it: the coverage
+    footprint, or less when capacity calls for more sites.
+    """
+    result = result or plan_network(params)
+    area_per_site = min(result.a_site, params.area_km2 / max(result.total_sites_required, 1))
+    return math.sqrt(2 * area_per_site / math.sqrt(3)) * 1000
+
+
+def site_layout(params, result=None):
+    """Hexagonal site grid over a square planning area centred on the origin."""
+    half = math.sqrt(params.area_km2) * 1000 / 2
+    return hex_lattice(half, site_spacing_m(params, result))
+
+
+@dataclass
+class Placement:
+    sites_m: np.ndarray  # (n_sites, 2), same square frame as planner.raster
+    radius_m: float
+    covered_fraction: float  # share of demand weight within radius_m of a site
+    method: str
+
+
+def demand_points(params, spacing_m, demand=None):
+    """Demand sample grid over the area and its weights.
+
+    ``demand`` is an optional callable mapping (x_m, y_m) arrays to
+    non-negative weights; by default demand is uniform.
+    """
+    half = math.sqrt(params.area_km2) * 1000 / 2
+    n = max(1, int(math.ceil(2 * half / spacing_m)))
+    axis = -half + (np.arange(n) + 0.5) * (2 * half / n)
+    x, y = np.meshgrid(axis, axis)
+    points = np.column_stack([x.ravel(), y.ravel()])
+    weights = np.ones(len(points)) if demand is None else np.asarray(
+        demand(points[:, 0], points[:, 1]), dtype=float).reshape(len(points))
+    return points, weights
+
+
+def covered_fraction(sites, points, weights, radius_m):
+    if not len(sites):
+        return 0.0
+    _, dist = GridIndex(sites, radius_m).nearest(points)
+    total = weights.sum()
+    return float(weights[dist <= radius_m].sum() / total) if total > 0 else 1.0
+
+
+def greedy_cover(candidates, points, weights, radius_m, target=0.99):
+    """Pick candidates until ``target`` of the demand weight is within ``radius_m``.
+
+    Lazy greedy: gains only shrink as demand gets covered, so a stale heap
+    entry is re-scored and accepted once it still beats the next best.
+    """
+    cand_idx, point_idx = GridIndex(points, radius_m).query_radius(candidates, radius_m)
+    order = np.argsort(cand_idx, kind="stable")
+    cand_idx, point_idx = cand_idx[order], point_idx[order]
+    bounds = np.searchsorted(cand_idx, np.arange(len(candidates) + 1))
+    members = [point_idx[bounds[i]:bounds[i + 1]] for i in range(len(candidates))]
+
+    remaining = weights.astype(float).copy()
+    uncovered = remaining.sum()
+    goal = (1 - target) * uncovered
+    heap = [(-remaining[m].sum(), i) for i, m in enumerate(members) if len(m)]
+    heapq.heapify(heap)
+    chosen = []
+    while heap and uncovered > goal:
+        _, i = heapq.heappop(heap)
+        gain = remaining[members[i]].sum()
+        if gain <= 0:
+            continue
+        if heap and gain < -heap[0][0]:
+            heapq.heappush(heap, (-gain, i))
+            continue
+        chosen.append(i)
+        uncovered -= gain
+        remaining[members[i]] = 0
+    return candidates[chosen]
+
+
+def kmeans(sites, points, weights, iterations=20, tol_m=1.0):
+    """Weighted Lloyd iterations moving each site to the centroid of the demand it serves."""
+    sites = np.array(sites, dtype=float)
+    cell = math.sqrt(np.ptp(points[:, 0]) * np.ptp(points[:, 1]) / max(len(sites), 1)) or 1.0
+    for _ in range(iterations):
+        nearest, _ = GridIndex(sites, cell).nearest(points)
+        mass = np.bincount(nearest, weights, minlength=len(sites))
+        cx = np.bincount(nearest, weights * points[:, 0], minlength=len(sites))
+        cy = np.bincount(nearest, weights * points[:, 1], minlength=len(sites))
+        served = mass > 0
+        moved = np.zeros_like(sites)
+        moved[served] = np.column_stack([cx[served], cy[served]]) / mass[served, None]
+        # Sites with no demand stay where they are
+        moved[~served] = sites[~served]
+        shift = np.hypot(*(moved - sites).T).max() if len(sites) else 0.0
+        sites = moved
+        if shift < tol_m:
+            break
+    return sites
+
+
+def place_sites(params, method="greedy", demand=None, target=0.99, result=None):
+    """Site coordinates for ``params`` over the square planning area.
+
+    ``"hex"`` is the plain lattice at the planned density, ``"greedy"``
+    covers ``target`` of the demand from a dense candidate lattice with the
+    fewest sites it can, and ``"kmeans"`` spreads the planned number of
+    sites (coverage or capacity, whichever is larger) over the demand.
+    """
+    result = result or plan_network(params)
+    radius_m = result.coverage_radius_km * 1000
+    half = math.sqrt(params.area_km2) * 1000 / 2
+    points, weights = demand_points(params, radius_m / 3, demand)
+
+    lattice = site_layout(params, result)
+    if method == "hex":
+        sites = lattice
+    elif method == "greedy":
+        sites = greedy_cover(hex_lattice(half, radius_m / 2), points, weights, radius_m, target)
+    elif method == "kmeans":
+        sites = kmeans(lattice, points, weights)
+    else:
+        raise ValueError(f"Unknown placement method: {method}")
+    return Placement(sites, radius_m, covered_fraction(sites, points, weights, radius_m), method)
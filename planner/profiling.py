@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+from planner.paths import cache_path
+
+# Per-run stage timings are appended to spans.jsonl and summarised in
+# stages.prom (Prometheus text format, for node_exporter's textfile
+# collector). PLANNER_METRICS=0 keeps them in memory only.
+METRICS_DIR = os.environ.get("PLANNER_METRICS_DIR") or cache_path("metrics")
+EXPORT = os.environ.get("PLANNER_METRICS", "1") != "0"
+
+WINDOW = 2000  # most recent samples per stage behind the quantiles
+JSONL_MAX_BYTES = 16 * 1024 * 1024  # rotated to spans.jsonl.1 beyond this
+PROM_INTERVAL_S = 5.0
+QUANTILES = (0.5, 0.95, 0.99)
+
+_local = threading.local()
+_NO_SPAN = nullcontext()
+
+
+class RunTrace:
+    """Stage timings of one script run.
+
+    Top-level stages are sequential: starting one ends the previous. Spans
+    nest inside the current stage and are named by their path, e.g.
+    ``results/plan_network/coverage_radius``.
+    """
+
+    def __init__(self, label="rerun"):
+        self.label = label
+        self.started = time.time()
+        self.spans = []  # [path, seconds, depth], in start order
+        self.total = None
+        self._t0 = time.perf_counter()
+        self._stage = None
+        self._path = []
+
+    def stage(self, name):
+        now = time.perf_counter()
+        self._close_stage(now)
+        self._stage = ([name, None, 0], now)
+        self.spans.append(self._stage[0])
+        self._path = [name]
+
+    def _close_stage(self, now):
+        if self._stage is not None:
+            entry, started = self._stage
+            entry[1] = now - started
+            self._stage = None
+            self._path = []
+
+    @contextmanager
+    def span(self, name):
+        entry = ["/".join(self._path + [name]), None, len(self._path)]
+        self.spans.append(entry)
+        self._path.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry[1] = time.perf_counter() - started
+            self._path.pop()
+
+    def finish(self):
+        now = time.perf_counter()
+        self._close_stage(now)
+        self.total = now - self._t0
+        # Spans cut short by st.rerun/st.stop never closed
+        self.spans = [entry for entry in self.spans if entry[1] is not None]
+        return self
+
+    def as_dict(self):
+        return {
+            "ts": round(self.started, 3),
+            "run": self.label,
+            "total_ms": round(self.total * 1000, 3),
+            "stages": {path: round(seconds * 1000, 3) for path, seconds, _ in self.spans},
+        }
+
+
+class StageStats:
+    """Rolling per-stage latency samples across every session of the process."""
+
+    def __init__(self, window=WINDOW):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._sum = defaultdict(float)
+        self._count = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, trace):
+        with self._lock:
+            for path, seconds in [("total", trace.total)] + [(p, s) for p, s, _ in trace.spans]:
+                key = (trace.label, path)
+                self._samples[key].append(seconds)
+                self._sum[key] += seconds
+                self._count[key] += 1
+
+    def summary(self):
+        """{(run, stage): {"count", "mean", "p50", "p95", "p99"}} over the window."""
+        with self._lock:
+            items = [(key, sorted(samples), self._count[key]) for key, samples in self._samples.items()]
+        out = {}
+        for key, samples, count in items:
+            row = {"count": count, "mean": sum(samples) / len(samples)}
+            for q in QUANTILES:
+                row[f"p{round(q * 100)}"] = samples[min(int(q * len(samples)), len(samples) - 1)]
+            out[key] = row
+        return out
+
+    def prometheus(self):
+        lines = ["# HELP planner_stage_seconds Script run stage latency.",
+                 "# TYPE planner_stage_seconds summary"]
+        summary = self.summary()
+        with self._lock:
+            totals = {key: (self._sum[key], self._count[key]) for key in summary}
+        for (run, stage), row in sorted(summary.items()):
+            labels = f'run="{run}",stage="{stage}"'
+            for q in QUANTILES:
+                lines.append(f'planner_stage_seconds{{{labels},quantile="{q}"}} '
+                             f'{row[f"p{round(q * 100)}"]:.6g}')
+            total, count = totals[(run, stage)]
+            lines.append(f"planner_stage_seconds_sum{{{labels}}} {total:.6g}")
+            lines.append(f"planner_stage_seconds_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Appends each run to spans.jsonl and refreshes stages.prom every few seconds.
+
+    The first I/O error switches export off for the process, so a read-only
+    cache directory never breaks the app.
+    """
+
+    def __init__(self, directory=METRICS_DIR, enabled=EXPORT):
+        self.directory = directory
+        self.enabled = enabled
+        self._last_prom = 0.0
+        self._lock = threading.Lock()
+
+    def export(self, trace, stats):
+        if not self.enabled:
+            return
+        try:
+            with self._lock:
+                os.makedirs(self.directory, exist_ok=True)
+                jsonl = os.path.join(self.directory, "spans.jsonl")
+                if os.path.exists(jsonl) and os.path.getsize(jsonl) > JSONL_MAX_BYTES:
+                    os.replace(jsonl, jsonl + ".1")
+                with open(jsonl, "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(trace.as_dict()) + "\n")
+                if time.monotonic() - self._last_prom >= PROM_INTERVAL_S:
+                    self._last_prom = time.monotonic()
+                    prom = os.path.join(self.directory, "stages.prom")
+                    tmp = f"{prom}.{os.getpid()}.tmp"
+                    with open(tmp, "w", encoding="utf-8") as fh:
+                        fh.write(stats.prometheus())
+                    os.replace(tmp, prom)
+        except OSError:
+            self.enabled = False
+
+
+STATS = StageStats()
+EXPORTER = MetricsExporter()
+
+
+def start_run(label="rerun"):
+    """Begin timing a script run on this thread; replaces any unfinished trace."""
+    _local.trace = RunTrace(label)
+    return _local.trace
+
+
+def current_run():
+    return getattr(_local, "trace", None)
+
+
+def stage(name):
+    trace = current_run()
+    if trace is not None:
+        trace.stage(name)
+
+
+def span(name):
+    # A shared no-op outside a traced run (worker threads, batch jobs, the CLI)
+    trace = getattr(_local, "trace", None)
+    return _NO_SPAN if trace is None else trace.span(name)
+
+
+def finish_run():
+    """End the thread's run, add it to STATS and export it; returns the trace."""
+    trace = current_run()
+    if trace is None:
+        return None
+    _local.trace = None
+    trace.finish()
+    STATS.record(trace)
+    EXPORTER.export(trace, STATS)
+    return trace
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+UMI = "UMi-Street Canyon"
+UMA = "UMa"
+
+# Path loss in dB is  a + b*log10(d_m) + c*log10(f_ghz) + e*(h_ue - 1.5)
+# for both the LOS and NLOS branch of each model; ``los_decay_km`` is the
+# exponential term of the LOS probability and ``shadow_std_db`` the (LOS,
+# NLOS) shadow fading standard deviation from TR 38.901.
+MODELS = {
+    UMI: {
+        "los": (32.4, 21.0, 20.0, 0.0),
+        "nlos": (22.4, 35.3, 21.3, -0.3),
+        "los_decay_km": 36.0,
+        "shadow_std_db": (4.0, 7.82),
+    },
+    UMA: {
+        "los": (28.0, 22.0, 20.0, 0.0),
+        "nlos": (13.54, 39.08, 20.0, -0.6),
+        "los_decay_km": 63.0,
+        "shadow_std_db": (4.0, 6.0),
+    },
+}
+
+# Stream for LOS draws when no ``rng`` is passed explicitly
+_rng = np.random.default_rng()
+
+
+def model_coefficients(model):
+    try:
+        return MODELS[model]
+    except KeyError:
+        raise ValueError(f"Unknown propagation model: {model!r}") from None
+
+
+def _branch(coeffs, d_m, f_ghz, h_ue):
+    a, b, c, e = coeffs
+    return a + b * np.log10(d_m) + c * np.log10(f_ghz) + e * (h_ue - 1.5)
+
+
+def los_probability(d_m, model=UMI):
+    d_km = np.asarray(d_m, dtype=float) / 1000.0
+    decay = np.exp(-d_km / model_coefficients(model)["los_decay_km"])
+    return np.minimum(18.0 / d_km, 1.0) * (1.0 - decay) + decay
+
+
+def pl_los(d_m, f_ghz, h_ue=1.5, model=UMI):
+    return _branch(model_coefficients(model)["los"], d_m, f_ghz, h_ue)
+
+
+def pl_nlos(d_m, f_ghz, h_ue=1.5, model=UMI):
+    # NLOS loss is never allowed to drop below the LOS loss at the same distance
+    coeffs = model_coefficients(model)
+    return np.maximum(_branch(coeffs["los"], d_m, f_ghz, h_ue),
+                      _branch(coeffs["nlos"], d_m, f_ghz, h_ue))
+
+
+def path_loss(d_m, f_ghz, h_ue=1.5, model=UMI, los=None, rng=None, return_los=False):
+    """Path loss in dB for broadcastable arrays of distance, frequency and UE height.
+
+    ``los`` may be a boolean mask (or scalar) fixing the LOS state; when it is
+    None the state is drawn per element from the model's LOS probability.
+    """
+    d_m = np.asarray(d_m, dtype=float)
+    f_ghz = np.asarray(f_ghz, dtype=float)
+    h_ue = np.asarray(h_ue, dtype=float)
+    shape = np.broadcast_shapes(d_m.shape, f_ghz.shape, h_ue.shape)
+
+    if los is None:
+        rng = _rng if rng is None else rng
+        los = rng.random(shape) < los_probability(d_m, model)
+    los = np.broadcast_to(np.asarray(los, dtype=bool), shape)
+
+    pl = np.where(los, pl_los(d_m, f_ghz, h_ue, model), pl_nlos(d_m, f_ghz, h_ue, model))
+    if return_los:
+        return pl, los
+    return pl
+
+
+def pl_umi_array(d_m, f_ghz, h_ue=1.5, los=None, rng=None, return_los=False):
+    return path_loss(d_m, f_ghz, h_ue, UMI, los=los, rng=rng, return_los=return_los)
+
+
+def pl_uma_array(d_m, f_ghz, h_ue=1.5, los=None, rng=None, return_los=False):
+    return path_loss(d_m, f_ghz, h_ue, UMA, los=los, rng=rng, return_los=return_los)
+
+
+# Scalar entry points kept for the per-sample callers
+def pl_umi(d_m, f_ghz, h_ue=1.5):
+    return float(pl_umi_array(d_m, f_ghz, h_ue))
+
+
+def pl_uma(d_m, f_ghz, h_ue=1.5):
+    return float(pl_uma_array(d_m, f_ghz, h_ue))
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from planner.core import link_budget
+from planner.placement import site_layout
+from planner.propagation import pl_los, pl_nlos
+from planner.solver import los_distance
+
+MIN_DISTANCE_M = 10.0  # UMi/UMa formulas are not defined closer than this
+MIN_BLOCK_PX = 16  # smallest pixel block that candidate sites are pruned for
+CANDIDATE_CHUNK = 32  # sites compared per pass, so a distance block is at most tile_px² x 32
+
+
+@dataclass
+class CoverageMap:
+    x_m: np.ndarray  # pixel centres along a row
+    y_m: np.ndarray  # pixel centres along a column
+    margin_db: np.ndarray  # (len(y_m), len(x_m)) best-server MAPL minus path loss
+    best_server: np.ndarray  # index into sites_m per pixel
+    sites_m: np.ndarray  # (n_sites, 2) site coordinates
+    receiver_sensitivity: float
+    resolution_m: float
+
+    @property
+    def rx_power_dbm(self):
+        # The budget closes exactly at the sensitivity, so received power is sensitivity + margin
+        return self.receiver_sensitivity + self.margin_db
+
+    @property
+    def covered_fraction(self):
+        return float(np.count_nonzero(self.margin_db >= 0)) / self.margin_db.size
+
+    def downsample(self, max_side=400):
+        step = max(1, math.ceil(max(self.margin_db.shape) / max_side))
+        if step == 1:
+            return self
+        return CoverageMap(self.x_m[::step], self.y_m[::step], self.margin_db[::step, ::step],
+                           self.best_server[::step, ::step], self.sites_m,
+                           self.receiver_sensitivity, self.resolution_m * step)
+
+
+def _axis(half, resolution_m):
+    n = max(1, int(math.ceil(2 * half / resolution_m)))
+    return -half + (np.arange(n) + 0.5) * resolution_m
+
+
+def _candidates(sites, x0, x1, y0, y1):
+    # The nearest site to any pixel in the block is no further than the
+    # smallest worst-case distance to the block, so farther sites can be skipped
+    sx, sy = sites[:, 0], sites[:, 1]
+    near = np.hypot(np.maximum.reduce([x0 - sx, sx - x1, np.zeros_like(sx)]),
+                    np.maximum.reduce([y0 - sy, sy - y1, np.zeros_like(sy)]))
+    far = np.hypot(np.maximum(np.abs(sx - x0), np.abs(sx - x1)),
+                   np.maximum(np.abs(sy - y0), np.abs(sy - y1)))
+    return np.flatnonzero(near <= far.min())
+
+
+def _nearest_site(sites, tx, ty):
+    """Index of and distance to the nearest site for every pixel of the block ``ty`` x ``tx``."""
+    best = np.full((len(ty), len(tx)), np.inf)
+    nearest = np.zeros((len(ty), len(tx)), dtype=np.int64)
+    idx = _candidates(sites, tx[0], tx[-1], ty[0], ty[-1])
+    # Running minimum over fixed-size candidate chunks; on ties the lower site index wins
+    for start in range(0, len(idx), CANDIDATE_CHUNK):
+        chunk = idx[start:start + CANDIDATE_CHUNK]
+        dx = tx[None, :, None] - sites[chunk, 0]
+        dy = ty[:, None, None] - sites[chunk, 1]
+        d2 = dx * dx + dy * dy
+        k = np.argmin(d2, axis=-1)
+        d2 = np.take_along_axis(d2, k[..., None], axis=-1)[..., 0]
+        closer = d2 < best
+        best = np.where(closer, d2, best)
+        nearest = np.where(closer, chunk[k], nearest)
+    return nearest, np.sqrt(best)
+
+
+def reliability_path_loss(d_m, params, obstructed=None):
+    """Path loss met with probability ``cell_edge_reliability`` at distance ``d_m``.
+
+    LOS up to the distance where the LOS probability drops below the
+    reliability, NLOS beyond it, so the covered pixels of a lone site end
+    exactly at the planner's coverage radius. Pixels in ``obstructed``
+    (blocked by terrain) always take the NLOS branch.
+    """
+    if params.antenna_type != "Directive":
+        # The planner credits omni sites with 20% more reach
+        d_m = d_m / 1.2
+    d_m = np.maximum(d_m, MIN_DISTANCE_M)
+    # los_probability takes the distance in km, so the statistical LOS range is
+    # long (about 20 km for UMi and 22 km for UMa at 95%): without terrain,
+    # practically every pixel within reach of a site is LOS
+    los = d_m <= los_distance(float(params.cell_edge_reliability), params.propagation_model)
+    if obstructed is not None:
+        los = los & ~obstructed
+    return np.where(los,
+                    pl_los(d_m, params.freq_ghz, params.h_ue, params.propagation_model),
+                    pl_nlos(d_m, params.freq_ghz, params.h_ue, params.propagation_model))
+
+
+def iter_tiles(params, sites, resolution_m=10.0, tile_px=256, terrain=None):
+    """Yield (row, col, margin_db, best_server) for each tile of the planning area.
+
+    Each tile is split into blocks about one site spacing wide. A block is
+    compared only with the sites that can be nearest to it, CANDIDATE_CHUNK
+    sites at a time, so memory stays bounded by ``tile_px`` regardless of the
+    area, resolution or site count. With a ``terrain``
+    (planner.terrain.Terrain), each tile reads only the raster window spanning
+    it and its serving sites, and the margin includes the per-pixel clutter
+    loss and terrain diffraction.
+    """
+    half = math.sqrt(params.area_km2) * 1000 / 2
+    xs, ys = _axis(half, resolution_m), _axis(half, resolution_m)
+    mapl = link_budget(params).mapl
+    spacing_m = 2 * half / math.sqrt(max(len(sites), 1))
+    block = int(min(max(spacing_m / resolution_m, MIN_BLOCK_PX), tile_px))
+    for row in range(0, len(ys), tile_px):
+        ty = ys[row:row + tile_px]
+        for col in range(0, len(xs), tile_px):
+            tx = xs[col:col + tile_px]
+            nearest = np.empty((len(ty), len(tx)), dtype=np.int64)
+            d = np.empty((len(ty), len(tx)))
+            for r in range(0, len(ty), block):
+                for c in range(0, len(tx), block):
+                    nearest[r:r + block, c:c + block], d[r:r + block, c:c + block] = _nearest_site(
+                        sites, tx[c:c + block], ty[r:r + block])
+            # Every site radiates the same budget, so the best server is the
+            # nearest one and its loss is the lowest (with terrain, the nearest
+            # site's path is the one that is profiled)
+            if terrain is None:
+                margin = (mapl - reliability_path_loss(d, params)).astype(np.float32)
+            else:
+                serving = sites[np.unique(nearest)]
+                window = terrain.window(min(tx[0], serving[:, 0].min()), max(tx[-1], serving[:, 0].max()),
+                                        min(ty[0], serving[:, 1].min()), max(ty[-1], serving[:, 1].max()))
+                extra, obstructed = terrain.tile_loss(window, sites[nearest], tx[None, :], ty[:, None], params)
+                margin = (mapl - reliability_path_loss(d, params, obstructed) - extra).astype(np.float32)
+            yield row, col, margin, nearest.astype(np.int32)
+
+
+def rasterize(params, resolution_m=10.0, tile_px=256, sites=None, terrain=None, out=None):
+    """Best-server coverage margin over the planning area at ``resolution_m``.
+
+    With ``out`` (a directory), the margin and best-server grids are written to
+    memory-mapped ``margin.npy``/``server.npy`` there instead of held in RAM,
+    so regions larger than memory can be rasterized.
+    """
+    if sites is None:
+        sites = site_layout(params)
+    half = math.sqrt(params.area_km2) * 1000 / 2
+    xs, ys = _axis(half, resolution_m), _axis(half, resolution_m)
+    if out is None:
+        margin = np.empty((len(ys), len(xs)), dtype=np.float32)
+        server = np.empty((len(ys), len(xs)), dtype=np.int32)
+    else:
+        os.makedirs(out, exist_ok=True)
+        margin = np.lib.format.open_memmap(os.path.join(out, "margin.npy"), "w+", np.float32, (len(ys), len(xs)))
+        server = np.lib.format.open_memmap(os.path.join(out, "server.npy"), "w+", np.int32, (len(ys), len(xs)))
+    for row, col, tile_margin, tile_server in iter_tiles(params, sites, resolution_m, tile_px, terrain):
+        h, w = tile_margin.shape
+        margin[row:row + h, col:col + w] = tile_margin
+        server[row:row + h, col:col + w] = tile_server
+    return CoverageMap(xs, ys, margin, server, sites, link_budget(params).receiver_sensitivity,
+                       resolution_m)
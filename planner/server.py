@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""JSON planning API over HTTP.
+
+    python -m planner.server [--host 127.0.0.1] [--port 8765] [-j 2]
+
+Endpoints:
+
+    GET  /health   liveness probe
+    GET  /fields   plan inputs and their defaults
+    GET  /stats    request and batch counters
+    POST /plan     one scenario object, or a list of them; fields are named
+                   after PlanParams and missing ones keep the app defaults
+
+Requests that arrive within ``--batch-window-ms`` of each other are planned
+as one vectorized batch on the worker pool.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import traceback
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import fields
+from http import HTTPStatus
+
+from planner.core import PlanParams
+from planner.parallel import _init_worker, plan_rows
+from planner.solver import radius_table
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+
+def plan_isolated(rows):
+    """plan_rows for one micro-batch, as (record, error, HTTP status) per row.
+
+    Rows the planner rejects get 422. If something unexpected escapes
+    plan_rows, the batch is replanned row by row so the failure only reaches
+    the request that sent the offending row, as a 500.
+    """
+    try:
+        planned = plan_rows(rows)
+    except Exception as exc:
+        if len(rows) == 1:
+            traceback.print_exc()
+            return [(None, f"internal error: {type(exc).__name__}: {exc}", HTTPStatus.INTERNAL_SERVER_ERROR)]
+        planned = None
+    if planned is None:
+        return [result for row in rows for result in plan_isolated([row])]
+    return [(record, None, HTTPStatus.OK) if error is None else (None, error, HTTPStatus.UNPROCESSABLE_ENTITY)
+            for _, record, error in planned]
+
+
+class MicroBatcher:
+    """Collects scenarios from concurrent requests and plans them together.
+
+    The first scenario of a batch starts a ``window_s`` timer; everything
+    submitted before it fires (or until ``max_batch`` is reached) goes to
+    the executor as one plan_isolated call. If the executor breaks (e.g. a
+    worker process died), the affected batches fail and ``rebuild()``, when
+    given, supplies a fresh executor for the next ones.
+    """
+
+    def __init__(self, executor, window_s=0.001, max_batch=512, rebuild=None):
+        self.executor = executor
+        self.rebuild = rebuild
+        self.restarts = 0
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.batches = 0
+        self.scenarios = 0
+        self.largest = 0
+        self._pending = []
+        self._timer = None
+
+    async def plan(self, rows):
+        # One future per scenario; a request's rows may span two batches
+        loop = asyncio.get_running_loop()
+        futures = []
+        for row in rows:
+            future = loop.create_future()
+            self._pending.append((row, future))
+            futures.append(future)
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+        if self._pending and self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return await asyncio.gather(*futures)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.scenarios += len(batch)
+        self.largest = max(self.largest, len(batch))
+        executor = self.executor
+        try:
+            task = asyncio.get_running_loop().run_in_executor(
+                executor, plan_isolated, [row for row, _ in batch])
+        except Exception as exc:
+            # Raised here, inside a timer callback, nobody would resolve the batch
+            self._failed(executor, batch, exc)
+            return
+        task.add_done_callback(lambda done: self._resolve(executor, batch, done))
+
+    def _failed(self, executor, batch, exc):
+        if isinstance(exc, BrokenExecutor) and executor is self.executor and self.rebuild is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self.rebuild()
+            self.restarts += 1
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
+
+    def _resolve(self, executor, batch, done):
+        if done.exception() is not None:
+            self._failed(executor, batch, done.exception())
+            return
+        for (_, future), result in zip(batch, done.result()):
+            if not future.done():
+                future.set_result(result)
+
+
+class PlanningServer:
+    def __init__(self, batcher):
+        self.batcher = batcher
+        self.requests = 0
+        self.defaults = {f.name: f.default for f in fields(PlanParams)}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                        {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, payload = await self.dispatch(method, target.split("?", 1)[0], body)
+                except Exception as exc:
+                    # e.g. a broken worker pool; the client still gets a status
+                    traceback.print_exc()
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {
+                        "error": f"internal error: {type(exc).__name__}: {exc}"}
+                keep_alive = (version == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close")
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(self, method, path, body):
+        self.requests += 1
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok"}
+        if path == "/fields" and method == "GET":
+            return HTTPStatus.OK, self.defaults
+        if path == "/stats" and method == "GET":
+            b = self.batcher
+            return HTTPStatus.OK, {
+                "requests": self.requests,
+                "batches": b.batches,
+                "scenarios": b.scenarios,
+                "mean_batch_size": b.scenarios / b.batches if b.batches else 0.0,
+                "largest_batch": b.largest,
+                "executor_restarts": b.restarts,
+            }
+        if path == "/plan":
+            if method != "POST":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use POST"}
+            return await self._plan(body)
+        return HTTPStatus.NOT_FOUND, {"error": f"no route for {method} {path}"}
+
+    async def _plan(self, body):
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": f"invalid JSON: {exc}"}
+        single = isinstance(payload, dict)
+        rows = [payload] if single else payload
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            return HTTPStatus.BAD_REQUEST, {"error": "expected a scenario object or a list of them"}
+        results = await self.batcher.plan(rows)
+        if single:
+            record, error, status = results[0]
+            return status, record if error is None else {"error": error}
+        return HTTPStatus.OK, [record if error is None else {"error": error, "status": status.value}
+                               for record, error, status in results]
+
+
+def make_executor(workers):
+    if workers == 1:
+        # Planning in a helper thread keeps the event loop free without the process overhead
+        _init_worker()
+        return ThreadPoolExecutor(max_workers=1)
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=_init_worker)
+
+
+async def serve(host="127.0.0.1", port=8765, workers=1, window_s=0.001, max_batch=512, ready=None):
+    # Build the table before any worker starts, so on a cold cache they only load it
+    radius_table()
+    batcher = MicroBatcher(make_executor(workers), window_s, max_batch,
+                           rebuild=lambda: make_executor(workers))
+    try:
+        app = PlanningServer(batcher)
+        server = await asyncio.start_server(app.handle, host, port)
+        async with server:
+            address = server.sockets[0].getsockname()
+            print(f"planning API listening on http://{address[0]}:{address[1]}", file=sys.stderr)
+            if ready is not None:
+                ready(address)
+            await server.serve_forever()
+    finally:
+        batcher.executor.shutdown()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m planner.server",
+                                     description="Serve the planning computation as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="worker processes; 1 plans on a helper thread, 0 uses every core")
+    parser.add_argument("--batch-window-ms", type=float, default=1.0,
+                        help="how long to wait for concurrent requests to batch (default: 1)")
+    parser.add_argument("--max-batch", type=int, default=512,
+                        help="scenarios per vectorized batch (default: 512)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # Exit through serve()'s cleanup on SIGTERM too, so the worker processes are shut down
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        asyncio.run(serve(args.host, args.port, args.jobs, args.batch_window_ms / 1000,
+                          args.max_batch))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+import math
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from planner.core import bps_per_sector, link_budget
+from planner.placement import site_spacing_m
+from planner.propagation import model_coefficients, path_loss
+from planner.throughput import peak_spectral_efficiency
+
+# Attenuated Shannon mapping (TR 36.942): SE = ALPHA * log2(1 + SINR), zero
+# below SINR_MIN_DB and capped at the peak the capacity model assumes
+SHANNON_ALPHA = 0.6
+SINR_MIN_DB = -10.0
+
+# TR 36.814 sector pattern: 70° half-power beamwidth for three sectors, 30 dB front-to-back
+SECTOR_BEAMWIDTH_DEG = 70.0
+FRONT_TO_BACK_DB = 30.0
+
+_SINR_BINS = np.arange(-30.0, 60.05, 0.1)
+
+
+def hex_rings(rings, isd_m):
+    """Site coordinates of a hexagonal layout: the centre site plus ``rings`` rings."""
+    directions = [(1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1), (1, -1)]
+    axial = [(0, 0)]
+    for k in range(1, rings + 1):
+        # Start k steps out and walk the six sides of the ring
+        q, r = k * directions[4][0], k * directions[4][1]
+        for dq, dr in directions:
+            for _ in range(k):
+                axial.append((q, r))
+                q, r = q + dq, r + dr
+    axial = np.asarray(axial, dtype=float)
+    return np.column_stack([isd_m * (axial[:, 0] + axial[:, 1] / 2),
+                            isd_m * axial[:, 1] * math.sqrt(3) / 2])
+
+
+def sector_gain_db(angle_deg, sectors):
+    """Horizontal antenna pattern relative to boresight; omni when there is one sector."""
+    if sectors <= 1:
+        return np.zeros_like(angle_deg)
+    beamwidth = SECTOR_BEAMWIDTH_DEG * 3 / sectors
+    offset = (angle_deg + 180.0) % 360.0 - 180.0
+    return -np.minimum(12.0 * (offset / beamwidth) ** 2, FRONT_TO_BACK_DB)
+
+
+def drop_ues(n, isd_m, rng):
+    # Uniform over the centre site's hexagonal cell, by rejection from its bounding square
+    half = isd_m / math.sqrt(3)
+    normals = np.array([[1.0, 0.0], [0.5, math.sqrt(3) / 2], [-0.5, math.sqrt(3) / 2]])
+    out = np.empty((0, 2))
+    while len(out) < n:
+        pts = rng.uniform(-half, half, (int((n - len(out)) * 1.6) + 16, 2))
+        inside = np.all(np.abs(pts @ normals.T) <= isd_m / 2, axis=1)
+        out = np.concatenate([out, pts[inside]])
+    return out[:n]
+
+
+def _percentile(bins, counts, pct):
+    cdf = np.cumsum(counts) / max(counts.sum(), 1)
+    return float(bins[1:][min(np.searchsorted(cdf, pct / 100), len(counts) - 1)])
+
+
+def spectral_efficiency(sinr_db, peak):
+    se = SHANNON_ALPHA * np.log2(1 + 10 ** (np.asarray(sinr_db) / 10))
+    return np.where(np.asarray(sinr_db) < SINR_MIN_DB, 0.0, np.minimum(se, peak))
+
+
+@dataclass
+class SinrResult:
+    n_ue: int
+    n_cells: int
+    isd_m: float
+    mean_sinr_db: float
+    edge_sinr_db: float  # 5th percentile
+    mean_se: float  # bits/s/Hz per layer
+    peak_se: float
+    effective_q: float  # mean SE over the peak the capacity model assumes
+    mean_throughput_mbps: float
+    edge_throughput_mbps: float
+    sinr_bins: np.ndarray
+    sinr_counts: np.ndarray
+
+    def percentile_sinr(self, pct):
+        return _percentile(self.sinr_bins, self.sinr_counts, pct)
+
+    @property
+    def applied_q(self):
+        # effective_q on the sidebar slider's 0.01 steps within its 0.1 to 1.0 range
+        return min(max(round(self.effective_q, 2), 0.1), 1.0)
+
+    def apply(self, params):
+        """params with the simulated quality factor (``applied_q``) in place of the entered one."""
+        return replace(params, q=self.applied_q)
+
+
+def _summarize(counts, se_sum, sinr_sum, done, n_cells, isd_m, peak, peak_mbps):
+    mean_se = se_sum / done
+    edge_sinr_db = _percentile(_SINR_BINS, counts, 5)
+    return SinrResult(
+        n_ue=done,
+        n_cells=n_cells,
+        isd_m=isd_m,
+        mean_sinr_db=sinr_sum / done,
+        edge_sinr_db=edge_sinr_db,
+        mean_se=mean_se,
+        peak_se=peak,
+        effective_q=mean_se / peak,
+        mean_throughput_mbps=peak_mbps * mean_se / peak,
+        edge_throughput_mbps=peak_mbps * float(spectral_efficiency(edge_sinr_db, peak)) / peak,
+        sinr_bins=_SINR_BINS,
+        sinr_counts=counts,
+    )
+
+
+def simulate_sinr(params, n_ue=100000, rings=2, batch_size=20000, load=None, seed=None,
+                  isd_m=None, shadowing=True, progress=None):
+    """Downlink SINR of UEs dropped over the centre cell of a multi-ring hex layout.
+
+    Every cell transmits the sidebar link budget; interferers are active a
+    ``load`` fraction of the time (default: the resource utilization). UEs
+    are drawn and reduced in batches of ``batch_size``, keeping only a SINR
+    histogram and running sums, so memory does not grow with ``n_ue``.
+    ``progress(done, n_ue, partial)`` is called after every batch with the
+    result over the UEs simulated so far.
+    """
+    budget = link_budget(params)
+    isd_m = isd_m or site_spacing_m(params)
+    load = params.utilization if load is None else load
+    sites = hex_rings(rings, isd_m)
+    sectors = 1 if params.antenna_type != "Directive" else max(int(params.sectors_per_site), 1)
+    azimuths = 30.0 + 360.0 * np.arange(sectors) / sectors
+    shadow_los, shadow_nlos = model_coefficients(params.propagation_model)["shadow_std_db"]
+
+    tx_dbm = (params.tx_power + params.tx_gain + params.rx_gain - params.cable_loss
+              - params.penetration_loss - params.foliage_loss - params.body_loss)
+    noise_mw = 10 ** ((budget.thermal_noise + params.noise_figure) / 10)
+    peak = peak_spectral_efficiency(params.mod_order)
+    peak_mbps = bps_per_sector(params, budget.n_rb) / 1e6
+
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    counts = np.zeros(len(_SINR_BINS) - 1, dtype=np.int64)
+    se_sum = 0.0
+    sinr_sum = 0.0
+    done = 0
+    for batch, start in enumerate(range(0, n_ue, batch_size)):
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(batch,)))
+        ue = drop_ues(min(batch_size, n_ue - start), isd_m, rng)
+        delta = ue[:, None, :] - sites[None, :, :]  # (ue, site, xy)
+        d_m = np.maximum(np.hypot(delta[..., 0], delta[..., 1]), 10.0)
+        pl, los = path_loss(d_m, params.freq_ghz, params.h_ue, params.propagation_model,
+                            rng=rng, return_los=True)
+        if shadowing:
+            pl = pl + rng.standard_normal(pl.shape) * np.where(los, shadow_los, shadow_nlos)
+        bearing = np.degrees(np.arctan2(delta[..., 1], delta[..., 0]))
+        gain = sector_gain_db(bearing[..., None] - azimuths, sectors)  # (ue, site, sector)
+        rx_mw = 10 ** ((tx_dbm - pl[..., None] + gain) / 10)
+        rx_mw = rx_mw.reshape(len(ue), -1)
+
+        serving = rx_mw.max(axis=1)
+        interference = load * (rx_mw.sum(axis=1) - serving)
+        sinr_db = 10 * np.log10(serving / (interference + noise_mw))
+
+        counts += np.histogram(np.clip(sinr_db, _SINR_BINS[0], _SINR_BINS[-1] - 1e-9), _SINR_BINS)[0]
+        se_sum += float(spectral_efficiency(sinr_db, peak).sum())
+        sinr_sum += float(sinr_db.sum())
+        done += len(ue)
+        if progress is not None:
+            progress(done, n_ue, _summarize(counts.copy(), se_sum, sinr_sum, done, len(sites) * sectors,
+                                            isd_m, peak, peak_mbps))
+
+    return _summarize(counts, se_sum, sinr_sum, done, len(sites) * sectors, isd_m, peak, peak_mbps)
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from planner.paths import cache_path
+from planner.propagation import MODELS, UMI, los_probability, model_coefficients
+
+TABLE_VERSION = 2
+TABLE_FILE = "radius_table.npy"
+TABLE_AXES_FILE = "radius_table.json"
+
+
+def invert_path_loss(pl_db, f_ghz, h_ue=1.5, model=UMI, los=True):
+    """Distance in metres at which the LOS or NLOS branch reaches ``pl_db``.
+
+    Both branches are linear in log10(d), so the inverse is closed form. The
+    NLOS branch is floored by the LOS loss, hence the min() of the two roots.
+    """
+    coeffs = model_coefficients(model)
+
+    def root(branch):
+        a, b, c, e = branch
+        return 10 ** ((np.asarray(pl_db, dtype=float) - a - c * np.log10(f_ghz)
+                       - e * (np.asarray(h_ue, dtype=float) - 1.5)) / b)
+
+    d_los = root(coeffs["los"])
+    if los:
+        return d_los
+    return np.minimum(d_los, root(coeffs["nlos"]))
+
+
+def brentq(func, a, b, xtol=1e-9, rtol=4 * np.finfo(float).eps, maxiter=100):
+    # Brent's method on a bracket [a, b] with func(a) and func(b) of opposite sign
+    fa, fb = func(a), func(b)
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+    if fa * fb > 0:
+        raise ValueError("brentq: root is not bracketed")
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(maxiter):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * rtol * abs(b) + 0.5 * xtol
+        m = 0.5 * (c - b)
+        if abs(m) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2 * m * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = func(b)
+    raise RuntimeError("brentq: no convergence")
+
+
+@lru_cache(maxsize=1024)
+def los_distance(reliability, model=UMI):
+    # Largest distance at which the LOS probability still meets ``reliability``
+    def excess(d_m):
+        return float(los_probability(d_m, model)) - reliability
+
+    lo = 1.0
+    if excess(lo) < 0:
+        return 0.0
+    hi = 2 * lo
+    while excess(hi) >= 0:
+        lo, hi = hi, 2 * hi
+        if hi > 1e9:
+            return hi
+    return brentq(excess, lo, hi, xtol=1e-3)
+
+
+def solve_radius(mapl, f_ghz, model=UMI, h_ue=1.5, reliability=0.95):
+    """Radius in km within which the MAPL holds with probability ``reliability``.
+
+    Inside the NLOS root every realisation is covered and beyond the LOS root
+    none is; in between only LOS draws are, so the edge is wherever the LOS
+    probability falls below ``reliability``.
+    """
+    d_los = invert_path_loss(mapl, f_ghz, h_ue, model, los=True)
+    d_nlos = invert_path_loss(mapl, f_ghz, h_ue, model, los=False)
+    d_rel = los_distance(float(reliability), model)
+    return np.minimum(d_los, np.maximum(d_nlos, d_rel)) / 1000.0
+
+
+class RadiusTable:
+    """LOS/NLOS radius roots over model x MAPL x frequency x UE height.
+
+    Each branch root is linear in MAPL, log10(f) and h_ue once taken as
+    log10(d), so multilinear interpolation over the grid is exact up to
+    float32 rounding. The min/max that combines the branches with the
+    reliability edge is applied after interpolation, so its kinks never fall
+    inside a grid cell.
+    """
+
+    def __init__(self, values, models, mapl, log_f, h_ue, reliability, los_edge_m):
+        self.values = values
+        self.models = list(models)
+        self.mapl = np.asarray(mapl, dtype=float)
+        self.log_f = np.asarray(log_f, dtype=float)
+        self.h_ue = np.asarray(h_ue, dtype=float)
+        self.reliability = np.asarray(reliability, dtype=float)
+        self.los_edge_m = np.asarray(los_edge_m, dtype=float)
+
+    @classmethod
+    def build(cls, models=tuple(MODELS), mapl=np.arange(60.0, 200.25, 0.5),
+              f_ghz=np.geomspace(0.4, 100.0, 25), h_ue=(1.5, 5.0, 10.0, 22.5),
+              reliability=np.arange(0.50, 0.9995, 0.001)):
+        mapl = np.asarray(mapl, dtype=float)
+        log_f = np.log10(np.asarray(f_ghz, dtype=float))
+        h_ue = np.asarray(h_ue, dtype=float)
+        reliability = np.round(np.asarray(reliability, dtype=float), 6)
+        grid_mapl, grid_f, grid_h = np.meshgrid(mapl, 10 ** log_f, h_ue, indexing="ij")
+
+        values = np.empty((len(models), 2) + grid_mapl.shape, dtype=np.float32)
+        los_edge_m = np.empty((len(models), len(reliability)))
+        for i, model in enumerate(models):
+            values[i, 0] = np.log10(invert_path_loss(grid_mapl, grid_f, grid_h, model, los=True))
+            values[i, 1] = np.log10(invert_path_loss(grid_mapl, grid_f, grid_h, model, los=False))
+            los_edge_m[i] = [los_distance(float(rel), model) for rel in reliability]
+        return cls(values, models, mapl, log_f, h_ue, reliability, los_edge_m)
+
+    def save(self, directory):
+        # Written to temporary files and renamed into place, so another process
+        # never reads (or has memory-mapped) a half-written table
+        os.makedirs(directory, exist_ok=True)
+        values_path = os.path.join(directory, TABLE_FILE)
+        tmp = f"{values_path}.{os.getpid()}.tmp.npy"
+        np.save(tmp, self.values)
+        os.replace(tmp, values_path)
+        axes = {
+            "version": TABLE_VERSION,
+            "models": self.models,
+            "mapl": self.mapl.tolist(),
+            "log_f": self.log_f.tolist(),
+            "h_ue": self.h_ue.tolist(),
+            "reliability": self.reliability.tolist(),
+            "los_edge_m": self.los_edge_m.tolist(),
+        }
+        axes_path = os.path.join(directory, TABLE_AXES_FILE)
+        tmp = f"{axes_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(axes, fh)
+        os.replace(tmp, axes_path)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        with open(os.path.join(directory, TABLE_AXES_FILE)) as fh:
+            axes = json.load(fh)
+        if axes.get("version") != TABLE_VERSION:
+            raise ValueError("radius table version mismatch")
+        values = np.load(os.path.join(directory, TABLE_FILE), mmap_mode="r" if mmap else None)
+        return cls(values, axes["models"], axes["mapl"], axes["log_f"], axes["h_ue"],
+                   axes["reliability"], axes["los_edge_m"])
+
+    @staticmethod
+    def _locate(axis, x):
+        # Lower grid index and fractional weight, plus an in-range mask
+        inside = (x >= axis[0]) & (x <= axis[-1])
+        i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, len(axis) - 2)
+        w = (np.clip(x, axis[0], axis[-1]) - axis[i]) / (axis[i + 1] - axis[i])
+        return i, w, inside
+
+    def _los_edge(self, m, reliability):
+        edge = np.interp(reliability, self.reliability, self.los_edge_m[m])
+        off_grid = (reliability < self.reliability[0]) | (reliability > self.reliability[-1])
+        if off_grid.any():
+            for rel in np.unique(reliability[off_grid]):
+                edge[reliability == rel] = los_distance(float(rel), self.models[m])
+        return edge
+
+    def lookup(self, mapl, f_ghz, model=UMI, h_ue=1.5, reliability=0.95):
+        """Interpolated radius in km; points off the grid fall back to the closed form."""
+        mapl, f_ghz, h_ue, reliability = np.broadcast_arrays(
+            np.asarray(mapl, dtype=float), np.asarray(f_ghz, dtype=float),
+            np.asarray(h_ue, dtype=float), np.asarray(reliability, dtype=float))
+        shape = mapl.shape
+        mapl, f_ghz, h_ue, reliability = (x.ravel() for x in (mapl, f_ghz, h_ue, reliability))
+        m = self.models.index(model)
+
+        located = [self._locate(axis, x) for axis, x in (
+            (self.mapl, mapl), (self.log_f, np.log10(f_ghz)), (self.h_ue, h_ue))]
+        log_d = np.zeros((2,) + mapl.shape)
+        for corner in range(8):
+            weight = np.ones(mapl.shape)
+            index = [m, slice(None)]
+            for k, (i, w, _) in enumerate(located):
+                upper = (corner >> k) & 1
+                weight = weight * (w if upper else 1 - w)
+                index.append(i + upper)
+            # Fancy indexing moves the branch axis last
+            log_d += weight * np.moveaxis(self.values[tuple(index)], -1, 0)
+        d_los, d_nlos = 10 ** log_d
+
+        inside = np.logical_and.reduce([loc[2] for loc in located])
+        if not inside.all():
+            out = ~inside
+            d_los[out] = invert_path_loss(mapl[out], f_ghz[out], h_ue[out], model, los=True)
+            d_nlos[out] = invert_path_loss(mapl[out], f_ghz[out], h_ue[out], model, los=False)
+
+        d_rel = self._los_edge(m, reliability)
+        return (np.minimum(d_los, np.maximum(d_nlos, d_rel)) / 1000.0).reshape(shape)
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def _load_or_build(directory):
+    try:
+        return RadiusTable.load(directory)
+    except (OSError, ValueError, EOFError):
+        table = RadiusTable.build()
+    try:
+        table.save(directory)
+        return RadiusTable.load(directory)
+    except (OSError, ValueError, EOFError):
+        # e.g. a read-only cache dir, or another process replacing the files
+        return table
+
+
+def radius_table(directory=None):
+    # Process-wide table: memory-mapped from the cache dir, built on first use
+    global _table
+    if directory is not None:
+        return _load_or_build(directory)
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = _load_or_build(cache_path("tables"))
+    return _table
+
+
+def lookup_radius(mapl, f_ghz, model=UMI, h_ue=1.5, reliability=0.95):
+    return radius_table().lookup(mapl, f_ghz, model, h_ue, reliability)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+from dataclasses import dataclass, fields
+from types import SimpleNamespace
+
+import numpy as np
+
+from planner.core import (
+    EQUIPMENT_COST, INSTALLATION_COST, MAINTENANCE_COST, SITE_COST, PlanParams, check_value,
+)
+from planner.solver import lookup_radius
+from planner.throughput import resource_blocks, sector_bps
+from planner.traffic import demand_factor
+
+CATEGORICAL = ("antenna_type", "area_type", "duplex_mode", "propagation_model")
+SWEEPABLE = tuple(f.name for f in fields(PlanParams))
+
+METRICS = (
+    "mapl", "n_rb", "bps_per_sector", "site_throughput_mbps", "coverage_radius_km",
+    "num_sites_coverage", "num_sites_capacity", "total_sites_required", "cost_estimate",
+    "total_capex", "annual_opex",
+)
+
+
+@dataclass
+class SweepResult:
+    axes: dict
+    metrics: dict
+
+    @property
+    def shape(self):
+        return tuple(len(v) for v in self.axes.values())
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def plane(self, x, y, metric="total_sites_required", reduce=np.min):
+        """2-D (y, x) view of a metric; other swept axes are collapsed with ``reduce``."""
+        names = list(self.axes)
+        data = self.metrics[metric]
+        others = tuple(i for i, n in enumerate(names) if n not in (x, y))
+        if others:
+            data = reduce(data, axis=others)
+        remaining = [n for n in names if n in (x, y)]
+        if remaining == [x, y]:
+            data = data.T
+        return data
+
+    def best(self, metric="cost_estimate"):
+        # Cheapest grid point as a {param: value} dict plus the metric value
+        flat = int(np.argmin(self.metrics[metric]))
+        index = np.unravel_index(flat, self.shape)
+        point = {name: values[i] for (name, values), i in zip(self.axes.items(), index)}
+        return point, self.metrics[metric][index]
+
+
+def _grid_namespace(base, axes):
+    values = {f.name: getattr(base, f.name) for f in fields(PlanParams)}
+    ndim = len(axes)
+    for k, (name, axis) in enumerate(axes.items()):
+        shape = [1] * ndim
+        shape[k] = len(axis)
+        values[name] = np.asarray(axis).reshape(shape)
+    return SimpleNamespace(**values)
+
+
+def _coverage_radius(g, mapl, shape):
+    freq_ghz, h_ue, reliability, model = np.broadcast_arrays(
+        np.asarray(g.freq_mhz, dtype=float) / 1000, np.asarray(g.h_ue, dtype=float),
+        np.asarray(g.cell_edge_reliability, dtype=float), np.asarray(g.propagation_model))
+    mapl = np.broadcast_to(mapl, shape)
+    freq_ghz, h_ue, reliability, model = (np.broadcast_to(a, shape) for a in
+                                          (freq_ghz, h_ue, reliability, model))
+    radius_km = np.empty(shape)
+    for name in np.unique(model):
+        mask = model == name
+        radius_km[mask] = lookup_radius(mapl[mask], freq_ghz[mask], str(name), h_ue[mask],
+                                        reliability[mask])
+    return radius_km
+
+
+def evaluate_grid(base, axes, progress=None):
+    """Plan every point of the Cartesian grid spanned by ``axes`` in one pass.
+
+    ``axes`` maps PlanParams field names to 1-D sequences of values; every
+    other field keeps its value from ``base``. Metrics come back as arrays of
+    shape ``tuple(len(v) for v in axes.values())`` and match plan_network
+    point by point. With ``progress`` the grid is evaluated one value of the
+    first axis at a time, reporting ``progress(done, total, partial)`` with
+    the SweepResult over the values finished so far.
+    """
+    unknown = [name for name in axes if name not in SWEEPABLE]
+    if unknown:
+        raise ValueError(f"Cannot sweep unknown parameter(s): {', '.join(unknown)}")
+    axes = {name: list(values) for name, values in axes.items()}
+    if any(len(v) == 0 for v in axes.values()):
+        raise ValueError("Every swept parameter needs at least one value")
+    for name, values in axes.items():
+        for value in values:
+            check_value(name, value)
+    if progress is None or not axes:
+        return SweepResult({name: np.asarray(values) for name, values in axes.items()},
+                           _grid_metrics(base, axes))
+
+    first = next(iter(axes))
+    shape = tuple(len(v) for v in axes.values())
+    metrics = {name: np.empty(shape) for name in METRICS}
+    for i, value in enumerate(axes[first]):
+        for name, values in _grid_metrics(base, {**axes, first: [value]}).items():
+            metrics[name][i] = values[0]
+        done = {**axes, first: axes[first][:i + 1]}
+        progress(i + 1, len(axes[first]),
+                 SweepResult({name: np.asarray(values) for name, values in done.items()},
+                             {name: values[:i + 1] for name, values in metrics.items()}))
+    return SweepResult({name: np.asarray(values) for name, values in axes.items()}, metrics)
+
+
+def _grid_metrics(base, axes):
+    shape = tuple(len(v) for v in axes.values())
+    g = _grid_namespace(base, axes)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Link budget
+        bandwidth_hz = np.asarray(g.bandwidth_mhz, dtype=float) * 1e6
+        n_rb = resource_blocks(g.bandwidth_mhz, g.scs_khz, g.freq_mhz)
+        thermal_noise = -174 + 10 * np.log10(bandwidth_hz)
+        receiver_sensitivity = thermal_noise + g.noise_figure + g.required_sinr
+        computed_mapl = (g.tx_power + g.tx_gain + g.rx_gain - g.cable_loss - g.penetration_loss
+                         - g.foliage_loss - g.body_loss - g.interference_margin - g.rain_margin
+                         - g.shadow_margin - receiver_sensitivity)
+        if "custom_mapl" in axes:
+            custom = np.asarray(g.custom_mapl, dtype=float)
+            mapl = np.where(np.isnan(custom), computed_mapl, custom)
+        elif g.custom_mapl is not None:
+            mapl = np.asarray(g.custom_mapl, dtype=float)
+        else:
+            mapl = computed_mapl
+
+        # Coverage
+        directive = np.asarray(g.antenna_type) == "Directive"
+        radius_km = np.minimum(_coverage_radius(g, mapl, shape), g.max_radius_km)
+        radius_km = radius_km * np.where(directive, 1.0, 1.2)
+        a_site = np.where(directive, 1.94, 2.5) * radius_km ** 2
+        num_sites_coverage = np.ceil(g.area_km2 / a_site)
+
+        # Capacity
+        overhead = np.where(np.asarray(g.duplex_mode) == "FDD",
+                            np.minimum(g.overhead, 0.12), g.overhead)
+        bps = sector_bps(n_rb, g.scs_khz, g.mod_order, g.mimo_layers, overhead,
+                         g.utilization, g.duplex_mode)
+        site_throughput_mbps = (bps * g.sectors_per_site * g.downlink_ratio * g.q) / 1e6
+        traffic = g.traffic_per_user * np.vectorize(demand_factor, otypes=[float])(
+            g.area_type, g.sizing_percentile)
+        num_sites_capacity = np.where(site_throughput_mbps > 0,
+                                      np.ceil(traffic / site_throughput_mbps), 0)
+        total_sites = np.maximum(num_sites_coverage, num_sites_capacity)
+
+    metrics = {
+        "mapl": mapl,
+        "n_rb": n_rb,
+        "bps_per_sector": bps,
+        "site_throughput_mbps": site_throughput_mbps,
+        "coverage_radius_km": radius_km,
+        "num_sites_coverage": num_sites_coverage,
+        "num_sites_capacity": num_sites_capacity,
+        "total_sites_required": total_sites,
+        "cost_estimate": total_sites * SITE_COST,
+        "total_capex": total_sites * (EQUIPMENT_COST + INSTALLATION_COST),
+        "annual_opex": total_sites * MAINTENANCE_COST,
+    }
+    return {name: np.broadcast_to(np.asarray(value, dtype=float), shape)
+            for name, value in metrics.items()}
+
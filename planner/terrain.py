@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""Terrain elevation and clutter rasters for the coverage map.
+
+A terrain is a directory holding either
+
+    dem.npy, clutter.npy, terrain.json    raw grids plus their georeference
+    dem.tif, clutter.tif                  single-band GeoTIFFs (needs rasterio)
+
+Either grid may be missing. Grids are north-up with square pixels in a
+projected CRS in metres; terrain.json gives ``origin_x_m``/``origin_y_m``
+(the top-left corner), ``pixel_m`` and optionally ``nodata``, ``center_x_m``/
+``center_y_m`` (where the planning area sits, default the raster centre) and
+``clutter_classes``. Grids are opened memory-mapped and only the window
+around each coverage tile is read, so a national raster never has to fit
+in memory.
+"""
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from planner.propagation import UMA, UMI
+
+TERRAIN_PATH = os.environ.get("PLANNER_TERRAIN")
+
+# Antenna heights above ground (TR 38.901 UMi / UMa)
+SITE_HEIGHT_M = {UMI: 10.0, UMA: 25.0}
+
+# Code -> (name, building penetration loss dB, foliage loss dB). A pixel's
+# class replaces the link budget's global penetration and foliage losses;
+# codes not listed (and the nodata code 0) leave them unchanged.
+CLUTTER_CLASSES = {
+    1: ("water", 0.0, 0.0),
+    2: ("open", 0.0, 0.0),
+    3: ("rural", 12.0, 4.0),
+    4: ("forest", 0.0, 15.0),
+    5: ("suburban", 16.0, 7.5),
+    6: ("urban", 22.0, 7.5),
+    7: ("dense_urban", 26.0, 5.0),
+    8: ("industrial", 20.0, 3.0),
+}
+
+# Path profiles are sampled at about one point per DEM pixel, up to this many
+MAX_PROFILE_SAMPLES = 64
+# Working memory for one block of path profiles; tiles are split to stay under it
+PROFILE_BLOCK_BYTES = 8 * 1024 * 1024
+
+
+def knife_edge_loss(v):
+    """ITU-R P.526 single knife-edge diffraction loss J(v) in dB (0 for v <= -0.78)."""
+    v = np.asarray(v, dtype=float)
+    loss = 6.9 + 20 * np.log10(np.sqrt((v - 0.1) ** 2 + 1) + v - 0.1)
+    return np.where(v > -0.78, loss, 0.0)
+
+
+class _GeoTiffBand:
+    # Band 1 of a rasterio dataset, sliceable like a 2-D array
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.shape = (dataset.height, dataset.width)
+
+    def __getitem__(self, key):
+        rows, cols = key
+        return self.dataset.read(1, window=((rows.start, rows.stop), (cols.start, cols.stop)))
+
+
+def _rasterio():
+    try:
+        import rasterio
+    except ImportError as exc:
+        raise ImportError("Reading GeoTIFF terrain needs rasterio (pip install rasterio)") from exc
+    return rasterio
+
+
+def _read_window(grid, r0, r1, c0, c1, fill):
+    """grid[r0:r1, c0:c1], with pixels outside the raster set to ``fill``."""
+    out = np.full((r1 - r0, c1 - c0), fill, dtype=np.float32 if isinstance(fill, float) else np.uint8)
+    rows, cols = grid.shape
+    rr0, rr1, cc0, cc1 = max(r0, 0), min(r1, rows), max(c0, 0), min(c1, cols)
+    if rr0 < rr1 and cc0 < cc1:
+        out[rr0 - r0:rr1 - r0, cc0 - c0:cc1 - c0] = grid[rr0:rr1, cc0:cc1]
+    return out
+
+
+@dataclass
+class TerrainWindow:
+    """Elevation and clutter over a box of the planning area, read from the rasters."""
+    elevation: np.ndarray  # (rows, cols) metres, NaN where unknown; None without a DEM
+    clutter: np.ndarray  # (rows, cols) class codes, 0 where unknown; None without clutter
+    x0_m: float  # planning-frame x of the window's left edge
+    y0_m: float  # planning-frame y of the window's top edge
+    pixel_m: float
+
+    def _index(self, grid, x_m, y_m):
+        col = np.clip(((np.asarray(x_m) - self.x0_m) / self.pixel_m).astype(np.int64), 0, grid.shape[1] - 1)
+        row = np.clip(((self.y0_m - np.asarray(y_m)) / self.pixel_m).astype(np.int64), 0, grid.shape[0] - 1)
+        return row, col
+
+    def elevation_at(self, x_m, y_m):
+        if self.elevation is None:
+            return np.zeros(np.broadcast(x_m, y_m).shape, dtype=np.float32)
+        return self.elevation[self._index(self.elevation, x_m, y_m)]
+
+    def clutter_at(self, x_m, y_m):
+        if self.clutter is None:
+            return np.zeros(np.broadcast(x_m, y_m).shape, dtype=np.uint8)
+        return self.clutter[self._index(self.clutter, x_m, y_m)]
+
+
+class Terrain:
+    """Memory-mapped DEM and clutter grids placed under the planning area."""
+
+    def __init__(self, dem=None, clutter=None, origin_x_m=0.0, origin_y_m=0.0, pixel_m=30.0,
+                 center=None, nodata=None, classes=CLUTTER_CLASSES, name="terrain"):
+        if dem is None and clutter is None:
+            raise ValueError("A terrain needs a DEM, a clutter grid or both")
+        if dem is not None and clutter is not None and dem.shape != clutter.shape:
+            raise ValueError(f"DEM {dem.shape} and clutter {clutter.shape} grids differ in shape")
+        self.dem = dem
+        self.clutter = clutter
+        self.origin_x_m = float(origin_x_m)
+        self.origin_y_m = float(origin_y_m)
+        self.pixel_m = float(pixel_m)
+        self.nodata = nodata
+        self.classes = classes
+        self.name = name
+        rows, cols = (dem if dem is not None else clutter).shape
+        if center is None:
+            center = (self.origin_x_m + cols * self.pixel_m / 2, self.origin_y_m - rows * self.pixel_m / 2)
+        self.center = (float(center[0]), float(center[1]))
+        # Penetration + foliage loss per clutter code, NaN where the link budget's values apply
+        self._clutter_loss = np.full(256, np.nan)
+        for code, (_, penetration, foliage) in classes.items():
+            self._clutter_loss[int(code)] = penetration + foliage
+
+    @classmethod
+    def open(cls, path, center=None):
+        """Terrain from a directory of .npy grids or GeoTIFFs (see the module docstring)."""
+        if os.path.exists(os.path.join(path, "terrain.json")):
+            with open(os.path.join(path, "terrain.json"), encoding="utf-8") as fh:
+                meta = json.load(fh)
+            grids = {}
+            for name in ("dem", "clutter"):
+                grid_path = os.path.join(path, f"{name}.npy")
+                grids[name] = np.load(grid_path, mmap_mode="r") if os.path.exists(grid_path) else None
+            classes = CLUTTER_CLASSES
+            if "clutter_classes" in meta:
+                classes = {int(code): tuple(value) for code, value in meta["clutter_classes"].items()}
+            if center is None and "center_x_m" in meta:
+                center = (meta["center_x_m"], meta["center_y_m"])
+            return cls(grids["dem"], grids["clutter"], meta["origin_x_m"], meta["origin_y_m"],
+                       meta["pixel_m"], center, meta.get("nodata"), classes, os.path.basename(path))
+        return cls.from_geotiff(
+            *(os.path.join(path, f"{name}.tif") if os.path.exists(os.path.join(path, f"{name}.tif")) else None
+              for name in ("dem", "clutter")), center=center, name=os.path.basename(path))
+
+    @classmethod
+    def from_geotiff(cls, dem_path=None, clutter_path=None, center=None, name="terrain"):
+        rasterio = _rasterio()
+        bands = {}
+        transform = nodata = None
+        for key, grid_path in (("dem", dem_path), ("clutter", clutter_path)):
+            if grid_path is None:
+                bands[key] = None
+                continue
+            dataset = rasterio.open(grid_path)
+            a, b, c, d, e, f = tuple(dataset.transform)[:6]
+            if b or d or not math.isclose(e, -a):
+                raise ValueError(f"{grid_path}: only north-up grids with square pixels are supported")
+            if transform is not None and not np.allclose(transform, (a, c, f)):
+                raise ValueError("DEM and clutter GeoTIFFs are not on the same grid")
+            transform = (a, c, f)
+            if key == "dem":
+                nodata = dataset.nodata
+            bands[key] = _GeoTiffBand(dataset)
+        if transform is None:
+            raise ValueError("A terrain needs a DEM, a clutter grid or both")
+        pixel_m, origin_x_m, origin_y_m = transform
+        return cls(bands["dem"], bands["clutter"], origin_x_m, origin_y_m, pixel_m, center, nodata,
+                   name=name)
+
+    def window(self, x0_m, x1_m, y0_m, y1_m):
+        """Read the grids over the planning-frame box [x0, x1] x [y0, y1] (y up)."""
+        cx, cy = self.center
+        c0 = math.floor((cx + x0_m - self.origin_x_m) / self.pixel_m)
+        c1 = math.floor((cx + x1_m - self.origin_x_m) / self.pixel_m) + 1
+        r0 = math.floor((self.origin_y_m - (cy + y1_m)) / self.pixel_m)
+        r1 = math.floor((self.origin_y_m - (cy + y0_m)) / self.pixel_m) + 1
+        elevation = clutter = None
+        if self.dem is not None:
+            elevation = _read_window(self.dem, r0, r1, c0, c1, np.nan)
+            if self.nodata is not None:
+                elevation[elevation == self.nodata] = np.nan
+        if self.clutter is not None:
+            clutter = _read_window(self.clutter, r0, r1, c0, c1, 0)
+        return TerrainWindow(elevation, clutter,
+                             self.origin_x_m + c0 * self.pixel_m - cx,
+                             self.origin_y_m - r0 * self.pixel_m - cy, self.pixel_m)
+
+    def clutter_delta_db(self, codes, params):
+        """Clutter loss relative to the link budget's penetration and foliage losses."""
+        loss = self._clutter_loss[codes]
+        return np.where(np.isnan(loss), 0.0, loss - params.penetration_loss - params.foliage_loss)
+
+    def tile_loss(self, window, sites_m, x_m, y_m, params):
+        """(extra loss dB, terrain-obstructed mask) for pixels served by ``sites_m``.
+
+        ``x_m``/``y_m``/``sites_m[..., 0|1]`` broadcast to the tile shape. The
+        extra loss is the clutter delta plus single knife-edge diffraction over
+        the worst obstacle of the DEM profile between site and pixel.
+        """
+        shape = np.broadcast(x_m, y_m).shape
+        extra = self.clutter_delta_db(window.clutter_at(x_m, y_m), params) if window.clutter is not None \
+            else np.zeros(shape)
+        obstructed = np.zeros(shape, dtype=bool)
+        if window.elevation is None:
+            return extra, obstructed
+
+        px = np.broadcast_to(x_m, shape).ravel()
+        py = np.broadcast_to(y_m, shape).ravel()
+        sx = np.broadcast_to(sites_m[..., 0], shape).ravel()
+        sy = np.broadcast_to(sites_m[..., 1], shape).ravel()
+        distance = np.hypot(px - sx, py - sy)
+        samples = int(np.clip(math.ceil(distance.max(initial=0.0) / window.pixel_m), 2, MAX_PROFILE_SAMPLES))
+        t = (np.arange(1, samples + 1) / (samples + 1))[None, :]
+        wavelength = 0.299792458 / params.freq_ghz
+        h_site = SITE_HEIGHT_M.get(params.propagation_model, SITE_HEIGHT_M[UMI])
+
+        v_max = np.full(px.shape, -np.inf)
+        block = max(1, PROFILE_BLOCK_BYTES // (samples * 8 * 4))
+        for start in range(0, len(px), block):
+            sl = slice(start, start + block)
+            tx_h = window.elevation_at(sx[sl], sy[sl]) + h_site
+            rx_h = window.elevation_at(px[sl], py[sl]) + params.h_ue
+            # Ground along the path against the straight site-to-pixel ray
+            ground = window.elevation_at(sx[sl, None] + t * (px[sl, None] - sx[sl, None]),
+                                         sy[sl, None] + t * (py[sl, None] - sy[sl, None]))
+            clearance = ground - (tx_h[:, None] + t * (rx_h - tx_h)[:, None])
+            d = distance[sl, None]
+            v = clearance * np.sqrt(2 / (wavelength * np.maximum(d * t * (1 - t), 1e-6)))
+            v_max[sl] = np.where(np.isnan(v), -np.inf, v).max(axis=1)
+        v_max = v_max.reshape(shape)
+        return extra + knife_edge_loss(v_max), v_max > 0
+
+
+_terrain = None
+_terrain_lock = threading.Lock()
+
+
+def default_terrain():
+    """The terrain named by PLANNER_TERRAIN, opened once per process (None when unset)."""
+    global _terrain
+    if TERRAIN_PATH is None:
+        return None
+    if _terrain is None:
+        with _terrain_lock:
+            if _terrain is None:
+                _terrain = Terrain.open(TERRAIN_PATH)
+    return _terrain
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""Sector throughput from the TS 38.214 transport block size procedure.
+
+A sector carries one transport block per codeword per slot. The rate is the
+TS 38.306 peak-rate construction with the exact TBS in place of the
+approximate code rate:
+
+    bits/s = TBS(N_PRB, N_RE, MCS, layers) * 1000 * 2^mu * usable share of symbols
+
+N_PRB is the transmission bandwidth configuration for the channel bandwidth
+and sub-carrier spacing (TS 38.101-1/-2 Table 5.3.2-1). The overhead share of
+each PRB's 168 resource elements (DMRS, CSI-RS, control) is taken off N_RE,
+and the MCS is the highest-rate one at the chosen modulation order. TBS values
+for every PRB count, RE count, modulation and codeword layer count are
+precomputed once and cached on disk, so an evaluation is an index lookup,
+whether for one scenario or a whole sweep grid.
+"""
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from planner.paths import cache_path
+
+TBS_TABLE_VERSION = 1
+
+RE_PER_PRB = 12 * 14
+MAX_RE_PER_PRB = 156  # N_RE per PRB is capped at 156 (TS 38.214 5.1.3.2)
+MAX_LAYERS_PER_CODEWORD = 4
+FR1_MAX_MHZ = 7125
+
+# TS 38.214 Tables 5.1.3.1-1 (64QAM), 5.1.3.1-2 (256QAM) and 5.1.3.1-4
+# (1024QAM): (modulation order Qm, target code rate R x 1024) per MCS index
+MCS_TABLES = {
+    "qam64": ((2, 120), (2, 157), (2, 193), (2, 251), (2, 308), (2, 379), (2, 449), (2, 526), (2, 602),
+              (2, 679), (4, 340), (4, 378), (4, 434), (4, 490), (4, 553), (4, 616), (4, 658), (6, 438),
+              (6, 466), (6, 517), (6, 567), (6, 616), (6, 666), (6, 719), (6, 772), (6, 822), (6, 873),
+              (6, 910), (6, 948)),
+    "qam256": ((2, 120), (2, 193), (2, 308), (2, 449), (2, 602), (4, 378), (4, 434), (4, 490), (4, 553),
+               (4, 616), (4, 658), (6, 466), (6, 517), (6, 567), (6, 616), (6, 666), (6, 719), (6, 772),
+               (6, 822), (6, 873), (8, 682.5), (8, 711), (8, 754), (8, 797), (8, 841), (8, 885),
+               (8, 916.5), (8, 948)),
+    "qam1024": ((2, 120), (2, 193), (2, 449), (4, 378), (4, 490), (4, 616), (6, 466), (6, 517), (6, 567),
+                (6, 616), (6, 666), (6, 719), (6, 772), (6, 822), (6, 873), (8, 682.5), (8, 711), (8, 754),
+                (8, 797), (8, 841), (8, 885), (8, 916.5), (8, 948), (10, 805.5), (10, 853), (10, 900.5),
+                (10, 948)),
+}
+
+# TS 38.214 Table 5.1.3.2-1: TBS for N_info <= 3824
+TBS_SMALL = np.array([
+    24, 32, 40, 48, 56, 64, 72, 80, 88, 96, 104, 112, 120, 128, 136, 144, 152, 160, 168, 176, 184, 192,
+    208, 224, 240, 256, 272, 288, 304, 320, 336, 352, 368, 384, 408, 432, 456, 480, 504, 528, 552, 576,
+    608, 640, 672, 704, 736, 768, 808, 848, 888, 928, 984, 1032, 1064, 1128, 1160, 1192, 1224, 1256,
+    1288, 1320, 1352, 1416, 1480, 1544, 1608, 1672, 1736, 1800, 1864, 1928, 2024, 2088, 2152, 2216,
+    2280, 2408, 2472, 2536, 2600, 2664, 2728, 2792, 2856, 2976, 3104, 3240, 3368, 3496, 3624, 3752, 3824,
+])
+
+# Peak MCS per modulation (QPSK ... 1024QAM): the highest code rate any table
+# offers at that order; rows of the precomputed TBS table
+MODULATIONS = (2, 4, 6, 8, 10)
+PEAK_MCS = tuple(max((entry for table in MCS_TABLES.values() for entry in table if entry[0] == qm),
+                     key=lambda entry: entry[1]) for qm in MODULATIONS)
+# Modulation order 0..10 -> PEAK_MCS row (-1: below QPSK, nothing can be sent)
+_ORDER_ROW = np.array([-1, -1, 0, 0, 1, 1, 2, 2, 3, 3, 4])
+
+# TS 38.101-1 / 38.101-2 Table 5.3.2-1: maximum transmission bandwidth
+# configuration N_RB per (sub-carrier spacing kHz, channel bandwidth MHz)
+N_RB_FR1 = {
+    15: {5: 25, 10: 52, 15: 79, 20: 106, 25: 133, 30: 160, 35: 188, 40: 216, 45: 242, 50: 270},
+    30: {5: 11, 10: 24, 15: 38, 20: 51, 25: 65, 30: 78, 35: 92, 40: 106, 45: 119, 50: 133, 60: 162,
+         70: 189, 80: 217, 90: 245, 100: 273},
+    60: {10: 11, 15: 18, 20: 24, 25: 31, 30: 38, 35: 44, 40: 51, 45: 58, 50: 65, 60: 79, 70: 93, 80: 107,
+         90: 121, 100: 135},
+}
+N_RB_FR2 = {
+    60: {50: 66, 100: 132, 200: 264},
+    120: {50: 32, 100: 66, 200: 132, 400: 264},
+}
+MAX_TABLE_PRB = 275
+
+# TDD runs the common DDDSU pattern with a 10:2:2 special slot; its two guard
+# symbols carry nothing in either direction. The DL/UL split itself is the
+# downlink traffic ratio applied to site throughput.
+TDD_PATTERN = "DDDSU"
+SPECIAL_SLOT = (10, 2, 2)  # DL, guard, UL symbols
+TDD_USABLE = 1 - SPECIAL_SLOT[1] / (14 * len(TDD_PATTERN))
+
+
+def _is_fr2(freq_mhz):
+    return np.asarray(freq_mhz, dtype=float) > FR1_MAX_MHZ
+
+
+def resource_blocks(bandwidth_mhz, scs_khz, freq_mhz=3500):
+    """N_RB for the channel; combinations outside the tables fill the bandwidth with PRBs."""
+    bandwidth_mhz, scs_khz, freq_mhz = np.broadcast_arrays(
+        np.asarray(bandwidth_mhz, dtype=float), np.asarray(scs_khz, dtype=float),
+        np.asarray(freq_mhz, dtype=float))
+    n_rb = np.floor(bandwidth_mhz * 1e6 / (12 * scs_khz * 1000))
+    fr2 = _is_fr2(freq_mhz)
+    for table, in_range in ((N_RB_FR1, ~fr2), (N_RB_FR2, fr2)):
+        for scs, by_bandwidth in table.items():
+            for bandwidth, value in by_bandwidth.items():
+                n_rb = np.where(in_range & (scs_khz == scs) & (bandwidth_mhz == bandwidth), value, n_rb)
+    return n_rb
+
+
+def _scalar_resource_blocks(bandwidth_mhz, scs_khz, freq_mhz):
+    table = N_RB_FR2 if freq_mhz > FR1_MAX_MHZ else N_RB_FR1
+    value = table.get(scs_khz, {}).get(bandwidth_mhz)
+    return value if value is not None else int(bandwidth_mhz * 1e6 / (12 * scs_khz * 1000))
+
+
+def transport_block_size(n_prb, n_re_per_prb, qm, rate_x1024, layers):
+    """TS 38.214 5.1.3.2 TBS in bits for one codeword (vectorized)."""
+    n_prb, n_re_per_prb, qm, rate, layers = np.broadcast_arrays(
+        np.asarray(n_prb, dtype=float), np.asarray(n_re_per_prb, dtype=float), np.asarray(qm, dtype=float),
+        np.asarray(rate_x1024, dtype=float) / 1024, np.asarray(layers, dtype=float))
+    n_re = np.minimum(MAX_RE_PER_PRB, n_re_per_prb) * n_prb
+    n_info = n_re * rate * qm * layers
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # N_info <= 3824: quantize and take the next entry of Table 5.1.3.2-1
+        n = np.maximum(3, np.floor(np.log2(np.maximum(n_info, 1))) - 6)
+        quantized = np.maximum(24, 2 ** n * np.floor(n_info / 2 ** n))
+        small = TBS_SMALL[np.minimum(np.searchsorted(TBS_SMALL, quantized), len(TBS_SMALL) - 1)]
+
+        # N_info > 3824: quantize, then fit whole code blocks
+        n = np.floor(np.log2(np.maximum(n_info - 24, 1))) - 5
+        quantized = np.maximum(3840, 2 ** n * np.floor((n_info - 24) / 2 ** n + 0.5))
+        blocks = np.where(rate <= 0.25, np.ceil((quantized + 24) / 3816),
+                          np.where(quantized > 8424, np.ceil((quantized + 24) / 8424), 1))
+        large = 8 * blocks * np.ceil((quantized + 24) / (8 * blocks)) - 24
+
+    tbs = np.where(n_info <= 3824, small, large)
+    return np.where(n_info > 0, tbs, 0).astype(np.int64)
+
+
+class TbsTable:
+    """TBS per codeword for every PRB count, RE count per PRB, peak MCS and 0-4 layers."""
+
+    def __init__(self, values):
+        self.values = values  # (MAX_TABLE_PRB + 1, len(PEAK_MCS), 5, MAX_RE_PER_PRB + 1)
+
+    @classmethod
+    def build(cls):
+        n_prb = np.arange(MAX_TABLE_PRB + 1)[:, None, None, None]
+        qm, rate = (np.array(column, dtype=float)[None, :, None, None] for column in zip(*PEAK_MCS))
+        layers = np.arange(MAX_LAYERS_PER_CODEWORD + 1)[None, None, :, None]
+        n_re = np.arange(MAX_RE_PER_PRB + 1)[None, None, None, :]
+        return cls(transport_block_size(n_prb, n_re, qm, rate, layers).astype(np.int32))
+
+    def slot_bits(self, n_prb, n_re_per_prb, row, layers):
+        """Bits per slot over all codewords, by lookup where the inputs are on the table."""
+        n_prb, n_re_per_prb, row, layers = (np.asarray(x, dtype=np.int64) for x in np.broadcast_arrays(
+            n_prb, n_re_per_prb, row, layers))
+        n_re_per_prb = np.clip(n_re_per_prb, 0, MAX_RE_PER_PRB)
+        layers = np.maximum(layers, 0)
+        # Up to 4 layers ride one codeword, 5-8 two (TS 38.211 7.3.1.3); beyond
+        # that, co-scheduled users take 4 layers each
+        two = (layers > 4) & (layers <= 8)
+        many = layers > 8
+        first = np.where(two, layers // 2, np.where(many, layers % 4, layers))
+        second = np.where(two, layers - layers // 2, 0)
+        full = np.where(many, layers // 4, 0)
+
+        on_table = (n_prb >= 0) & (n_prb <= MAX_TABLE_PRB) & (row >= 0)
+        p, r = np.where(on_table, n_prb, 0), np.maximum(row, 0)
+        bits = np.array(self.values[p, r, first, n_re_per_prb], dtype=np.int64)
+        bits += self.values[p, r, second, n_re_per_prb] + full * self.values[p, r, 4, n_re_per_prb]
+        if not on_table.all():
+            off = ~on_table & (row >= 0)
+            if off.any():
+                qm, rate = (np.array(column, dtype=float)[r[off]] for column in zip(*PEAK_MCS))
+                args = (n_prb[off], n_re_per_prb[off], qm, rate)
+                bits[off] = (transport_block_size(*args, first[off]) + transport_block_size(*args, second[off])
+                             + full[off] * transport_block_size(*args, MAX_LAYERS_PER_CODEWORD))
+            bits[row < 0] = 0
+        return bits
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def _load_or_build(directory):
+    path = os.path.join(directory, f"tbs_table_v{TBS_TABLE_VERSION}.npy")
+    try:
+        return TbsTable(np.load(path, mmap_mode="r"))
+    except (OSError, ValueError):
+        table = TbsTable.build()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp, table.values)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return table
+
+
+def tbs_table():
+    # Process-wide table: memory-mapped from the cache dir, built on first use (~0.1 s)
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = _load_or_build(cache_path("tables"))
+    return _table
+
+
+def peak_row(mod_order):
+    """PEAK_MCS row for modulation orders (-1 below QPSK); orders above 10 use 1024QAM."""
+    return _ORDER_ROW[np.clip(np.asarray(mod_order, dtype=np.int64), 0, len(_ORDER_ROW) - 1)]
+
+
+def peak_spectral_efficiency(mod_order):
+    """Qm x R of the peak MCS, in bits per resource element per layer."""
+    row = int(peak_row(mod_order))
+    return 0.0 if row < 0 else PEAK_MCS[row][0] * PEAK_MCS[row][1] / 1024
+
+
+def overhead_re(overhead):
+    """Resource elements per PRB lost to the overhead share (0-1)."""
+    return np.rint(np.clip(np.asarray(overhead, dtype=float), 0, 1) * RE_PER_PRB).astype(np.int64)
+
+
+def sector_bps(n_prb, scs_khz, mod_order, mimo_layers, overhead, utilization, duplex_mode):
+    """Downlink-capable bits/s of one sector (vectorized over every argument)."""
+    bits = tbs_table().slot_bits(n_prb, RE_PER_PRB - overhead_re(overhead), peak_row(mod_order), mimo_layers)
+    slots_per_s = 1000 * np.asarray(scs_khz, dtype=float) / 15
+    usable = np.where(np.asarray(duplex_mode) == "TDD", TDD_USABLE, 1.0)
+    return bits * slots_per_s * usable * utilization
+
+
+@lru_cache(maxsize=4096)
+def _scalar_bps(n_prb, scs_khz, mod_order, mimo_layers, n_oh_re, tdd):
+    bits = int(tbs_table().slot_bits(n_prb, RE_PER_PRB - n_oh_re, peak_row(mod_order), mimo_layers))
+    return bits * 1000 * scs_khz / 15 * (TDD_USABLE if tdd else 1.0)
+
+
+def scenario_bps(params, n_prb):
+    """sector_bps for one PlanParams; repeated configurations come from a cache."""
+    return _scalar_bps(int(n_prb), params.scs_khz, int(params.mod_order), int(params.mimo_layers),
+                       int(round(min(max(params.effective_overhead, 0.0), 1.0) * RE_PER_PRB)),
+                       params.duplex_mode == "TDD") * params.utilization
+
+
+def scenario_resource_blocks(params):
+    return _scalar_resource_blocks(params.bandwidth_mhz, params.scs_khz, params.freq_mhz)
+
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_YEAR = 2025
+HOURS_PER_DAY = 24
+
+
+@dataclass(frozen=True)
+class TrafficProfile:
+    """Relative demand by hour of day, day of week (Monday first) and month."""
+    name: str
+    hourly: tuple
+    weekly: tuple = (1.0,) * 7
+    monthly: tuple = (1.0,) * 12
+
+    def __post_init__(self):
+        for label, values, n in (("hourly", self.hourly, 24), ("weekly", self.weekly, 7),
+                                 ("monthly", self.monthly, 12)):
+            if len(values) != n:
+                raise ValueError(f"{self.name}: {label} profile needs {n} values, got {len(values)}")
+            if min(values) < 0:
+                raise ValueError(f"{self.name}: {label} profile has negative values")
+
+    def series(self, year=DEFAULT_YEAR):
+        """(timestamps, demand) for every hour of ``year``, demand scaled so the busiest hour is 1."""
+        start = np.datetime64(f"{year}-01-01T00", "h")
+        hours = np.arange(start, np.datetime64(f"{year + 1}-01-01T00", "h"))
+        days = hours.astype("datetime64[D]")
+        hour = (hours - days).astype(int)
+        weekday = (days.astype(int) + 3) % 7  # 1970-01-01 was a Thursday
+        month = days.astype("datetime64[M]").astype(int) % 12
+        demand = (np.asarray(self.hourly)[hour] * np.asarray(self.weekly)[weekday]
+                  * np.asarray(self.monthly)[month])
+        peak = demand.max()
+        return hours, demand / peak if peak > 0 else demand
+
+
+# Shapes follow the usual mobile data pattern: residential areas peak in the
+# evening and at the (Friday/Saturday) weekend, business districts through
+# the working day; summer months carry a little more traffic.
+_SEASONAL = (0.96, 0.95, 0.97, 0.98, 1.0, 1.02, 1.05, 1.05, 1.0, 0.99, 0.98, 0.99)
+
+PROFILES = {
+    "Urban": TrafficProfile(
+        "Urban",
+        hourly=(0.38, 0.26, 0.18, 0.13, 0.11, 0.12, 0.18, 0.30, 0.45, 0.55, 0.62, 0.66,
+                0.70, 0.71, 0.70, 0.70, 0.73, 0.78, 0.85, 0.92, 0.98, 1.0, 0.90, 0.62),
+        weekly=(0.97, 0.97, 0.98, 1.0, 1.06, 1.04, 0.98),
+        monthly=_SEASONAL,
+    ),
+    "Dense Urban": TrafficProfile(
+        "Dense Urban",
+        hourly=(0.30, 0.20, 0.14, 0.11, 0.10, 0.12, 0.20, 0.40, 0.68, 0.86, 0.95, 0.98,
+                1.0, 0.97, 0.95, 0.93, 0.92, 0.90, 0.86, 0.84, 0.80, 0.72, 0.58, 0.42),
+        weekly=(1.0, 1.0, 1.0, 0.99, 0.82, 0.86, 0.98),
+        monthly=_SEASONAL,
+    ),
+}
+
+
+BUILTIN_PROFILES = frozenset(PROFILES)
+
+
+def profile_from_mapping(data, name=None):
+    """TrafficProfile from ``hourly`` and optional ``weekly``/``monthly`` lists; ``name`` if the data has none."""
+    if not isinstance(data, dict) or "hourly" not in data:
+        raise ValueError("A traffic profile needs an object with an 'hourly' list of 24 values")
+    return TrafficProfile(
+        str(data.get("name", name)),
+        tuple(float(v) for v in data["hourly"]),
+        tuple(float(v) for v in data.get("weekly", (1.0,) * 7)),
+        tuple(float(v) for v in data.get("monthly", (1.0,) * 12)),
+    )
+
+
+def load_profile(path):
+    """TrafficProfile from a JSON file with ``hourly`` and optional ``weekly``/``monthly`` lists."""
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    return profile_from_mapping(data, os.path.splitext(os.path.basename(path))[0])
+
+
+def register_profile(profile):
+    """Make ``profile`` selectable as the area type ``profile.name``.
+
+    Plans and demand factors are cached by area type, so a name that is
+    already taken by a different profile is refused rather than replaced.
+    """
+    existing = PROFILES.get(profile.name)
+    if existing is not None and existing != profile:
+        raise ValueError(f"A different traffic profile named {profile.name!r} already exists")
+    PROFILES[profile.name] = profile
+    return profile
+
+
+def custom_profiles():
+    """Registered profiles beyond the built-in ones, e.g. to hand to worker processes."""
+    return tuple(profile for name, profile in PROFILES.items() if name not in BUILTIN_PROFILES)
+
+
+def profile_for(area_type):
+    try:
+        return PROFILES[area_type]
+    except KeyError:
+        raise ValueError(f"No traffic profile for area type {area_type!r}; "
+                         f"expected one of {', '.join(PROFILES)}") from None
+
+
+@lru_cache(maxsize=256)
+def demand_factor(area_type, percentile=100.0, year=DEFAULT_YEAR):
+    """Hourly demand at ``percentile`` of the year, relative to the busy hour."""
+    if percentile >= 100:
+        return 1.0
+    _, demand = profile_for(area_type).series(year)
+    return float(np.percentile(demand, percentile))
+
+
+@dataclass
+class LoadReport:
+    hours: np.ndarray  # datetime64[h] for every hour of the year
+    demand_mbps: np.ndarray
+    load: np.ndarray  # demand over installed capacity
+    threshold: float
+    busy_hour: np.datetime64
+    busy_hour_load: float
+    hours_over: int  # hours with load above threshold
+    mean_demand_mbps: float
+
+    def percentile(self, pct):
+        return float(np.percentile(self.load, pct))
+
+    def by_day(self):
+        # (day, hour) grid for heatmaps
+        return self.load.reshape(-1, HOURS_PER_DAY)
+
+
+def evaluate_load(params, result, threshold=0.8, year=DEFAULT_YEAR, profile=None):
+    """Network load for every hour of the year against the installed capacity of ``result``.
+
+    ``params.traffic_per_user`` is the busy-hour demand; the profile of
+    ``params.area_type`` (or ``profile``) spreads it over the year.
+    """
+    hours, shape = (profile or profile_for(params.area_type)).series(year)
+    demand = params.traffic_per_user * shape
+    capacity = result.site_throughput_mbps * result.total_sites_required
+    with np.errstate(divide="ignore", invalid="ignore"):
+        load = np.where(capacity > 0, demand / capacity, np.inf)
+    busiest = int(np.argmax(demand))
+    return LoadReport(
+        hours=hours,
+        demand_mbps=demand,
+        load=load,
+        threshold=threshold,
+        busy_hour=hours[busiest],
+        busy_hour_load=float(load[busiest]),
+        hours_over=int(np.count_nonzero(load > threshold)),
+        mean_demand_mbps=float(demand.mean()),
+    )
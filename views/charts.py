@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+import streamlit as st
+
+from planner.profiling import span
+
+
+@st.cache_resource(max_entries=512, show_spinner=False)
+def cached_figure(name, *args):
+    # Figures are keyed by builder name and input data, and shared read-only across sessions.
+    # Plotly is only imported once a results view actually needs it.
+    with span(f"build_figure/{name}"):
+        from planner import figures
+        return getattr(figures, name)(*args)
+
+
+@st.cache_resource(max_entries=32, show_spinner="Rasterizing coverage...")
+def cached_coverage_map(params, layout="hex", max_pixels=400, use_terrain=False):
+    # Rasterize at the finest resolution the chart can show (never below 10 m)
+    from planner import figures
+    from planner.placement import place_sites
+    from planner.raster import rasterize
+    from planner.terrain import default_terrain
+    side_m = params.area_km2 ** 0.5 * 1000
+    sites = place_sites(params, layout).sites_m
+    terrain = default_terrain() if use_terrain else None
+    with span("rasterize"):
+        coverage = rasterize(params, resolution_m=max(10.0, side_m / max_pixels), sites=sites, terrain=terrain)
+    figure = figures.coverage_map_figure(coverage.x_m / 1000, coverage.y_m / 1000, coverage.margin_db,
+                                         coverage.sites_m[:, 0] / 1000, coverage.sites_m[:, 1] / 1000)
+    return coverage, figure
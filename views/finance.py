@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import math
+
+import streamlit as st
+
+from planner.cache import cached_plan_network
+from planner.finance import DEFAULT_DRAWS, DEFAULT_SEED, IRR_BOUNDS, PERCENTILES, Assumptions, Range, simulate_plan
+from views.charts import cached_figure
+
+DRAW_OPTIONS = [5000, 20000, 50000, 100000]
+
+# Label, display scale (shown value = stored value * scale) and step of each sampled input
+RANGE_INPUTS = {
+    "equipment_cost": ("Equipment Cost ($ per site)", 1, 5000.0),
+    "installation_cost": ("Installation Cost ($ per site)", 1, 5000.0),
+    "maintenance_cost": ("Maintenance Cost ($ per site per year)", 1, 1000.0),
+    "arpu": ("Revenue per User ($ per month)", 1, 0.5),
+    "churn": ("Churn (% of subscribers per year)", 100, 1.0),
+    "growth": ("Subscriber Growth (% of base per year)", 100, 1.0),
+}
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def plan_simulation(params, result, assumptions=None, draws=DEFAULT_DRAWS, seed=DEFAULT_SEED):
+    # Shared read-only across sessions; params and result are frozen, so they key the cache directly
+    return simulate_plan(params, result, assumptions, draws, seed)
+
+
+def format_money(value):
+    return f"-${-value:,.0f}" if value < 0 else f"${value:,.0f}"
+
+
+def format_irr(value):
+    if value >= IRR_BOUNDS[1]:
+        return f"> {IRR_BOUNDS[1]:.0%}"
+    if value <= IRR_BOUNDS[0]:
+        return f"< {IRR_BOUNDS[0]:.0%}"
+    return f"{value:.1%}"
+
+
+def format_years(value, horizon):
+    return f"> {horizon} years" if math.isinf(value) else f"{value:.1f} years"
+
+
+def _range_input(name, default):
+    label, scale, step = RANGE_INPUTS[name]
+    st.markdown(f"**{label}**")
+    values = []
+    for column, caption, value in zip(st.columns(3), ("Low", "Most Likely", "High"),
+                                      (default.low, default.mode, default.high)):
+        values.append(column.number_input(caption, value=float(value * scale), step=step, min_value=0.0,
+                                          key=f"finance_{name}_{caption}") / scale)
+    return values
+
+
+def render(params):
+    st.markdown("## 🎲 Financial Risk")
+    st.caption("Samples unit costs, revenue per user, churn and subscriber growth from triangular "
+               "(low, most likely, high) distributions and simulates every draw's cash flows at once. "
+               "The planned sites are built in year 0 and serve today's active users from year 1.")
+
+    result = cached_plan_network(params)
+    defaults = Assumptions()
+
+    with st.form("finance_form", border=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            years = st.slider("Horizon (years)", min_value=3, max_value=20, value=defaults.years)
+        with col2:
+            discount_pct = st.number_input("Discount Rate (%/year)", value=defaults.discount_rate * 100,
+                                           step=0.5, min_value=0.0)
+        with col3:
+            draws = st.selectbox("Draws", DRAW_OPTIONS, index=DRAW_OPTIONS.index(DEFAULT_DRAWS),
+                                 format_func=lambda n: f"{n:,}")
+        ranges = {}
+        col1, col2 = st.columns(2)
+        for i, name in enumerate(RANGE_INPUTS):
+            with (col1, col2)[i % 2]:
+                ranges[name] = _range_input(name, getattr(defaults, name))
+        st.form_submit_button("Run Simulation", use_container_width=True)
+
+    try:
+        assumptions = Assumptions(**{name: Range(*values) for name, values in ranges.items()},
+                                  discount_rate=discount_pct / 100, years=years)
+    except ValueError as exc:
+        st.error(f"Each range needs Low ≤ Most Likely ≤ High ({exc}).")
+        return
+    sim = plan_simulation(params, result, assumptions, draws)
+
+    npv_p = sim.percentiles(sim.npv)
+    irr_p = sim.percentiles(sim.irr)
+    payback_p = sim.percentiles(sim.payback_years)
+    capex_p = sim.percentiles(sim.capex)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Median NPV", format_money(npv_p[1]),
+                delta=f"P10 {format_money(npv_p[0])} · P90 {format_money(npv_p[2])}", delta_color="off")
+    col2.metric("Chance of Positive NPV", f"{sim.probability_positive_npv:.0%}")
+    col3.metric("Median IRR", format_irr(irr_p[1]))
+    col4.metric("Median Payback", format_years(payback_p[1], years),
+                delta=f"{sim.payback_share:.0%} pay back within {years} years", delta_color="off")
+
+    fan = sim.fan()
+    st.plotly_chart(cached_figure("cash_flow_fan_figure", tuple(sim.years.tolist()),
+                                  *(tuple(band.tolist()) for band in fan)),
+                    use_container_width=True)
+
+    st.markdown("#### 📋 Percentiles")
+    st.dataframe(
+        [{"Metric": "NPV", **{f"P{q}": format_money(v) for q, v in zip(PERCENTILES, npv_p)}},
+         {"Metric": "IRR", **{f"P{q}": format_irr(v) for q, v in zip(PERCENTILES, irr_p)}},
+         {"Metric": "Payback", **{f"P{q}": format_years(v, years) for q, v in zip(PERCENTILES, payback_p)}},
+         {"Metric": "CAPEX", **{f"P{q}": format_money(v) for q, v in zip(PERCENTILES, capex_p)}}],
+        hide_index=True, use_container_width=True
+    )
+    sites = result.total_sites_required
+    st.caption(f"{sim.draws:,} draws for {sites} site{'s' if sites != 1 else ''} and "
+               f"{result.active_users:,.0f} active users, simulated in {sim.elapsed_s * 1000:.0f} ms.")
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import streamlit as st
+
+from planner.forecast import Growth, forecast
+from views.charts import cached_figure
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _cached_forecast(params, growth, years, upgrades):
+    # upgrades arrive as hashable ((year, ((field, value), ...)), ...)
+    return forecast(params, growth, years, {year: dict(changes) for year, changes in upgrades})
+
+
+def render(params):
+    st.markdown("## 📈 Rollout Forecast")
+    st.caption("Projects demand from population, 5G adoption and per-user traffic growth, and plans "
+               "the network year by year; only the stages whose inputs change are recomputed.")
+
+    with st.form("forecast_form", border=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            years = st.slider("Horizon (years)", min_value=5, max_value=10, value=10)
+            population_rate = st.number_input("Population Growth (%/year)", value=2.0, step=0.5)
+            traffic_rate = st.number_input("Per-User Traffic Growth (%/year)", value=25.0, step=5.0)
+        with col2:
+            ceiling = st.slider("5G Penetration Ceiling (%)", min_value=0, max_value=100,
+                                value=max(80, int(params.penetration_rate)))
+            adoption_rate = st.slider("Adoption Speed", min_value=0.1, max_value=2.0, value=0.5, step=0.1,
+                                      help="Steepness of the S-curve from today's penetration to the ceiling")
+        upgrade = st.checkbox("Plan a capacity upgrade")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            upgrade_year = st.number_input("Upgrade Year", min_value=1, max_value=10, value=3)
+        with col2:
+            upgrade_bw = st.selectbox("New Bandwidth (MHz)", [10, 20, 40, 60, 80, 100], index=5)
+        with col3:
+            upgrade_mimo = st.selectbox("New MIMO Layers", [1, 2, 4, 8, 16, 32], index=3)
+        st.form_submit_button("Run Forecast", use_container_width=True)
+
+    if upgrade and upgrade_year > years:
+        # The horizon slider sits in the same form, so the year input cannot be bounded by it
+        st.warning(f"The upgrade in year {upgrade_year} falls after the {years}-year horizon and is "
+                   f"not part of this forecast.")
+    growth = Growth(population_rate / 100, float(ceiling), adoption_rate, traffic_rate / 100)
+    upgrades = ((int(upgrade_year), (("bandwidth_mhz", upgrade_bw), ("mimo_layers", upgrade_mimo))),) \
+        if upgrade else ()
+    result = _cached_forecast(params, growth, years, upgrades)
+
+    first, last = result.years[0], result.years[-1]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Sites Today", f"{first.installed_sites}")
+    col2.metric(f"Sites in Year {last.year}", f"{last.installed_sites}",
+                delta=f"+{last.installed_sites - first.installed_sites}")
+    col3.metric(f"Traffic in Year {last.year}", f"{last.result.total_traffic_mbps:,.0f} Mbps")
+    col4.metric(f"{last.year}-Year Total Cost", f"${result.total_cost:,.0f}")
+
+    st.plotly_chart(
+        cached_figure("forecast_figure", tuple(y.year for y in result.years),
+                      tuple(y.installed_sites - y.sites_added for y in result.years),
+                      tuple(y.sites_added for y in result.years),
+                      tuple(y.cumulative_cost for y in result.years)),
+        use_container_width=True
+    )
+
+    st.markdown("#### 📋 Year-by-Year Plan")
+    st.dataframe(
+        [{"Year": row["year"],
+          "Population": f"{row['population']:,}",
+          "Penetration (%)": f"{row['penetration_rate']:.1f}",
+          "Traffic (Mbps)": f"{row['total_traffic_mbps']:,.0f}",
+          "Coverage Sites": row["num_sites_coverage"],
+          "Capacity Sites": row["num_sites_capacity"],
+          "Installed Sites": row["installed_sites"],
+          "Sites Added": row["sites_added"],
+          "CAPEX ($)": f"{row['capex']:,.0f}",
+          "OPEX ($)": f"{row['opex']:,.0f}"} for row in result.as_rows()],
+        hide_index=True, use_container_width=True
+    )
+    stages = ", ".join(f"{name.replace('_', ' ')} {count}x" for name, count in result.recomputed.items())
+    st.caption(f"Stages computed over {len(result.years)} years: {stages}.")
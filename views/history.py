@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import io
+import time
+
+import streamlit as st
+
+from planner.core import BANDS
+from planner.history import default_store
+from views.inputs import restore
+
+ALL = "All"
+TABLE_ROWS = 200
+BAND_NAMES = {mhz: label for label, mhz in BANDS.items()}
+
+
+def _picker(label, store, column, key, format_func=str, on_change=None, **filters):
+    options = [ALL] + store.distinct(column, **filters)
+    value = st.selectbox(label, options, key=key, on_change=on_change,
+                         format_func=lambda value: value if value == ALL else format_func(value))
+    return None if value == ALL else value
+
+
+FORMATS = {"Parquet": ("parquet", "plan_history.parquet", "application/vnd.apache.parquet"),
+           "Arrow": ("arrow", "plan_history.arrow", "application/vnd.apache.arrow.file")}
+
+
+def _export(store, fmt, filters):
+    out = io.BytesIO()
+    store.export(out, fmt, **filters)
+    return out.getvalue()
+
+
+def render(params):
+    st.markdown("## 🕘 Plan History")
+    st.caption("Every calculated plan is saved with its inputs and results; recalculating the same "
+               "scenario updates its last run instead of adding a row.")
+
+    store = default_store()
+    if not store.available:
+        st.warning(f"The plan history at `{store.path}` could not be opened; plans are not being saved.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        city = _picker("City", store, "city", "history_city",
+                       on_change=lambda: st.session_state.pop("history_area", None))
+    with col2:
+        area = _picker("Area", store, "area", "history_area", city=city)
+    with col3:
+        freq_mhz = _picker("Band", store, "freq_mhz", "history_band",
+                           format_func=lambda mhz: BAND_NAMES.get(mhz, f"{mhz:g} MHz"))
+    with col4:
+        model = _picker("Propagation Model", store, "propagation_model", "history_model")
+    filters = dict(city=city, area=area, freq_mhz=freq_mhz, propagation_model=model)
+
+    total = store.count(**filters)
+    if not total:
+        st.info("No saved plans match. Calculate a plan in 📋 Network Plan to start the history.")
+        return
+
+    rows = store.query(limit=TABLE_ROWS, **filters)
+    st.markdown(f"#### 📋 Saved Plans ({total:,}" + (f", latest {TABLE_ROWS} shown)" if total > TABLE_ROWS else ")"))
+    st.dataframe(
+        [{"ID": row["id"],
+          "Last Run": time.strftime("%Y-%m-%d %H:%M", time.localtime(row["last_run"])),
+          "Runs": row["run_count"],
+          "City": row["city"],
+          "Area": row["area"],
+          "Band": BAND_NAMES.get(row["freq_mhz"], f"{row['freq_mhz']:g} MHz"),
+          "Model": row["propagation_model"],
+          "Area (km²)": row["area_km2"],
+          "Population": f"{row['population']:,}",
+          "Radius (km)": f"{row['coverage_radius_km']:.3f}",
+          "Traffic (Mbps)": f"{row['total_traffic_mbps']:,.0f}",
+          "Sites": row["total_sites_required"]} for row in rows],
+        hide_index=True, use_container_width=True
+    )
+
+    by_id = {row["id"]: row for row in rows}
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        chosen = st.selectbox(
+            "Saved plan", list(by_id), label_visibility="collapsed",
+            format_func=lambda row_id: f"#{row_id} · {by_id[row_id]['city'] or '—'} / "
+                                       f"{by_id[row_id]['area'] or '—'} · "
+                                       f"{by_id[row_id]['total_sites_required']} sites")
+    with col2:
+        row = by_id[chosen]
+        st.button("↩️ Restore Inputs", use_container_width=True, on_click=restore,
+                  args=(store.params(chosen), row["city"], row["area"]),
+                  help="Load this plan's inputs into the sidebar and show it in 📋 Network Plan")
+
+    st.markdown("#### 💾 Export")
+    st.caption(f"All {total:,} matching plans with every input and result column.")
+    col1, col2 = st.columns(2)
+    with col1:
+        label = st.radio("Format", list(FORMATS), horizontal=True, label_visibility="collapsed")
+    fmt, file_name, mime = FORMATS[label]
+    # Built on request and kept for these filters, so reruns do not re-export the history
+    request = (fmt, tuple(filters.items()), total)
+    with col2:
+        if st.button("Prepare Export", use_container_width=True):
+            st.session_state["history_export"] = (request, _export(store, fmt, filters))
+    prepared = st.session_state.get("history_export")
+    if prepared is not None and prepared[0] == request:
+        st.download_button(f"Download {label} ({len(prepared[1]) / 1024:,.0f} KiB)", prepared[1],
+                           file_name=file_name, mime=mime, use_container_width=True)
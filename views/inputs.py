@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import streamlit as st
+
+from planner.core import BANDS
+from planner.locations import catalogue
+
+# Link budget terms applied unless the planner customises them, and the
+# fixed terms that go with a custom MAPL
+STANDARD_LINK_TERMS = dict(
+    tx_power=49, tx_gain=24, cable_loss=0, penetration_loss=22, foliage_loss=7.5, body_loss=3,
+    interference_margin=6, rain_margin=0, shadow_margin=6, rx_gain=0, noise_figure=9, required_sinr=14,
+)
+CUSTOM_MAPL_LINK_TERMS = dict(
+    tx_power=49, tx_gain=24, cable_loss=0, penetration_loss=24, foliage_loss=11, body_loss=3,
+    interference_margin=6, rain_margin=0, shadow_margin=7, rx_gain=24, noise_figure=9, required_sinr=14,
+)
+
+# Sidebar widgets are keyed and seeded through session state (never with
+# value=), so a saved plan can be written back into them
+DEFAULTS = {
+    "bandwidth_mhz": 60, "scs_khz": 30, "use_custom_mapl": False, "custom_mapl": 130.0,
+    "use_custom_link_budget": False,
+    **{f"lb_{name}": value for name, value in CUSTOM_MAPL_LINK_TERMS.items()},
+    "area_km2": 0.5, "population": 10000, "penetration_rate": 30, "traffic_per_user": 5.0,
+    "downlink_pct": 75, "q": 0.8, "antenna_type": "Directive", "band": "Mid-Band (e.g. 3.5 GHz)",
+    "mod_order": 8, "mimo_layers": 4, "utilization_pct": 70, "overhead_pct": 25, "sectors_per_site": 3,
+    "sizing_percentile": 100, "duplex_mode": "TDD", "propagation_model": "UMi-Street Canyon",
+    "reliability_pct": 95, "max_radius_km": 0.7,
+}
+
+PLAN_MODE = "📋 Network Plan"
+
+
+def seed_inputs():
+    for key, value in DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+
+
+def _prefill(location):
+    st.session_state["area_km2"] = max(0.1, location.area_km2)
+    st.session_state["population"] = location.population
+
+
+def select_city():
+    # on_change of the city picker: the previous city's area is not an option any more
+    st.session_state.pop("area", None)
+    areas = catalogue().areas(st.session_state["city"])
+    if areas:
+        _prefill(catalogue().get(st.session_state["city"], areas[0]))
+
+
+def select_area():
+    location = catalogue().get(st.session_state["city"], st.session_state["area"])
+    if location is not None:
+        _prefill(location)
+
+
+def pick_match():
+    """on_change of the district search results: select the district and clear the search."""
+    location = st.session_state.pop("location_match", None)
+    if location is None:
+        return
+    st.session_state["city"], st.session_state["area"] = location.city, location.area
+    st.session_state["location_search"] = ""
+    _prefill(location)
+
+
+def _number(value):
+    # Integral values go back as ints so integer-typed number inputs accept them
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def restore(params, city=None, area=None):
+    """Button callback: load a plan's inputs into the sidebar and plan it again."""
+    state = st.session_state
+    if city is not None and catalogue().get(city, area) is not None:
+        state["city"], state["area"] = city, area
+    state["bandwidth_mhz"] = int(params.bandwidth_mhz)
+    state["scs_khz"] = int(params.scs_khz)
+    state["use_custom_mapl"] = params.custom_mapl is not None
+    if params.custom_mapl is not None:
+        state["custom_mapl"] = float(params.custom_mapl)
+    terms = {name: getattr(params, name) for name in STANDARD_LINK_TERMS}
+    state["use_custom_link_budget"] = params.custom_mapl is None and terms != STANDARD_LINK_TERMS
+    if state["use_custom_link_budget"]:
+        for name, value in terms.items():
+            state[f"lb_{name}"] = _number(value)
+
+    state["area_km2"] = float(params.area_km2)
+    state["population"] = int(params.population)
+    state["penetration_rate"] = int(round(params.penetration_rate))
+    state["traffic_per_user"] = float(params.traffic_per_user)
+    state["downlink_pct"] = int(round(params.downlink_ratio * 100))
+    state["q"] = float(params.q)
+    state["antenna_type"] = params.antenna_type
+    band = next((label for label, mhz in BANDS.items() if mhz == params.freq_mhz), None)
+    if band is not None:
+        state["band"] = band
+    state["mod_order"] = int(params.mod_order)
+    state["mimo_layers"] = int(params.mimo_layers)
+    state["utilization_pct"] = int(round(params.utilization * 100))
+    state["overhead_pct"] = int(round(params.overhead * 100))
+    state["sectors_per_site"] = int(params.sectors_per_site)
+    state["sizing_percentile"] = int(round(params.sizing_percentile))
+    state["duplex_mode"] = params.duplex_mode
+    state["propagation_model"] = params.propagation_model
+    state["reliability_pct"] = int(round(params.cell_edge_reliability * 100))
+    state["max_radius_km"] = float(params.max_radius_km)
+
+    state["replan"] = True
+    state["app_mode"] = PLAN_MODE
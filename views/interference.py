@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import streamlit as st
+
+from planner.cache import cached_plan_network
+from planner.sinr import simulate_sinr
+from views.charts import cached_figure
+from views.jobs import current_job, follow, submit
+
+UE_COUNTS = {"10,000": 10000, "100,000": 100000, "1,000,000": 1000000}
+SINR_PERCENTILES = (5, 10, 50, 90, 95)
+
+
+def _apply_q(q):
+    # Runs before the next script run, so the sidebar slider can still be updated;
+    # the flag replans with the new q without another click on Calculate
+    st.session_state["q"] = q
+    st.session_state["replan"] = True
+
+
+def _metrics(sim):
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Mean SINR", f"{sim.mean_sinr_db:.1f} dB")
+    col2.metric("Cell-Edge SINR (5%)", f"{sim.edge_sinr_db:.1f} dB")
+    col3.metric("Mean UE Throughput", f"{sim.mean_throughput_mbps:.0f} Mbps")
+    col4.metric("Cell-Edge Throughput", f"{sim.edge_throughput_mbps:.1f} Mbps")
+
+
+def _render_partial(sim):
+    _metrics(sim)
+    st.caption(f"Effective q so far: {sim.effective_q:.3f} over {sim.n_ue:,} UEs")
+
+
+def render_result(sim, params):
+    _metrics(sim)
+    cdf = np.cumsum(sim.sinr_counts) / sim.sinr_counts.sum()
+    st.plotly_chart(
+        cached_figure("sinr_cdf_figure", sim.sinr_bins[1:], cdf, sim.edge_sinr_db),
+        use_container_width=True
+    )
+
+    st.dataframe(
+        [{f"P{pct}": f"{sim.percentile_sinr(pct):.1f} dB" for pct in SINR_PERCENTILES}],
+        hide_index=True, use_container_width=True
+    )
+
+    # Capacity sites as planned with the q the button applies instead of the entered one
+    entered = cached_plan_network(params)
+    simulated = cached_plan_network(sim.apply(params))
+    st.info(f"Simulated effective q = **{sim.effective_q:.3f}** (entered: {params.q:.2f}) over "
+            f"{sim.n_ue:,} UEs and {sim.n_cells} cells at {sim.isd_m:.0f} m inter-site distance. "
+            f"With q = {sim.applied_q:.2f} the plan needs **{simulated.total_sites_required}** "
+            f"site{'s' if simulated.total_sites_required != 1 else ''} "
+            f"({simulated.num_sites_capacity} for capacity) instead of {entered.total_sites_required}.")
+    st.button(f"Use q = {sim.applied_q:.2f} and recalculate", on_click=_apply_q,
+              args=(sim.applied_q,), use_container_width=True)
+
+
+def render(params):
+    st.markdown("#### 📶 System-Level SINR Simulation")
+    st.caption("UEs are dropped over the centre cell of a multi-ring hexagonal layout at the planned "
+               "site spacing; every cell transmits the sidebar link budget and interferes at the "
+               "resource utilization. Mean spectral efficiency over the peak gives an effective q.")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n_ue = UE_COUNTS[st.selectbox("UEs", list(UE_COUNTS), index=1, key="sinr_ues")]
+    with col2:
+        rings = st.selectbox("Interfering Rings", [1, 2, 3], index=1, key="sinr_rings")
+    with col3:
+        seed = st.number_input("Random Seed", min_value=0, value=0, step=1, key="sinr_seed")
+
+    key = (params, n_ue, rings, int(seed))
+    if st.button("Run SINR Simulation", use_container_width=True):
+        submit("sinr", simulate_sinr, params, n_ue=n_ue, rings=rings, seed=int(seed),
+               label=f"SINR simulation of {n_ue:,} UEs", tag=key)
+
+    job = current_job("sinr")
+    if job is None or job.tag != key:
+        return
+    sim = follow(job, _render_partial)
+    if sim is not None:
+        render_result(sim, params)
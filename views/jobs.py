@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+import io
+import time
+
+import streamlit as st
+
+from planner.jobs import CANCELLED, FAILED, QUEUED, JobQueue
+
+# Jobs that finish this quickly are drawn in the same run, without a progress bar
+INLINE_WAIT_S = 0.3
+
+
+@st.cache_resource(show_spinner=False)
+def job_queue():
+    # One queue per server process, so jobs outlive reruns, reloads and reconnects
+    return JobQueue()
+
+
+def submit(kind, fn, *args, label=None, tag=None, **kwargs):
+    job = job_queue().submit(kind, fn, *args, label=label, tag=tag, **kwargs)
+    st.session_state[f"job_{kind}"] = job.id
+    st.session_state["my_jobs"] = st.session_state.get("my_jobs", []) + [job.id]
+    # Kept in the URL so a reloaded page can find the job again
+    st.query_params["job"] = job.id
+    job.wait(INLINE_WAIT_S)
+    return job
+
+
+def current_job(kind):
+    """This session's latest ``kind`` job, or the one named in the URL after a reload."""
+    queue = job_queue()
+    job = queue.get(st.session_state.get(f"job_{kind}", ""))
+    if job is None:
+        job = queue.get(st.query_params.get("job", ""))
+        if job is None or job.kind != kind:
+            return None
+        st.session_state[f"job_{kind}"] = job.id
+    return job
+
+
+def follow(job, render_partial=None):
+    """The job's result once it is done; until then draws its live progress and returns None."""
+    if job.status == FAILED:
+        st.error(f"{job.label} failed: {job.error}")
+        return None
+    if job.status == CANCELLED:
+        st.info(f"{job.label} was cancelled.")
+        return None
+    if not job.finished:
+        _progress(job.id, render_partial)
+        return None
+    return job.result
+
+
+@st.fragment(run_every=0.5)
+def _progress(job_id, render_partial):
+    job = job_queue().get(job_id)
+    if job is None:
+        st.warning(f"Job {job_id} is no longer available.")
+        return
+    if job.finished:
+        # Redraw the whole page so the submitting view renders the final result
+        st.rerun()
+    if job.status == QUEUED:
+        text = f"{job.label}: waiting for a worker ({job_queue().active} jobs in progress)"
+    else:
+        total = f" of {job.total:,}" if job.total else ""
+        text = f"{job.label}: {job.done:,}{total} after {job.elapsed:.0f} s"
+    col1, col2 = st.columns([5, 1])
+    col1.progress(job.fraction, text=text)
+    col2.button("Cancel", key=f"cancel_{job.id}", on_click=job.cancel, use_container_width=True)
+    st.caption(f"Job ID `{job.id}`: the result can be retrieved from the Jobs mode after a reload.")
+    partial = job.partial
+    if partial is not None and render_partial is not None:
+        render_partial(partial)
+
+
+def _batch_rows(rows):
+    planned = [record for _, record, error in rows if error is None]
+    failed = [{"Line": lineno, "Error": error} for lineno, _, error in rows if error is not None]
+    return planned, failed
+
+
+def _render_batch_partial(rows):
+    planned, failed = _batch_rows(list(rows))
+    st.caption(f"{len(planned):,} scenarios planned, {len(failed):,} rejected so far")
+    if planned:
+        st.dataframe(planned[-20:], hide_index=True, use_container_width=True)
+
+
+def _render_batch(rows):
+    from planner.cli import ResultWriter
+    planned, failed = _batch_rows(rows)
+    st.success(f"{len(planned):,} scenarios planned, {len(failed):,} rejected")
+    if planned:
+        st.dataframe(planned, hide_index=True, use_container_width=True)
+        out = io.StringIO()
+        writer = ResultWriter(out, "csv")
+        for record in planned:
+            writer.write(record)
+        st.download_button("Download Results (CSV)", out.getvalue(), file_name="plan_results.csv",
+                           mime="text/csv", use_container_width=True)
+    if failed:
+        st.markdown("#### ⚠️ Rejected Scenarios")
+        st.dataframe(failed, hide_index=True, use_container_width=True)
+
+
+def _render_result(job, params):
+    if job.kind == "batch":
+        _render_batch(job.result)
+    elif job.kind == "sinr":
+        from views import interference
+        interference.render_result(job.result, params)
+    elif job.kind == "mc_radius":
+        from views import radius
+        radius.render_result(job.result)
+    elif job.kind == "sweep":
+        point, cost = job.result.best("cost_estimate")
+        st.success(f"Evaluated {job.result.size:,} configurations; the cheapest costs ${cost:,.0f}")
+        st.dataframe([{"Parameter": name, "Value": str(value)} for name, value in point.items()],
+                     hide_index=True, use_container_width=True)
+
+
+PARTIAL_VIEWS = {"batch": _render_batch_partial}
+
+
+def render(params):
+    st.markdown("## 🗂️ Jobs")
+    st.caption("Long analyses run on a shared worker pool and keep going if the page reloads; "
+               "results stay available by job ID.")
+
+    with st.form("batch_form", border=False):
+        upload = st.file_uploader("Scenario file (CSV or JSONL, one district per row)",
+                                  type=["csv", "jsonl", "ndjson"])
+        run = st.form_submit_button("Plan Scenarios in the Background", use_container_width=True)
+    if run and upload is not None:
+        from planner.cli import read_scenarios
+        from planner.parallel import plan_batch
+        fmt = "csv" if upload.name.lower().endswith(".csv") else "jsonl"
+        try:
+            records = list(read_scenarios(io.StringIO(upload.getvalue().decode("utf-8-sig")), fmt))
+        except ValueError as exc:
+            st.error(f"Could not read {upload.name}: {exc}")
+            return
+        submit("batch", plan_batch, records, label=f"Batch plan of {len(records):,} scenarios")
+
+    mine = [job for job in map(job_queue().get, st.session_state.get("my_jobs", [])) if job is not None]
+    if mine:
+        st.markdown("#### 📋 This Session's Jobs")
+        st.dataframe(
+            [{"Job ID": job.id,
+              "Job": job.label,
+              "Status": job.status,
+              "Progress (%)": f"{job.fraction * 100:.0f}",
+              "Submitted": time.strftime("%H:%M:%S", time.localtime(job.submitted)),
+              "Run Time (s)": f"{job.elapsed:.1f}"} for job in reversed(mine)],
+            hide_index=True, use_container_width=True
+        )
+
+    default = st.query_params.get("job", mine[-1].id if mine else "")
+    job_id = st.text_input("Job ID", value=default, placeholder="e.g. 3f9c2a7b1d04").strip()
+    if not job_id:
+        return
+    job = job_queue().get(job_id)
+    if job is None:
+        st.warning(f"No job {job_id} on this server; finished jobs are kept for a limited time.")
+        return
+    st.markdown(f"#### {job.label}")
+    if follow(job, PARTIAL_VIEWS.get(job.kind)) is not None:
+        _render_result(job, params)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import math
+import time
+
+import streamlit as st
+
+from planner.core import BANDS
+from planner.optimize import SEARCH_SPACE, optimize
+from views.charts import cached_figure
+
+BAND_LABELS = {mhz: label for label, mhz in BANDS.items()}
+
+# Sidebar label per searchable parameter
+SEARCH_LABELS = {
+    "freq_mhz": "Frequency Band",
+    "bandwidth_mhz": "Bandwidth (MHz)",
+    "mimo_layers": "Number of MIMO Layers",
+    "sectors_per_site": "Sectors per Site",
+    "antenna_type": "Antenna Type",
+}
+
+
+def _describe(config):
+    parts = []
+    for name, value in config.items():
+        if name == "freq_mhz":
+            value = BAND_LABELS.get(value, f"{value} MHz")
+        parts.append(f"{SEARCH_LABELS.get(name, name)}: {value}")
+    return " | ".join(parts)
+
+
+def _format_headroom(headroom):
+    return "Unconstrained" if math.isinf(headroom) else f"{headroom * 100:.0f}%"
+
+
+def render(params):
+    st.markdown("## 💰 Cost Optimizer")
+    st.caption("Searches every combination of the options below for the plans that reach coverage "
+               "and capacity at the lowest CAPEX + OPEX; demand and link budget come from the sidebar.")
+
+    with st.form("optimizer_form", border=False):
+        space = {}
+        for name, options in SEARCH_SPACE.items():
+            space[name] = st.multiselect(
+                SEARCH_LABELS[name], list(options), default=list(options), key=f"search_{name}",
+                format_func=lambda v, name=name: BAND_LABELS.get(v, str(v)) if name == "freq_mhz" else str(v),
+            )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            years = st.number_input("OPEX Horizon (years)", min_value=1, max_value=20, value=5)
+        with col2:
+            min_headroom = st.number_input("Minimum Capacity Headroom (%)", min_value=0.0, value=0.0,
+                                           step=10.0)
+        with col3:
+            max_cost = st.number_input("Budget Cap ($, 0 = none)", min_value=0.0, value=0.0,
+                                       step=1e6, format="%.0f")
+        run = st.form_submit_button("Find Optimal Configurations", use_container_width=True)
+
+    if run:
+        try:
+            started = time.perf_counter()
+            result = optimize(params, space, years=int(years), min_headroom=min_headroom / 100,
+                              max_cost=max_cost or None)
+            elapsed = time.perf_counter() - started
+        except ValueError as exc:
+            st.error(f"Invalid search: {exc}")
+            return
+        st.session_state["optimizer"] = (params, result, elapsed)
+
+    stored = st.session_state.get("optimizer")
+    if stored is None or stored[0] != params:
+        return
+    _, result, elapsed = stored
+    st.success(f"Searched {result.space_size:,} configurations in {elapsed * 1000:.0f} ms "
+               f"({result.pruned:,} pruned by cost and headroom bounds)")
+    if not result.front:
+        st.warning("No configuration meets the headroom and budget constraints.")
+        return
+
+    best = result.cheapest
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Lowest Lifetime Cost", f"${best.cost:,.0f}")
+    col2.metric("Sites Required", f"{best.total_sites_required}")
+    col3.metric("Capacity Headroom", _format_headroom(best.headroom))
+    st.info(f"🏆 {_describe(best.config)}")
+
+    if math.isinf(best.headroom):
+        st.caption("There is no traffic demand, so capacity does not constrain the plan and the "
+                   "cheapest coverage configuration is the whole front.")
+    else:
+        st.plotly_chart(
+            cached_figure("pareto_figure", tuple(p.cost for p in result.front),
+                          tuple(p.headroom * 100 for p in result.front),
+                          tuple(_describe(p.config) for p in result.front)),
+            use_container_width=True
+        )
+    st.markdown(f"#### 📋 Pareto Front ({result.years}-Year Cost)")
+    st.dataframe(
+        [{"Configuration": _describe(p.config),
+          "Sites": p.total_sites_required,
+          "Coverage Sites": p.num_sites_coverage,
+          "Capacity Sites": p.num_sites_capacity,
+          "Cost ($)": f"{p.cost:,.0f}",
+          "Headroom": _format_headroom(p.headroom)} for p in result.front],
+        hide_index=True, use_container_width=True
+    )
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import streamlit as st
+
+from planner.profiling import EXPORTER, STATS
+
+
+def render(trace):
+    with st.sidebar.expander("⏱️ Profiling", expanded=True):
+        if trace is not None:
+            st.markdown(f"**This run** ({trace.label}): {trace.total * 1000:.1f} ms")
+            st.dataframe(
+                [{"Stage": "\u2003" * depth + path.rsplit("/", 1)[-1],
+                  "Time (ms)": round(seconds * 1000, 2)} for path, seconds, depth in trace.spans],
+                hide_index=True, use_container_width=True
+            )
+
+        summary = STATS.summary()
+        runs = sorted({run for run, _ in summary})
+        if runs:
+            run = st.radio("Runs", runs, horizontal=True, key="profiling_run")
+            st.markdown("**All sessions** (recent runs)")
+            st.dataframe(
+                [{"Stage": stage,
+                  "Runs": row["count"],
+                  "p50 (ms)": round(row["p50"] * 1000, 2),
+                  "p95 (ms)": round(row["p95"] * 1000, 2),
+                  "p99 (ms)": round(row["p99"] * 1000, 2)}
+                 for (r, stage), row in sorted(summary.items()) if r == run],
+                hide_index=True, use_container_width=True
+            )
+        if EXPORTER.enabled:
+            st.caption(f"Exported to `{EXPORTER.directory}` (spans.jsonl, stages.prom)")
+        else:
+            st.caption("Metrics export is off.")
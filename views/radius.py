@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import streamlit as st
+
+from planner.coverage import find_coverage_radius, monte_carlo_radius
+from views.charts import cached_figure
+from views.jobs import current_job, follow, submit
+
+DRAW_COUNTS = {"4,000": 4000, "40,000": 40000, "400,000": 400000}
+BATCH_DRAWS = 20000
+
+
+def render_result(estimate, analytic_km=None):
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Simulated Radius", f"{estimate.radius_km:.3f} km")
+    col2.metric("Confidence Bounds", f"{estimate.lower_km:.3f} – {estimate.upper_km:.3f} km")
+    if analytic_km is not None:
+        col3.metric("Closed-Form Radius", f"{analytic_km:.3f} km",
+                    delta=f"{(estimate.radius_km - analytic_km) * 1000:+.0f} m simulated", delta_color="off")
+    st.plotly_chart(
+        cached_figure("coverage_probability_figure", tuple((estimate.distances_m / 1000).tolist()),
+                      tuple(estimate.coverage_probability.tolist()), estimate.reliability,
+                      estimate.radius_km, estimate.lower_km, estimate.upper_km),
+        use_container_width=True
+    )
+    if analytic_km is not None:
+        # The bounds are only as fine as the distance grid
+        step_km = estimate.distances_m[1] / 1000 - estimate.distances_m[0] / 1000
+        if estimate.lower_km - step_km <= analytic_km <= estimate.upper_km + step_km:
+            st.success("The closed-form radius lies within the simulated confidence bounds.")
+        else:
+            st.warning("The closed-form radius lies outside the simulated confidence bounds; "
+                       "more draws narrow the bounds, a different seed shows their spread.")
+
+
+def render(params, mapl):
+    st.markdown("#### 🎲 Monte Carlo Radius Check")
+    st.caption("Draws LOS/NLOS states at every distance up to the maximum cell radius and finds where "
+               "the share of draws within MAPL falls to the cell-edge reliability; the bounds are its "
+               "95% binomial confidence interval. Antenna type is not applied, as in the closed form.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        n_draws = DRAW_COUNTS[st.selectbox("Draws", list(DRAW_COUNTS), index=1, key="mc_radius_draws")]
+    with col2:
+        seed = st.number_input("Random Seed", min_value=0, value=0, step=1, key="mc_radius_seed")
+
+    args = (mapl, params.freq_ghz, params.propagation_model, params.h_ue, params.cell_edge_reliability)
+    key = args + (params.max_radius_km, n_draws, int(seed))
+    if st.button("Run Monte Carlo Radius", use_container_width=True):
+        submit("mc_radius", monte_carlo_radius, *args, n_draws=n_draws, max_radius_km=params.max_radius_km,
+               seed=int(seed), batch_draws=BATCH_DRAWS,
+               label=f"Monte Carlo radius over {n_draws:,} draws", tag=key)
+
+    job = current_job("mc_radius")
+    if job is None or job.tag != key:
+        return
+    estimate = follow(job)
+    if estimate is not None:
+        render_result(estimate, find_coverage_radius(*args[:3], max_radius_km=params.max_radius_km,
+                                                     h_ue=params.h_ue, reliability=params.cell_edge_reliability))
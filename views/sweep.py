@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import streamlit as st
+
+from planner.core import check_value, coerce_param
+from planner.sweep import CATEGORICAL, evaluate_grid
+from views.charts import cached_figure
+from views.jobs import current_job, follow, submit
+
+# Sidebar label and default sweep values for each parameter offered here
+SWEEP_PARAMETERS = {
+    "bandwidth_mhz": ("Bandwidth (MHz)", "10, 20, 40, 60, 80, 100"),
+    "mod_order": ("Modulation Order (bits per symbol)", "2, 4, 6, 8, 10"),
+    "mimo_layers": ("Number of MIMO Layers", "1, 2, 4, 8, 16, 32"),
+    "sectors_per_site": ("Sectors per Site", "1, 3"),
+    "scs_khz": ("Sub-Carrier Spacing (kHz)", "15, 30, 60, 120, 240"),
+    "freq_mhz": ("Frequency (MHz)", "700, 3500, 28000"),
+    "propagation_model": ("Propagation Model", "UMi-Street Canyon, UMa"),
+    "antenna_type": ("Antenna Type", "Directive, Omni"),
+    "duplex_mode": ("Duplex Mode", "TDD, FDD"),
+    "utilization": ("Resource Utilization (fraction)", "0.5, 0.6, 0.7, 0.8, 0.9"),
+    "overhead": ("Overhead (fraction)", "0.1, 0.15, 0.2, 0.25, 0.3"),
+    "q": ("Quality Factor (q)", "0.5, 0.6, 0.7, 0.8, 0.9, 1.0"),
+    "cell_edge_reliability": ("Cell-Edge Reliability (fraction)", "0.8, 0.85, 0.9, 0.95, 0.99"),
+    "area_km2": ("Area Size (km²)", "0.5, 1, 2, 5, 10, 20, 50"),
+    "traffic_per_user": ("Total Traffic (Mbps)", "100, 500, 1000, 5000, 10000"),
+    "sizing_percentile": ("Capacity Sizing Percentile (%)", "80, 90, 95, 99, 100"),
+}
+
+SWEEP_METRICS = {
+    "total_sites_required": "Total Sites",
+    "cost_estimate": "Estimated Cost ($)",
+    "num_sites_coverage": "Coverage Sites",
+    "num_sites_capacity": "Capacity Sites",
+    "site_throughput_mbps": "Site Throughput (Mbps)",
+}
+
+
+def _parse_values(name, text):
+    values = []
+    for item in text.split(","):
+        item = item.strip()
+        if item:
+            value = item if name in CATEGORICAL else coerce_param(name, item)
+            # Caught here, a typo shows in the form instead of failing the job
+            check_value(name, value)
+            values.append(value)
+    # Keep the order the planner typed but drop repeats
+    return list(dict.fromkeys(values))
+
+
+def render(params):
+    st.markdown("## 🧪 Parameter Sweep")
+    st.caption("Every combination of the values below is planned in one vectorized pass; "
+               "parameters you do not sweep keep their sidebar values.")
+
+    with st.form("sweep_form", border=False):
+        swept = st.multiselect(
+            "Parameters to sweep",
+            list(SWEEP_PARAMETERS),
+            default=["bandwidth_mhz", "mimo_layers"],
+            format_func=lambda name: SWEEP_PARAMETERS[name][0],
+        )
+        ranges = {}
+        for name in swept:
+            label, default = SWEEP_PARAMETERS[name]
+            ranges[name] = st.text_input(f"{label} values", value=default, key=f"sweep_{name}")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            metric = st.selectbox("Metric", list(SWEEP_METRICS), format_func=SWEEP_METRICS.get)
+        with col2:
+            reduce_label = st.selectbox("Collapse other axes by", ["Best (min)", "Worst (max)"])
+        with col3:
+            contour = st.selectbox("Chart", ["Heatmap", "Contour"]) == "Contour"
+        run = st.form_submit_button("Run Sweep", use_container_width=True)
+
+    if run:
+        try:
+            axes = {name: _parse_values(name, ranges[name]) for name in swept}
+        except ValueError as exc:
+            st.error(f"Invalid sweep: {exc}")
+            return
+        size = int(np.prod([len(values) for values in axes.values()]))
+        submit("sweep", evaluate_grid, params, axes, label=f"Sweep of {size:,} configurations",
+               tag=params)
+
+    job = current_job("sweep")
+    if job is None or job.tag != params:
+        return
+    result = follow(job)
+    if result is None:
+        return
+    names = list(result.axes)
+    if len(names) < 2:
+        st.warning("Pick at least two parameters to draw a heatmap.")
+        return
+
+    st.success(f"Evaluated {result.size:,} configurations in {job.elapsed * 1000:.0f} ms")
+    col1, col2 = st.columns(2)
+    with col1:
+        x = st.selectbox("X axis", names, index=0, format_func=lambda n: SWEEP_PARAMETERS[n][0])
+    with col2:
+        y = st.selectbox("Y axis", [n for n in names if n != x], index=0,
+                         format_func=lambda n: SWEEP_PARAMETERS[n][0])
+
+    reduce = np.min if reduce_label.startswith("Best") else np.max
+    z = result.plane(x, y, metric, reduce=reduce)
+    st.plotly_chart(
+        cached_figure("sweep_figure", tuple(map(str, result.axes[x])), tuple(map(str, result.axes[y])),
+                      z, SWEEP_PARAMETERS[x][0], SWEEP_PARAMETERS[y][0], SWEEP_METRICS[metric], contour),
+        use_container_width=True
+    )
+
+    point, cost = result.best("cost_estimate")
+    st.markdown("#### 💡 Cheapest Configuration in the Sweep")
+    st.dataframe(
+        [{"Parameter": SWEEP_PARAMETERS[n][0], "Value": str(v)} for n, v in point.items()]
+        + [{"Parameter": "Estimated Cost ($)", "Value": f"{cost:,.0f}"}],
+        hide_index=True, use_container_width=True
+    )